@@ -1,21 +1,34 @@
 from __future__ import annotations
 
-import depict
-import simulations
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+import simulations as registry
 import typer
 
+if TYPE_CHECKING:
+    import depict
+    from bench import BenchResult
+
 # TODO: Make a manual for Depict.
 # TODO: Fix simulations.
+# depict, and each simulation, are imported inside of the commands that use them,
+# so that commands that do not need them start quickly.
 
 app = typer.Typer()
 
-# Map every class exported by the simulations package to its string name.
-simulations: dict[str, object] = {
-    simulation.lower(): getattr(simulations, simulation)
-    for simulation in simulations.__all__
+# Map the string name of every simulation to the name of its class.
+simulations: dict[str, str] = {
+    simulation.lower(): simulation for simulation in registry.__all__
 }
 
 
+def load(simulation_name: str) -> type:
+    """Import a simulation by its string name."""
+    return getattr(registry, simulations[simulation_name])
+
+
 @app.command()
 def run(
     simulation_name: str,
@@ -23,18 +36,156 @@ def run(
     clear: bool = True,
     width: int = 640,
     height: int = 360,
+    frame_rate: int = 60,
+    headless: bool = False,
+    ticks: Optional[int] = None,
+    profile: bool = False,
+    trace: Optional[str] = None,
+    dirty_rects: bool = False,
+    seed: Optional[int] = None,
+    checkpoint_every: Optional[int] = None,
+    snapshot: Optional[Path] = None,
+    resume: Optional[Path] = None,
+    record_input: Optional[Path] = None,
+    replay: Optional[Path] = None,
 ):
+    import depict
+
     print(f"Running {simulation_name}...")
-    depict.Engine(depict.Size(width, height), record=record, clear=clear).run(
-        simulations[simulation_name]()
+    # Profile when asked for an overlay or a trace.
+    profiler: Optional[depict.Profiler] = (
+        depict.Profiler(overlay=profile, trace_path=trace)
+        if profile or trace is not None
+        else None
+    )
+    engine = depict.Engine(
+        depict.Size(width, height),
+        frame_rate=frame_rate,
+        record=record,
+        clear=clear,
+        headless=headless,
+        ticks=ticks,
+        profiler=profiler,
+        dirty_rects=dirty_rects,
+        seed=seed,
+        checkpoint_every=checkpoint_every,
+        record_input=record_input,
+        replay=depict.InputLog.open(replay) if replay is not None else None,
+    )
+    # Resumed runs carry on counting ticks from the snapshot.
+    start_snapshot = depict.Snapshot.open(resume) if resume is not None else None
+    first_tick: int = start_snapshot.frame if start_snapshot is not None else 0
+    start: float = time.perf_counter()
+    if start_snapshot is not None:
+        engine.resume(start_snapshot)
+    else:
+        engine.run(load(simulation_name)())
+    elapsed: float = time.perf_counter() - start
+
+    if headless:
+        ran: int = engine.frame_count - first_tick
+        print(f"Ran {ran} ticks in {elapsed:.2f}s ({ran / elapsed:.1f} ticks/s).")
+        if profiler is not None:
+            print("\n".join(profiler.summary()))
+    if trace is not None:
+        print(f"Saved a trace to {trace}.")
+    if snapshot is not None:
+        engine.snapshot().save(snapshot)
+        print(f"Saved a snapshot of tick {engine.frame_count} to {snapshot}.")
+
+
+@app.command()
+def bench(
+    simulation_names: Optional[List[str]] = typer.Argument(None),
+    ticks: int = 120,
+    width: int = 640,
+    height: int = 360,
+    seed: int = 0,
+    memory: bool = True,
+    baseline: Path = Path("benchmarks.json"),
+    save: bool = False,
+    tolerance: float = 0.2,
+) -> None:
+    """Run simulations headlessly and compare them against a saved baseline."""
+    import depict
+    from bench import bench as bench_simulation
+    from bench import load_baseline, regressions, save_baseline
+
+    names: List[str] = simulation_names or [*simulations]
+    results: List[BenchResult] = []
+    for name in names:
+        result: BenchResult = bench_simulation(
+            name,
+            load(name),
+            ticks=ticks,
+            size=depict.Size(width, height),
+            seed_=seed,
+            memory=memory,
+        )
+        print(result)
+        results.append(result)
+
+    if save:
+        save_baseline(baseline, results)
+        print(f"Saved the results to {baseline}.")
+        return
+
+    if found := regressions(results, load_baseline(baseline), tolerance):
+        print("Regressions:")
+        for regression in found:
+            print(f"  {regression}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def sweep(
+    simulation_name: str,
+    param: List[str] = typer.Option([], help="A parameter to vary, as name=a,b,c."),
+    ticks: int = 600,
+    width: int = 640,
+    height: int = 360,
+    seed: int = 0,
+    repeats: int = 1,
+    workers: Optional[int] = None,
+    output: Path = Path("sweep.jsonl"),
+    frames: Optional[Path] = None,
+) -> None:
+    """Run a simulation headlessly for every combination of the values of its
+    parameters, across a pool of processes."""
+    from sweep import parse_param, plan
+    from sweep import sweep as run_sweep
+    from sweep import write
+
+    try:
+        params = dict(parse_param(p) for p in param)
+    except (ValueError, SyntaxError) as error:
+        raise typer.BadParameter(str(error), param_hint="--param")
+    runs = plan(
+        simulations[simulation_name],
+        params,
+        ticks=ticks,
+        seed=seed,
+        repeats=repeats,
+        width=width,
+        height=height,
+        frames=frames,
     )
+    print(f"Running {len(runs)} configurations of {simulation_name}...")
+    with output.open("w") as file:
+        for result in run_sweep(runs, workers):
+            write(result, file)
+            print(
+                f"{result.index + 1:>4}/{len(runs)} {result.params} "
+                f"{result.ticks_per_second:10.1f} ticks/s {result.observables}"
+            )
+    print(f"Saved the results to {output}.")
 
 
 @app.command()
 def list(verbose: bool = False) -> None:
     if verbose:
         for i, (simulation_name, simulation) in enumerate(simulations.items()):
-            print(f"{i + 1:02}) {simulation_name}: {simulation.__doc__}")
+            print(f"{i + 1:02}) {simulation_name}: {registry.describe(simulation)}")
     else:
         for i, simulation in enumerate(simulations):
             print(f"{i + 1:02}) {simulation}")
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+"""Benchmarks for measuring how fast each simulation runs."""
+
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterable
+
+import depict
+import depict.rng as randomness
+import numpy as np
+from attrs import asdict, define
+
+
+@define
+class BenchResult:
+    """The measurements from running a simulation headlessly.
+
+    Attributes:
+        `name`: The name of the simulation.
+        `ticks`: The number of ticks that were run.
+        `seconds`: The total time taken, including building the scene.
+        `ticks_per_second`: The number of ticks run per second of the event loop.
+        `update_seconds`: The time spent in the `tick` methods of nodes.
+        `draw_seconds`: The time spent in the `draw` methods of nodes, and flushing
+            the canvas.
+        `peak_memory`: The most memory allocated at once while running, in bytes,
+            or None if it was not measured."""
+
+    name: str
+    ticks: int
+    seconds: float
+    ticks_per_second: float
+    update_seconds: float
+    draw_seconds: float
+    peak_memory: int | None = None
+
+    def __str__(self) -> str:
+        memory: str = (
+            f"{self.peak_memory / 2**20:8.1f} MiB"
+            if self.peak_memory is not None
+            else "       - MiB"
+        )
+        ticks: int = max(self.ticks, 1)
+        return (
+            f"{self.name:<16} {self.ticks_per_second:10.1f} ticks/s "
+            f"{self.update_seconds * 1000 / ticks:8.2f} ms update "
+            f"{self.draw_seconds * 1000 / ticks:8.2f} ms draw {memory}"
+        )
+
+
+def seed(value: int) -> None:
+    """Seed every source of randomness used by the simulations.
+
+    Nodes draw from the stream of their engine, which is seeded when the engine
+    is created, but the global generators are seeded too for anything else."""
+    random.seed(value)
+    np.random.seed(value)
+    randomness.seed(value)
+
+
+def run(
+    name: str, simulation: type, ticks: int, size: depict.Size, seed_: int
+) -> depict.Engine:
+    """Build and run a simulation headlessly for `ticks` ticks."""
+    seed(seed_)
+    engine = depict.Engine(size, headless=True, ticks=ticks, title=name, seed=seed_)
+    engine.run(simulation())
+    return engine
+
+
+def bench(
+    name: str,
+    simulation: type,
+    ticks: int = 120,
+    size: depict.Size | None = None,
+    seed_: int = 0,
+    memory: bool = True,
+) -> BenchResult:
+    """Measure how fast a simulation runs, and optionally how much memory it uses.
+
+    Memory is measured in a second run, as tracing allocations slows everything
+    down and would distort the timings."""
+    size = size if size is not None else depict.Size(640, 360)
+
+    start: float = time.perf_counter()
+    engine: depict.Engine = run(name, simulation, ticks, size, seed_)
+    seconds: float = time.perf_counter() - start
+
+    peak_memory: int | None = None
+    if memory:
+        tracemalloc.start()
+        try:
+            run(name, simulation, ticks, size, seed_)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        ticks=engine.frame_count,
+        seconds=seconds,
+        ticks_per_second=(
+            engine.frame_count / engine.loop_time if engine.loop_time else 0.0
+        ),
+        update_seconds=engine.update_time,
+        draw_seconds=engine.draw_time,
+        peak_memory=peak_memory,
+    )
+
+
+def load_baseline(path: Path) -> dict[str, BenchResult]:
+    """Load previously saved results, keyed by simulation name."""
+    if not path.exists():
+        return {}
+    return {
+        name: BenchResult(**result)
+        for name, result in json.loads(path.read_text()).items()
+    }
+
+
+def save_baseline(path: Path, results: Iterable[BenchResult]) -> None:
+    """Save results as the new baseline, keeping any that were not rerun."""
+    baseline: dict[str, BenchResult] = load_baseline(path)
+    baseline.update({result.name: result for result in results})
+    path.write_text(
+        json.dumps(
+            {name: asdict(result) for name, result in sorted(baseline.items())},
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def regressions(
+    results: Iterable[BenchResult],
+    baseline: dict[str, BenchResult],
+    tolerance: float = 0.2,
+) -> list[str]:
+    """Describe every result that is more than `tolerance` worse than its baseline."""
+    found: list[str] = []
+    for result in results:
+        if (previous := baseline.get(result.name)) is None:
+            continue
+        if result.ticks_per_second < previous.ticks_per_second * (1 - tolerance):
+            found.append(
+                f"{result.name}: {result.ticks_per_second:.1f} ticks/s, "
+                f"down from {previous.ticks_per_second:.1f} ticks/s"
+            )
+        if (
+            result.peak_memory is not None
+            and previous.peak_memory is not None
+            and result.peak_memory > previous.peak_memory * (1 + tolerance)
+        ):
+            found.append(
+                f"{result.name}: {result.peak_memory / 2**20:.1f} MiB peak memory, "
+                f"up from {previous.peak_memory / 2**20:.1f} MiB"
+            )
+    return found
@@ -2,96 +2,196 @@ from __future__ import annotations
 
 """A 2D canvas for painting various geometrical shapes."""
 
+from typing import Callable, Sequence, TypeAlias
+
 import pygame
-from attrs import define
+from attrs import define, field
 from depict.color import Color
 from depict.vec3d import Point, Size
 
+# A recorded call to one of the `pygame.draw` functions, minus its target surface.
+DrawCommand: TypeAlias = tuple[Callable[..., pygame.Rect], tuple]
+
+TRANSPARENT: tuple[int, int, int, int] = (0, 0, 0, 0)
+
+
+def _point(surface: pygame.Surface, color: pygame.Color, x: int, y: int) -> pygame.Rect:
+    """Paint a single pixel, returning the area that was painted."""
+    return pygame.draw.rect(surface, color, (x, y, 1, 1))
+
+
+def _blits(
+    surface: pygame.Surface,
+    blits: Sequence[tuple[pygame.Surface, tuple[float, float]]],
+    area: pygame.Rect | None,
+) -> pygame.Rect:
+    """Blit many images at once, returning the area that may have been painted."""
+    surface.blits(blits, doreturn=False)  # type: ignore
+    # Collecting the area of every image is slow, so assume the worst if the
+    # area was not given.
+    return area if area is not None else surface.get_rect()
+
 
 @define
 class Canvas:
-    """A 2D canvas in which to paint."""
+    """A 2D canvas in which to paint.
+
+    Shapes are not painted as soon as they are drawn. Instead, each one is
+    recorded and the whole batch is painted when the canvas is flushed, which
+    depict does once per frame. Opaque shapes are painted straight onto the
+    surface, while translucent ones are all painted onto a single shared alpha
+    layer which is blended onto the surface with one blit.
+
+    If `track` is set, the canvas keeps track of the area painted by every flush,
+    which `painted` returns, so that only those areas of the screen need updating.
+
+    Note:
+        Translucent shapes are always painted over opaque ones, and overlapping
+        translucent shapes replace each other instead of blending together."""
 
     surface: pygame.surface.Surface
+    track: bool = False
+    _opaque: list[DrawCommand] = field(factory=list, init=False)
+    _translucent: list[DrawCommand] = field(factory=list, init=False)
+    _layer: pygame.surface.Surface | None = field(default=None, init=False)
+    _painted: list[pygame.Rect] = field(factory=list, init=False)
 
     def __enter__(self) -> Canvas:
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
-        pass
+        self.flush()
+
+    def _record(self, color: Color, draw: Callable[..., pygame.Rect], *args) -> None:
+        """Record a `draw` call into the batch that matches the opacity of `color`."""
+        if color.a == 255:
+            self._opaque.append((draw, (color._to_pygame_color(), *args)))
+        elif color.a > 0:  # Invisible shapes are not worth painting at all.
+            self._translucent.append((draw, (color._to_pygame_color(), *args)))
+
+    def layer(self) -> pygame.surface.Surface:
+        """Get the transparent layer that translucent shapes are painted onto."""
+        if self._layer is None or self._layer.get_size() != self.surface.get_size():
+            self._layer = pygame.Surface(self.surface.get_size(), pygame.SRCALPHA)
+        return self._layer
+
+    def offscreen(self, surface: pygame.surface.Surface | None = None) -> Canvas:
+        """Create a canvas that paints onto a transparent surface of the same size,
+        which can be painted onto this canvas later.
+
+        `surface` is cleared and reused if it is the right size."""
+        if surface is None or surface.get_size() != self.surface.get_size():
+            surface = pygame.Surface(self.surface.get_size(), pygame.SRCALPHA)
+        else:
+            surface.fill(TRANSPARENT)
+        return Canvas(surface)
 
     def point(self, point: Point, color: Color) -> None:
         """Create a point at `point` with a `color`."""
-        surface = pygame.Surface((1, 1), pygame.SRCALPHA)
-        surface.fill(color._to_pygame_color())
-        self.surface.blit(surface, (point.x, point.y))
+        self._record(color, _point, int(point.x), int(point.y))
 
     def rect(self, point: Point, size: Size, color: Color) -> None:
         """Create a rectangle at `point` with some `size` with a `color`."""
-        surface = pygame.Surface((size.x, size.y), pygame.SRCALPHA)
-        surface.fill(color._to_pygame_color())
-        self.surface.blit(surface, (point.x, point.y))
+        self._record(color, pygame.draw.rect, (point.x, point.y, size.x, size.y))
 
     def polygon(self, points: list[Point], color: Color) -> None:
         """Create a polygon from a list of `points` with a color."""
-        xs: list[int] = [p.x for p in points]
-        ys: list[int] = [p.y for p in points]
-
-        min_point = Point(min(xs), min(ys))
-        max_point = Point(max(xs), max(ys))
-
-        surface = pygame.Surface(max_point.abs_diff(min_point).as_2d(), pygame.SRCALPHA)
-        pygame.draw.polygon(
-            surface,
-            color._to_pygame_color(),
-            list(map(lambda point: point.abs_diff(min_point).as_2d(), points)),
+        self._record(
+            color, pygame.draw.polygon, [(point.x, point.y) for point in points]
         )
-        self.surface.blit(surface, min_point.as_2d())
 
     def circle(self, center: Point, radius: float, color: Color) -> None:
         """Create a circle centered at `center` with a `radius` and `color`."""
-        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(surface, color._to_pygame_color(), (radius, radius), radius)
-        self.surface.blit(surface, (center.x - radius, center.y - radius))
+        self._record(color, pygame.draw.circle, (center.x, center.y), radius)
 
     def line(self, start: Point, end: Point, color: Color, width: int = 1) -> None:
         """Draw a line from `start` to `end` with a `color` and `width`."""
-        size: Size = Size(
-            2 * abs(start.x - end.x) + width, 2 * abs(start.y - end.y) + width
-        )
-        surface = pygame.Surface((size.width, size.height), pygame.SRCALPHA)
-
-        pygame.draw.line(
-            surface,
-            color._to_pygame_color(),
-            (size.width / 2, size.height / 2),
-            ((size.width / 2) + end.x - start.x, (size.height / 2) + end.y - start.y),
-            width,
-        )
-        self.surface.blit(
-            surface, (start.x - size.width / 2, start.y - size.height / 2)
-        )
+        self._record(color, pygame.draw.line, (start.x, start.y), (end.x, end.y), width)
 
     def lines(
         self, points: list[Point], color: Color, is_closed: bool, width: int = 1
     ) -> None:
         """Draw multiple lines at once, and determine whether to fill in the shape."""
-        pygame.draw.lines(
-            self.surface,
-            color._to_pygame_color(),
+        self._record(
+            color,
+            pygame.draw.lines,
             is_closed,
-            list(map(lambda point: (point.x, point.y), points)),
+            [(point.x, point.y) for point in points],
             width,
         )
 
+    def sprites(
+        self,
+        blits: Sequence[tuple[pygame.Surface, tuple[float, float]]],
+        area: pygame.Rect | None = None,
+    ) -> None:
+        """Paint many images at once, each at the top-left position paired with it.
+
+        Images are blended using their own per-pixel alpha, so translucent images
+        blend with each other too. They are painted with the opaque shapes. The
+        `area` that the images cover can be given if it is known, otherwise they
+        are assumed to cover the whole canvas."""
+        if blits:
+            self._opaque.append((_blits, (blits, area)))
+
     def fill(self, color: Color) -> None:
-        """Paint every pixel on the screen the specified `color`."""
-        surface = pygame.Surface(
-            (self.surface.get_width(), self.surface.get_height()), pygame.SRCALPHA
-        )
-        surface.fill(color._to_pygame_color())
-        self.surface.blit(surface, (0, 0))
+        """Paint every pixel on the screen the specified `color`.
+
+        Unlike the other shapes, this is painted immediately, over everything that
+        has been drawn so far."""
+        self.flush()
+        if self.track:
+            self._painted.append(self.surface.get_rect())
+        if color.a == 255:
+            self.surface.fill(color._to_pygame_color())
+        elif color.a > 0:
+            layer: pygame.surface.Surface = self.layer()
+            layer.fill(color._to_pygame_color())
+            self.surface.blit(layer, (0, 0))
+            layer.fill(TRANSPARENT)
+
+    def clear(self, areas: Sequence[pygame.Rect], color: Color) -> None:
+        """Paint over just the `areas` of the screen with an opaque `color`.
+
+        Like `fill`, this is painted immediately."""
+        self.flush()
+        background: pygame.Color = color._to_pygame_color()
+        for area in areas:
+            self.surface.fill(background, area)
+
+    def painted(self) -> list[pygame.Rect]:
+        """Get the areas painted since this was last called, if `track` is set."""
+        painted: list[pygame.Rect] = self._painted
+        self._painted = []
+        return painted
+
+    def flush(self) -> None:
+        """Paint every shape that has been drawn since the last flush."""
+        if self.track:
+            self._painted.extend(
+                draw(self.surface, *args) for draw, args in self._opaque
+            )
+        else:
+            for draw, args in self._opaque:
+                draw(self.surface, *args)
+        self._opaque.clear()
+
+        if not self._translucent:
+            return
+
+        # Only the area that was actually painted on needs to be blended and reset.
+        layer: pygame.surface.Surface = self.layer()
+        painted: list[pygame.Rect] = [
+            draw(layer, *args) for draw, args in self._translucent
+        ]
+        self._translucent.clear()
+        area: pygame.Rect = painted[0].unionall(painted[1:])
+        self.surface.blit(layer, area, area)
+        layer.fill(TRANSPARENT, area)
+        if self.track:
+            self._painted.append(area)
 
     def render(self) -> None:
         """Render the changes to the canvas on the screen."""
+        self.flush()
         pygame.display.flip()
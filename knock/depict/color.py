@@ -3,10 +3,11 @@ from __future__ import annotations
 """Bright shiny colors."""
 
 import colorsys
-import random
 
+import depict.rng as randomness
 import pygame
 from attrs import define
+from depict.rng import Rng
 
 
 @define
@@ -36,14 +37,20 @@ class Color:
         return Color(int(r * 255), int(g * 255), int(b * 255))
 
     @staticmethod
-    def random(a: int = 255) -> Color:
-        """Create a random color, and set its opacity."""
-        return Color(
-            random.randrange(0, 256),
-            random.randrange(0, 256),
-            random.randrange(0, 256),
-            a,
-        )
+    def random(a: int = 255, rng: Rng | None = None) -> Color:
+        """Create a random color, and set its opacity.
+
+        The color is drawn from `rng`, or the current stream if it is not given."""
+        r, g, b, a = (rng or randomness.current()).colors(1, a)[0].tolist()
+        return Color(r, g, b, a)
+
+    @staticmethod
+    def random_many(count: int, a: int = 255, rng: Rng | None = None) -> list[Color]:
+        """Create `count` random colors at once, all with the same opacity."""
+        return [
+            Color(r, g, b, a)
+            for r, g, b, a in (rng or randomness.current()).colors(count, a).tolist()
+        ]
 
     @staticmethod
     def _from_pygame_color(color: pygame.color.Color) -> Color:
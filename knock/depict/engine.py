@@ -1,27 +1,70 @@
 from __future__ import annotations
 
-from collections import defaultdict
-
 """The main innards of depict."""
 
-from typing import Type, TypeAlias
+import time
+from collections import deque
+from contextlib import ExitStack, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Type, TypeAlias
 
 import depict.color as color
+import depict.input as inputs
+import depict.profiler as profiling
+import depict.rng as randomness
 import pygame
-import pygame_gui as pgui
-import vidmaker
-from attrs import Factory, astuple, define
+from attrs import Factory, astuple, define, field
 from depict.canvas import Canvas
 from depict.color import Color
+from depict.input import InputLog, InputRecorder
 from depict.misc import Event
+from depict.profiler import Profiler
+from depict.rng import Rng
 from depict.scene import Scene
-from depict.signal import Signal, SignalCallback
+from depict.signal import Signal, SignalBus, SignalCallback
+from depict.snapshot import Snapshot
+from depict.spatial import Broadphase
 from depict.vec3d import Size
 from depict.window import Window
 
-MANAGER: pgui.UIManager = pgui.UIManager((320, 240))
+if TYPE_CHECKING:
+    import pygame_gui as pgui
+    from depict.recorder import Recorder
+
 Clock: TypeAlias = pygame.time.Clock
 
+# The UI manager shared by every engine. Creating it is slow, so it is only
+# created when it is first needed.
+_manager: pgui.UIManager | None = None
+
+# Beyond this many areas, updating the whole area that they cover is faster than
+# updating each of them.
+MAX_DIRTY_AREAS: int = 64
+
+
+def manager() -> pgui.UIManager:
+    """Get the UI manager, creating it if needed."""
+    global _manager
+    if _manager is None:
+        import pygame_gui as pgui
+
+        pygame.init()
+        _manager = pgui.UIManager((320, 240))
+    return _manager
+
+
+def _ui_areas(ui: pgui.UIManager) -> list[pygame.Rect]:
+    """Get the areas of the screen covered by UI elements."""
+    root = ui.get_root_container()
+    return [element.rect for element in ui.get_sprite_group() if element is not root]
+
+
+def _merge(areas: list[pygame.Rect]) -> list[pygame.Rect]:
+    """Combine the areas into one if there are too many to update separately."""
+    if len(areas) <= MAX_DIRTY_AREAS:
+        return areas
+    return [areas[0].unionall(areas[1:])]
+
 
 @define
 class Engine:
@@ -41,14 +84,45 @@ class Engine:
     - `frame_count`: The number of frames that have passed since depict started.
     - `record`: Whether to record the window or not. This has to be set when
         depict is first run. All subsequent changes will be ignored.
-    - `clear`: Whether to clear the window every tick or not."""
+    - `clear`: Whether to clear the window every tick or not.
+    - `headless`: Whether to draw to an offscreen surface instead of a window.
+        Headless engines use a fixed timestep of `1 / frame_rate` and run as fast
+        as possible instead of waiting for the clock.
+    - `ticks`: The number of ticks to run for before stopping, or None to run
+        until the window is closed.
+    - `broadphase`: A grid of the bodies in the scene, shared by every `Area2D`.
+    - `loop_time`: The total number of seconds spent in the event loop.
+    - `update_time`, `draw_time`: The part of `loop_time` spent ticking and
+        drawing nodes.
+    - `profiler`: Times each phase of every frame and the nodes of each class,
+        if set. This slows down every frame slightly.
+    - `dirty_rects`: Whether to only clear and update the areas of the window that
+        were painted this frame or the last, instead of the whole window. This is
+        much faster when only small parts of the window change each frame.
+    - `seed`: The seed of every random number drawn by the nodes, or None for
+        different numbers every run.
+    - `rng`: The stream that each node draws its random numbers from. This
+        becomes the current stream as soon as the engine is created, so scenes
+        created afterwards draw from it while they are built.
+    - `checkpoint_every`: The number of ticks between each snapshot that is taken
+        while running, or None to not take any.
+    - `checkpoints`: The most recent snapshots, oldest first, which the engine can
+        be rewound to. Only the last `max_checkpoints` are kept.
+    - `record_input`: A file to record the mouse and keyboard to every tick, along
+        with the seed, so that the run can be replayed. A run that was resumed
+        from a snapshot is replayed by resuming from the same snapshot.
+    - `replay`: Recorded input to show the nodes instead of the real mouse and
+        keyboard. Each tick steps by the time that was recorded, and the engine
+        stops once every tick has been replayed. The seed of the recording is
+        used, unless another is given. The mouse is scaled to the size of the
+        window, so a recording can be replayed at another resolution. At another
+        frame rate, each tick steps by `1 / frame_rate` instead, and sees the
+        input that was recorded at the same time."""
 
     size: Size
     # Signals are addressed by the Scene instance whose signal you want, and the signal
-    # of that scene. This will return a list of subscribers, which are called.
-    signals: dict[Scene, dict[Type[Signal], list[SignalCallback]]] = Factory(
-        lambda: defaultdict(lambda: defaultdict(list))
-    )
+    # of that scene, which finds the subscribers that are called.
+    signals: SignalBus = Factory(SignalBus)
     title: str = ""
     background: Color = color.Black
     frame_rate: int = 60
@@ -58,6 +132,31 @@ class Engine:
     record: bool = False
     clear: bool = True
     running: bool = True
+    headless: bool = False
+    ticks: int | None = None
+    broadphase: Broadphase[Scene] = Factory(Broadphase)
+    loop_time: float = 0.0
+    update_time: float = 0.0
+    draw_time: float = 0.0
+    profiler: Profiler | None = None
+    dirty_rects: bool = False
+    seed: int | None = None
+    rng: Rng = field(init=False)
+    checkpoint_every: int | None = None
+    max_checkpoints: int = 32
+    checkpoints: deque[Snapshot] = Factory(
+        lambda self: deque(maxlen=self.max_checkpoints), takes_self=True
+    )
+    record_input: Path | None = None
+    replay: InputLog | None = None
+    # A snapshot to restore at the start of the next tick.
+    _rewind_to: Snapshot | None = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        if self.replay is not None and self.seed is None:
+            self.seed = self.replay.seed
+        self.rng = Rng(self.seed)
+        randomness.use(self.rng)
 
     @property
     def width(self) -> int:
@@ -68,13 +167,27 @@ class Engine:
         return self.screen.size.height
 
     def connect(
-        self, callback: SignalCallback, emitter: Scene, signal: Type[Signal]
+        self,
+        callback: SignalCallback,
+        emitter: Scene,
+        signal: Type[Signal],
+        weak: bool = False,
     ) -> None:
-        """Connect a `signal` to be emitted by `emitter` to call `callback`."""
-        try:
-            self.signals[emitter][signal].append(callback)
-        except:
-            self.signals[emitter] = {signal: [callback]}
+        """Connect a `signal` to be emitted by `emitter` to call `callback`.
+
+        If `weak` is set, the connection does not keep the callback alive."""
+        self.signals.connect(callback, emitter, signal, weak)
+
+    def disconnect(
+        self, callback: SignalCallback, emitter: Scene, signal: Type[Signal]
+    ) -> bool:
+        """Stop a `signal` emitted by `emitter` from calling `callback`."""
+        return self.signals.disconnect(callback, emitter, signal)
+
+    def phase(self, name: str) -> ContextManager:
+        """Time the code inside a `with` block as a phase of the current frame,
+        if the engine is being profiled."""
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
 
     def stop(self) -> None:
         self.running = False
@@ -85,91 +198,222 @@ class Engine:
     def toggle(self) -> None:
         self.running = not self.running
 
-    def run(self, scene: Scene) -> None:
+    def finished(self) -> bool:
+        """Determine whether the engine has run for all of its `ticks`."""
+        return self.ticks is not None and self.frame_count >= self.ticks
+
+    def snapshot(self) -> Snapshot:
+        """Save the state of the root scene, and of the engine."""
+        return Snapshot.take(self)
+
+    def restore(self, snapshot: Snapshot) -> Scene:
+        """Replace the root scene, and the state of the engine, with a snapshot.
+
+        Any signals connected to the old scene are disconnected, `replaced` is called
+        on every node of the old scene, and `restored` is called on every node of the
+        new scene, which is returned. Any input that is being replayed carries on
+        from the tick of the snapshot."""
+        state = snapshot.load()
+        if self.root is not None:
+            for node in self.root.walk():
+                node.replaced(self)
+        self.root = state.root
+        self.rng = state.rng
+        randomness.use(self.rng)
+        self.frame_count = state.frame_count
+        if self.replay is not None:
+            self.replay.seek(self.frame_count, self.frame_rate)
+        self.broadphase = Broadphase()
+        self.signals = SignalBus()
+        for callback, emitter, signal, weak in state.subscriptions:
+            self.signals.connect(callback, emitter, signal, weak)
+        for node in state.root.walk():
+            node.restored(self)
+        return state.root
+
+    def resume(self, snapshot: Snapshot) -> None:
+        """Start the depict event loop from a snapshot, which may have been taken
+        by another engine.
+
+        As `frame_count` is restored, `ticks` counts the ticks from the start of
+        the original run, not from the snapshot."""
+        self.run(self.restore(snapshot), ready=False)
+
+    def rewind(self, checkpoints: int = 1) -> bool:
+        """Go back to an earlier checkpoint at the start of the next tick, where
+        1 is the latest one. Every checkpoint after it is thrown away.
+
+        Returns whether there was a checkpoint to go back to."""
+        if not 0 < checkpoints <= len(self.checkpoints):
+            return False
+        for _ in range(checkpoints - 1):
+            self.checkpoints.pop()
+        self._rewind_to = self.checkpoints[-1]
+        return True
+
+    def run(self, scene: Scene, ready: bool = True) -> None:
         """Start the depict event loop.
 
-        Creates a window and starts running scenes."""
+        Creates a window and starts running scenes. If `ready` is False, the
+        nodes of the scene are not readied, as they were restored from a
+        snapshot that was taken after they were."""
         self.root = scene
+        randomness.use(self.rng)
+        pygame.init()
 
-        # If we're recording, create a .mp4 file.
-        video: vidmaker.Video | None = None
+        # If we're recording, stream the frames to a .mp4 file.
+        recorder: Recorder | None = None
         if self.record is True:
-            # vidmaker.Video has incorrect type annotations...
-            video = vidmaker.Video(
-                path=f"{scene.tag}.mp4",
-                fps=self.frame_rate,  # type: ignore
-                resolution=(self.size.width, self.size.height),  # type: ignore
+            # Imported here, as OpenCV is slow to import and rarely needed.
+            from depict.recorder import Recorder
+
+            recorder = Recorder(f"{scene.tag}.mp4", self.size, self.frame_rate)
+        input_recorder: InputRecorder | None = (
+            InputRecorder(
+                self.record_input, self.rng.entropy, self.size, self.frame_rate
             )
+            if self.record_input is not None
+            else None
+        )
 
         # Create the window according to the given size.
-        screen = Window(size=self.size)
+        screen = Window(size=self.size, headless=self.headless)
         screen.set_title(self.title if self.title else self.root.__class__.__name__)
-        MANAGER.set_window_resolution(astuple(self.size))
+        ui: pgui.UIManager = manager()
+        ui.set_window_resolution(astuple(self.size))
         self.screen = screen
 
         assert screen.surface is not None
 
-        def tick(scene: Scene, delta: float):
-            """Update all nodes in a scene recursively."""
-            assert screen.surface is not None
+        # Every node draws onto the same canvas, which is flushed once per frame.
+        canvas: Canvas = Canvas(screen.surface, track=self.dirty_rects)
+        # The areas painted last frame, which have to be cleared and shown again.
+        previous: list[pygame.Rect] = []
 
-            # Run the `draw()` and `tick()` methods of each scene.
-            # If the engine has just started, run the `ready()`` method of each scene.
-            if delta != 0.0:
-                scene.draw(Canvas(screen.surface))
-                scene.tick(delta, self)
-            else:
-                scene.ready(self)
-
-            # Escape recursion if there are no children left.
-            if len(scene.children) == 0:
-                return
-
-            # Propagate updates down to the children recursively.
-            for child in scene.children:
-                tick(child, delta)
-
-        tick(scene, delta=0.0)
+        # Ready every node, including any that are added by another node's `ready`.
+        unready: list[Scene] = [scene] if ready else []
+        while unready:
+            node: Scene = unready.pop()
+            node.ready(self)
+            unready.extend(reversed(node.children))
 
         # Fill the canvas with a background color before starting.
-        with Canvas(screen.surface) as canvas:
-            canvas.fill(self.background)
+        canvas.fill(self.background)
 
-        # Run the event loop indefinitely.
+        # Run the event loop until we are stopped or have run out of ticks.
         clock: Clock = Clock()
+        profiler: Profiler | None = self.profiler
+        profiling.activate(profiler)
+        loop_start: float = time.perf_counter()
         try:
-            while self.running:
+            while self.running and not self.finished():
+                if self._rewind_to is not None:
+                    scene = self.restore(self._rewind_to)
+                    self._rewind_to = None
+                    # Every part of the window may have changed.
+                    canvas.fill(self.background)
+                    previous = [screen.surface.get_rect()]
+
                 # Save the time elapsed since `tick` was called, and increment `frame_count`.
-                delta: float = clock.tick(self.frame_rate) / 1000.0
+                # Headless engines step by a fixed amount instead of waiting for the clock.
+                delta: float = (
+                    1.0 / self.frame_rate
+                    if self.headless
+                    else clock.tick(self.frame_rate) / 1000.0
+                )
+                if self.replay is not None:
+                    if (state := self.replay.next(self.frame_rate)) is None:
+                        break
+                    if self.replay.size != self.size:
+                        state = state.scaled(self.replay.size, self.size)
+                    delta = state.delta
+                    inputs.use(state)
                 self.frame_count += 1
+                frame_start: float = time.perf_counter()
 
                 # Handle any queued events.
-                for event in Event.get():
-                    if event.type == pygame.QUIT:
-                        raise KeyboardInterrupt
-
-                    # Pipe the event to the UI Manager.
-                    MANAGER.process_events(event)
-
-                # Clear the screen.
-                if self.clear is True:
-                    with Canvas(screen.surface) as canvas:
-                        canvas.fill(self.background)
-
-                # We have initialized the event loop, so we are ready to tick.
-                tick(scene, delta)
+                with self.phase("events"):
+                    for event in Event.get():
+                        if event.type == pygame.QUIT:
+                            raise KeyboardInterrupt
+
+                        # Pipe the event to the UI Manager.
+                        ui.process_events(event)
+                    # Every node sees the same input for the whole tick.
+                    if input_recorder is not None:
+                        inputs.use(input_recorder.capture(delta, self.frame_count - 1))
+
+                # Update every node, and then draw every node with the new state.
+                # Nodes added or removed while updating are only seen by the
+                # draw pass, as the list of nodes is rebuilt after any change.
+                start: float = time.perf_counter()
+                with self.phase("update"):
+                    if profiler is None:
+                        for node in scene.walk():
+                            node.tick(delta, self)
+                    else:
+                        profiler.tick_nodes(scene.walk(), delta, self)
+                updated: float = time.perf_counter()
+                with self.phase("draw"):
+                    # Clear the screen.
+                    if self.clear is True:
+                        if self.dirty_rects:
+                            canvas.clear(previous, self.background)
+                        else:
+                            canvas.fill(self.background)
+                    if profiler is None:
+                        for node in scene.painted():
+                            node.paint(canvas)
+                    else:
+                        profiler.draw_nodes(scene.painted(), canvas)
+                    canvas.flush()
+                self.update_time += updated - start
+                self.draw_time += time.perf_counter() - updated
+
+                painted: list[pygame.Rect] = canvas.painted()
 
                 # Update the screen in pgui and pygame.
-                MANAGER.update(delta)
-                MANAGER.draw_ui(screen.surface)
-                screen.tick()
-
-                # mypy mistakenly doesn't realize that the `video` is guarded.
-                if self.record is True and video is not None:
-                    video.update(
-                        pygame.surfarray.pixels3d(screen.surface).swapaxes(0, 1),
-                    )
+                with self.phase("ui"):
+                    ui.update(delta)
+                    ui.draw_ui(screen.surface)
+                    if self.dirty_rects:
+                        painted.extend(_ui_areas(ui))
+                if profiler is not None and profiler.overlay:
+                    with self.phase("overlay"):
+                        painted.append(profiler.draw_overlay(screen.surface))
+                with self.phase("display"):
+                    if self.dirty_rects:
+                        screen.tick(_merge(previous + painted))
+                        previous = _merge(painted)
+                    else:
+                        screen.tick()
+
+                if recorder is not None:
+                    with self.phase("record"):
+                        recorder.capture(screen.surface)
+
+                if (
+                    self.checkpoint_every
+                    and self.frame_count % self.checkpoint_every == 0
+                ):
+                    with self.phase("checkpoint"):
+                        self.checkpoints.append(self.snapshot())
+
+                if profiler is not None:
+                    profiler.end_frame(frame_start)
         except KeyboardInterrupt:
-            # mypy mistakenly doesn't realize that the `video` is guarded.
-            if self.record is True and video is not None:
-                video.export()
+            pass
+        finally:
+            self.loop_time += time.perf_counter() - loop_start
+            profiling.activate(None)
+            inputs.use(None)
+            # Release everything, even if a scene, or releasing something else,
+            # raised an exception. They are released from the last to the first.
+            with ExitStack() as cleanup:
+                cleanup.callback(screen.close)
+                if input_recorder is not None:
+                    cleanup.callback(input_recorder.close)
+                if recorder is not None:
+                    cleanup.callback(recorder.close)
+                if profiler is not None:
+                    cleanup.callback(profiler.finish_trace)
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 """Monitor and control input devices such as the keyboard and mouse."""
 
+import math
+import struct
+import zlib
 from enum import Enum
+from pathlib import Path
+from typing import IO, Iterator
 
 import pygame
-from attrs import astuple
-from depict.vec3d import Point
+from attrs import astuple, define, evolve, field
+from depict.vec3d import Point, Size
 
 
 class MouseButton(Enum):
@@ -176,6 +181,280 @@ class Cursor(Enum):
     TriRight = pygame.cursors.tri_right
 
 
+# The modifier keys, which are checked through the modifier mask instead of the
+# state of each key.
+MODIFIERS: dict[Key, int] = {
+    Key.LShift: pygame.KMOD_LSHIFT,
+    Key.RShift: pygame.KMOD_RSHIFT,
+    Key.LCtrl: pygame.KMOD_LCTRL,
+    Key.RCtrl: pygame.KMOD_RCTRL,
+    Key.LAlt: pygame.KMOD_LALT,
+    Key.RAlt: pygame.KMOD_RALT,
+    Key.LMeta: pygame.KMOD_LMETA,
+    Key.RMeta: pygame.KMOD_RMETA,
+    Key.CapsLock: pygame.KMOD_CAPS,
+    Key.NumLock: pygame.KMOD_NUM,
+}
+
+# The keycode of every key that is recorded.
+_KEYCODES: list[int] = [key.value for key in Key]
+
+
+@define
+class InputState:
+    """The state of the mouse and keyboard during one tick.
+
+    Attributes:
+        `delta`: The time that the tick stepped by, in seconds.
+        `mouse`: The position of the mouse cursor.
+        `buttons`: A mask of the mouse buttons that are pressed, where bit `n` is
+            set if the button with the value `n + 1` is pressed.
+        `mods`: A mask of the modifier keys that are pressed.
+        `keys`: The keycodes of every other key that is pressed.
+        `tick`: The number of the tick, counting from 0. A run that was rewound or
+            resumed goes back or skips ahead to the tick of the snapshot."""
+
+    delta: float
+    mouse: tuple[int, int] = (0, 0)
+    buttons: int = 0
+    mods: int = 0
+    keys: tuple[int, ...] = ()
+    tick: int = 0
+
+    # The tick, delta, mouse position, buttons, mods and number of keys of a tick.
+    RECORD = struct.Struct("<IdiiBHB")
+
+    @staticmethod
+    def capture(delta: float, tick: int = 0) -> InputState:
+        """Read the current state of the mouse and keyboard during `tick`."""
+        pressed = pygame.key.get_pressed()
+        x, y = pygame.mouse.get_pos()
+        buttons: int = 0
+        for i, button in enumerate(pygame.mouse.get_pressed(num_buttons=5)):
+            buttons |= button << i
+        return InputState(
+            delta,
+            (x, y),
+            buttons,
+            pygame.key.get_mods(),
+            tuple(code for code in _KEYCODES if pressed[code]),
+            tick,
+        )
+
+    def pack(self) -> bytes:
+        """Pack the state into bytes."""
+        keys: tuple[int, ...] = self.keys[:255]
+        return InputState.RECORD.pack(
+            self.tick, self.delta, *self.mouse, self.buttons, self.mods, len(keys)
+        ) + struct.pack(f"<{len(keys)}I", *keys)
+
+    def scaled(self, source: Size, target: Size) -> InputState:
+        """Move the mouse from where it is in a window of size `source` to the same
+        place in a window of size `target`."""
+        x, y = self.mouse
+        return evolve(
+            self,
+            mouse=(
+                round(x * target.width / source.width),
+                round(y * target.height / source.height),
+            ),
+        )
+
+    @staticmethod
+    def unpack(data: bytes, offset: int) -> tuple[InputState, int]:
+        """Unpack a state from `data` at `offset`, returning it along with the offset
+        of the next state."""
+        tick, delta, x, y, buttons, mods, count = InputState.RECORD.unpack_from(
+            data, offset
+        )
+        offset += InputState.RECORD.size
+        keys: tuple[int, ...] = struct.unpack_from(f"<{count}I", data, offset)
+        return (
+            InputState(delta, (x, y), buttons, mods, keys, tick),
+            offset + 4 * count,
+        )
+
+
+# The input that nodes see this tick, if it is being recorded or replayed, instead
+# of the live state of the mouse and keyboard.
+CURRENT: InputState | None = None
+
+
+def use(state: InputState | None) -> None:
+    """Make nodes see `state` as the input of this tick, or the live input if it
+    is None."""
+    global CURRENT
+    CURRENT = state
+
+
+# The start of every input log, followed by the version of its format.
+MAGIC: bytes = b"DPIN"
+VERSION: int = 2
+# The version, the size of the window, the frame rate, and the length of the seed.
+HEADER = struct.Struct("<BHHHB")
+
+
+@define(eq=False)
+class InputRecorder:
+    """Records the input of every tick to a file, so that a run can be replayed.
+
+    The file starts with a header holding the seed of the run, followed by the
+    state of each tick, compressed as it is written.
+
+    Attributes:
+        `path`: The file to write the input to.
+        `seed`: The seed of the run, which every random number came from.
+        `size`: The width and height of the window.
+        `frame_rate`: The number of ticks per second."""
+
+    path: Path
+    seed: int
+    size: Size
+    frame_rate: int
+    _file: IO[bytes] = field(init=False)
+    _compressor: zlib._Compress = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        seed: bytes = self.seed.to_bytes((self.seed.bit_length() + 7) // 8, "little")
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._file.write(
+            HEADER.pack(
+                VERSION, self.size.width, self.size.height, self.frame_rate, len(seed)
+            )
+            + seed
+        )
+        self._compressor = zlib.compressobj()
+
+    def capture(self, delta: float, tick: int = 0) -> InputState:
+        """Record the current input during `tick`, which is returned."""
+        return self.write(InputState.capture(delta, tick))
+
+    def write(self, state: InputState) -> InputState:
+        """Record `state` as the input of the next tick."""
+        self._file.write(self._compressor.compress(state.pack()))
+        return state
+
+    def close(self) -> None:
+        """Finish writing the file."""
+        if not self._file.closed:
+            self._file.write(self._compressor.flush())
+            self._file.close()
+
+    def __enter__(self) -> InputRecorder:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+@define
+class InputLog:
+    """The input of every tick of a recorded run, to be replayed.
+
+    Attributes:
+        `seed`: The seed of the run, which the replay must use too.
+        `size`: The width and height of the window when it was recorded.
+        `frame_rate`: The number of ticks per second when it was recorded.
+        `states`: The input of each tick, in the order that the ticks were run.
+
+    A log can be replayed at another frame rate, in which case each tick sees the
+    input that was recorded at the time of the tick, so each input is held for
+    every tick during it, or skipped if it was shorter than a tick."""
+
+    seed: int
+    size: Size
+    frame_rate: int
+    states: list[InputState]
+    # The index of the next state to replay, and the time of it that has been
+    # replayed already when replaying at another frame rate.
+    _next: int = field(init=False, default=0)
+    _elapsed: float = field(init=False, default=0.0)
+
+    @staticmethod
+    def open(path: Path) -> InputLog:
+        """Read the input that was recorded to a file."""
+        data: bytes = Path(path).read_bytes()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not an input log")
+        offset: int = len(MAGIC)
+        version, width, height, frame_rate, length = HEADER.unpack_from(data, offset)
+        if version != VERSION:
+            raise ValueError(f"{path} is an input log of unknown version {version}")
+        offset += HEADER.size
+        seed: int = int.from_bytes(data[offset : offset + length], "little")
+        return InputLog(
+            seed,
+            Size(width, height),
+            frame_rate,
+            [*_unpack_all(zlib.decompress(data[offset + length :]))],
+        )
+
+    def seek(self, tick: int, frame_rate: int | None = None) -> None:
+        """Replay from the input of `tick`, counting from 0, where ticks are run at
+        `frame_rate`, or at the frame rate of the recording if it is None.
+
+        A recording that was rewound has more than one input for some ticks. If
+        the next input is for `tick`, the rewind was recorded, so the replay carries
+        on. Otherwise, it goes back to the latest input for `tick` before the next
+        one, or on to the first input for it after."""
+        elapsed: float = 0.0
+        if frame_rate is not None and frame_rate != self.frame_rate:
+            # Find the tick of the recording at the same time.
+            recorded: float = tick * self.frame_rate / frame_rate
+            tick = math.floor(recorded + 1e-9)
+            elapsed = max(recorded - tick, 0.0) / self.frame_rate
+        self._next = self._find(tick)
+        self._elapsed = elapsed
+
+    def _find(self, tick: int) -> int:
+        """Find the index of the input to replay `tick` from."""
+        states: list[InputState] = self.states
+        start: int = min(self._next, len(states))
+        if start < len(states) and states[start].tick == tick:
+            return start
+        for index in range(start - 1, -1, -1):
+            if states[index].tick == tick:
+                return index
+        for index in range(start, len(states)):
+            if states[index].tick == tick:
+                return index
+        return len(states)
+
+    def next(self, frame_rate: int | None = None) -> InputState | None:
+        """Get the input of the next tick, or None once every tick has been
+        replayed.
+
+        If `frame_rate` is not the frame rate of the recording, the input is
+        replayed at it instead, and the input of each tick steps by
+        `1 / frame_rate`."""
+        if self._next >= len(self.states):
+            return None
+        state: InputState = self.states[self._next]
+        if frame_rate is None or frame_rate == self.frame_rate:
+            self._next += 1
+            return state
+
+        delta: float = 1.0 / frame_rate
+        self._elapsed += delta
+        # Move on past every input that ended before the next tick starts.
+        while (
+            self._next < len(self.states)
+            and self._elapsed >= self.states[self._next].delta - 1e-9
+        ):
+            self._elapsed -= self.states[self._next].delta
+            self._next += 1
+        return evolve(state, delta=delta)
+
+
+def _unpack_all(data: bytes) -> Iterator[InputState]:
+    """Unpack every state in `data`."""
+    offset: int = 0
+    while offset < len(data):
+        state, offset = InputState.unpack(data, offset)
+        yield state
+
+
 class Mouse:
     """Methods for manipulating the mouse."""
 
@@ -207,11 +486,15 @@ class Mouse:
     @staticmethod
     def get_pos() -> Point[int]:
         """Get the position of the mouse cursor."""
-        return Point[int](*pygame.mouse.get_pos())
+        if CURRENT is not None:
+            return Point(*CURRENT.mouse)
+        return Point(*pygame.mouse.get_pos())
 
     @staticmethod
     def is_pressed(button: MouseButton) -> bool:
         """Check whether the given mouse `button` is pressed."""
+        if CURRENT is not None:
+            return bool(CURRENT.buttons >> (button.value - 1) & 1)
         pygame.event.get()
         buttons = pygame.mouse.get_pressed(num_buttons=5)
         return buttons[button.value - 1]
@@ -226,21 +509,11 @@ class Keyboard:
     @staticmethod
     def is_pressed(key: Key) -> bool:
         """Check whether the given keyboard `key` is pressed."""
-        MODS: dict[Key, int] = {
-            Key.LShift: pygame.KMOD_LSHIFT,
-            Key.RShift: pygame.KMOD_RSHIFT,
-            Key.LCtrl: pygame.KMOD_LCTRL,
-            Key.RCtrl: pygame.KMOD_RCTRL,
-            Key.LAlt: pygame.KMOD_LALT,
-            Key.RAlt: pygame.KMOD_RALT,
-            Key.LMeta: pygame.KMOD_LMETA,
-            Key.RMeta: pygame.KMOD_RMETA,
-            Key.CapsLock: pygame.KMOD_CAPS,
-            Key.NumLock: pygame.KMOD_NUM,
-        }
         # I do not know what this is. I do not know why I wrote this.
         # All I know is that I won't touch this.
-        if key not in MODS:
+        if key not in MODIFIERS:
+            if CURRENT is not None:
+                return key.value in CURRENT.keys
             return pygame.key.get_pressed()[key.value]
-        mask = pygame.key.get_mods()
-        return bool(mask & MODS[key])
+        mask = pygame.key.get_mods() if CURRENT is None else CURRENT.mods
+        return bool(mask & MODIFIERS[key])
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+"""Numerical integrators, for moving bodies according to their acceleration."""
+
+from typing import Protocol
+
+from attrs import define
+from depict.vec3d import Point, Vec2D
+
+# Velocities and accelerations are measured per tick of an engine running at this
+# many ticks per second, whatever the engine is actually running at.
+TICKS_PER_SECOND: int = 60
+
+
+class Body(Protocol):
+    """Anything with a position and velocity that can be integrated.
+
+    Time is measured in ticks, so a body moving with a velocity of 1 moves by 1
+    each tick. See `TICKS_PER_SECOND`."""
+
+    position: Point
+    velocity: Vec2D
+
+    def acceleration_at(self, position: Point, velocity: Vec2D) -> Vec2D:
+        """The acceleration of the body if it had the given position and velocity."""
+        ...
+
+
+class Integrator(Protocol):
+    """A method of advancing a body through time."""
+
+    def step(self, body: Body, dt: float) -> None:
+        """Move the body forwards by `dt` ticks."""
+        ...
+
+
+@define
+class SemiImplicitEuler:
+    """Updates the velocity, and then moves by the new velocity.
+
+    This is the cheapest integrator, and unlike explicit Euler it is symplectic,
+    so orbits neither spiral in nor fly apart over time."""
+
+    def step(self, body: Body, dt: float) -> None:
+        acceleration: Vec2D = body.acceleration_at(body.position, body.velocity)
+        if dt == 1:
+            body.velocity.iadd(acceleration)
+            body.position = body.position + body.velocity
+        else:
+            body.velocity.iadd(acceleration * dt)
+            body.position = body.position + body.velocity * dt
+
+
+@define
+class VelocityVerlet:
+    """Moves using the average of the acceleration at the start and end of the step.
+
+    This is symplectic and second order, so it is far more accurate than Euler for
+    forces that depend on position, such as springs and gravity, at the cost of
+    evaluating the acceleration twice per step."""
+
+    def step(self, body: Body, dt: float) -> None:
+        position: Point = body.position
+        velocity: Vec2D = body.velocity
+        start: Vec2D = body.acceleration_at(position, velocity)
+        body.position = position + velocity * dt + start * (0.5 * dt * dt)
+        end: Vec2D = body.acceleration_at(body.position, velocity + start * dt)
+        body.velocity = velocity + (start + end) * (0.5 * dt)
+
+
+@define
+class RK4:
+    """The classic fourth order Runge-Kutta method.
+
+    This is the most accurate integrator for a given step, but it evaluates the
+    acceleration four times per step, and unlike Verlet it slowly loses energy."""
+
+    def step(self, body: Body, dt: float) -> None:
+        position: Point = body.position
+        velocity: Vec2D = body.velocity
+        half: float = 0.5 * dt
+
+        a1: Vec2D = body.acceleration_at(position, velocity)
+        v2: Vec2D = velocity + a1 * half
+        a2: Vec2D = body.acceleration_at(position + velocity * half, v2)
+        v3: Vec2D = velocity + a2 * half
+        a3: Vec2D = body.acceleration_at(position + v2 * half, v3)
+        v4: Vec2D = velocity + a3 * dt
+        a4: Vec2D = body.acceleration_at(position + v3 * dt, v4)
+
+        sixth: float = dt / 6
+        body.position = position + (velocity + 2 * v2 + 2 * v3 + v4) * sixth
+        body.velocity = velocity + (a1 + 2 * a2 + 2 * a3 + a4) * sixth
+
+
+def split_steps(elapsed: float, substeps: int, limit: float = 4.0) -> tuple[int, float]:
+    """Split `elapsed` ticks into whole steps of `1 / substeps` ticks.
+
+    Returns the number of steps to take, and the time left over, which should be
+    added to the next frame so that no time is lost. At most `limit` ticks are
+    stepped at once, so that one slow frame does not make the next even slower."""
+    if elapsed > limit:
+        elapsed = limit
+    # Allow a little rounding error, so that a tick of exactly 1 is never 0 steps.
+    steps: int = int(elapsed * substeps + 1e-9)
+    rest: float = elapsed - steps / substeps
+    return steps, rest if rest > 0 else 0.0
@@ -48,10 +48,21 @@ class Time:
 
 
 class Font(Enum):
-    """Render and load fonts."""
+    """Render and load fonts.
+
+    Each font is the name and size of a system font, which is only loaded when it
+    is first used, as searching for system fonts is slow."""
 
     # TODO: Add more fonts.
-    Monospace = pygame.font.SysFont("monospace", 14)
+    Monospace = ("monospace", 14)
+
+    @property
+    def font(self) -> pygame.font.Font:
+        """Get the loaded font, loading it if needed."""
+        if (font := _LOADED_FONTS.get(self)) is None:
+            pygame.font.init()
+            font = _LOADED_FONTS[self] = pygame.font.SysFont(*self.value)
+        return font
 
     @staticmethod
     def get_fonts() -> list[str]:
@@ -63,7 +74,7 @@ class Font(Enum):
 
         Create a surface with `text` rendered onto it with a foreground and background
         color. If no background color is specified, it defaults to no background."""
-        return self.value.render(
+        return self.font.render(
             text,
             True,
             fg._to_pygame_color(),
@@ -71,6 +82,10 @@ class Font(Enum):
         )
 
 
+# The fonts that have been loaded so far.
+_LOADED_FONTS: dict[Font, pygame.font.Font] = {}
+
+
 class Event:
     """Query and manipulate pygame events."""
 
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from attrs import Factory, define
+from typing import Any, cast
+
+from attrs import define, field
 from depict.engine import Engine
 from depict.nodes import Node2D
-from depict.signal import Signal
+from depict.scene import Scene
+from depict.signal import Signal, SignalBus
+from depict.spatial import Broadphase
 from depict.vec3d import Point, Size
 
 
@@ -41,34 +45,85 @@ class Area2D(Node2D):
     __hash__ = object.__hash__  # type: ignore
 
     size: Size = Size(20, 20)
-    # The list of bodies currently inside the Area2D.
-    bodies: list[Node2D] = Factory(list)
+    # The bodies currently inside the Area2D, by their id.
+    _bodies: dict[int, Node2D] = field(factory=dict, init=False)
+
+    @property
+    def bodies(self) -> list[Node2D]:
+        """The bodies currently inside the area, in the order that they entered."""
+        return [*self._bodies.values()]
 
     def inside(self, body: Node2D) -> bool:
         """Determine whether a `body` is inside the area."""
-        pos: Point = body.position.constrain(self.position, self.position + self.size)
-        return pos == body.position
+        start: Point = self.position
+        position: Point = body.position
+        return (
+            start.x <= position.x <= start.x + self.size.x
+            and start.y <= position.y <= start.y + self.size.y
+            and start.z <= position.z <= start.z + self.size.z
+        )
+
+    def nearby(self, engine: Engine) -> list[Node2D]:
+        """Find the bodies that may be inside the area, using the shared broadphase."""
+        assert engine.root is not None
+        broadphase: Broadphase[Scene] = engine.broadphase
+        if broadphase.is_stale(engine.frame_count):
+            bodies: list[Node2D] = [
+                node for node in engine.root.world() if isinstance(node, Node2D)
+            ]
+            broadphase.rebuild(
+                bodies, (body.position for body in bodies), engine.frame_count
+            )
+        return cast(
+            list[Node2D],
+            broadphase.query_rect(self.position, self.position + self.size),
+        )
+
+    def excluded(self) -> set[int]:
+        """Find the ids of the nodes that the area should not detect."""
+        # Area2D should not detect itself, its children, its parent, or its siblings.
+        excluded: set[int] = {id(self)}
+        excluded.update(id(child) for child in self.children)
+        if self.parent is not None:
+            excluded.add(id(self.parent))
+            excluded.update(id(child) for child in self.parent.children)
+        return excluded
+
+    def restored(self, engine: Engine) -> None:
+        # The bodies were recreated, so they have new ids.
+        self._bodies = {id(body): body for body in self._bodies.values()}
 
     def tick(self, delta: float, engine: Engine) -> None:
-        assert engine.root is not None
-        for node in engine.root.world():
-            if (
-                # Cannot check whether node is inside area if it has no position.
-                not isinstance(node, Node2D)
-                # Area2D should not detect itself or it's children.
-                or node == self
-                or node in self.children
-                # Area2D should not detect itself or it's children.
-                # TODO: This is probably buggy.
-                or node == self.parent
-                or node in (self.parent.children if self.parent else [])
-            ):
-                continue
-            if self.inside(node):
-                BodyInArea(self, node).emit(engine.signals[self])
-                if node not in self.bodies:
-                    self.bodies.append(node)
-                    OnBodyEntered(self, node).emit(engine.signals[self])
-            elif node in self.bodies:
-                self.bodies.remove(node)
-                OnBodyExited(self, node).emit(engine.signals[self])
+        excluded: set[int] = self.excluded()
+        candidates: dict[int, Node2D] = {
+            id(node): node for node in self.nearby(engine) if id(node) not in excluded
+        }
+        # Bodies that were inside may have left, even if the broadphase missed them.
+        for key, body in self._bodies.items():
+            candidates.setdefault(key, body)
+
+        # Only collect the bodies in the area if something wants to know.
+        signals: SignalBus = engine.signals
+        inside: list[tuple[Any, ...]] | None = (
+            [] if signals.subscribed(self, BodyInArea) else None
+        )
+        entered: list[tuple[Any, ...]] = []
+        exited: list[tuple[Any, ...]] = []
+        for key, node in candidates.items():
+            # Bodies that have been removed from the scene have left the area too.
+            if node in engine.broadphase and self.inside(node):
+                if inside is not None:
+                    inside.append((self, node))
+                if key not in self._bodies:
+                    self._bodies[key] = node
+                    entered.append((self, node))
+            elif key in self._bodies:
+                del self._bodies[key]
+                exited.append((self, node))
+
+        if inside:
+            signals.emit_many(self, BodyInArea, inside)
+        if entered:
+            signals.emit_many(self, OnBodyEntered, entered)
+        if exited:
+            signals.emit_many(self, OnBodyExited, exited)
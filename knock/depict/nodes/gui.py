@@ -4,15 +4,17 @@ from typing import TYPE_CHECKING, Callable
 
 import depict.color as color
 import pygame
-import pygame_gui as pgui
 from attrs import define
 from depict.color import Color
-from depict.engine import MANAGER
+from depict.engine import manager
 from depict.misc import Font
 from depict.nodes import Node2D
+from depict.scene import transient
 
 if TYPE_CHECKING:
+    import pygame_gui as pgui
     from depict.canvas import Canvas
+    from depict.engine import Engine
 
 
 # TODO: This is very experimental and will most definitely be buggy.
@@ -23,17 +25,32 @@ class Label(Node2D):
     tag: str = "Label"
     text: str = ""
     color: Color = color.White
-    _label: pgui.elements.UILabel | None = None
+    _label: pgui.elements.UILabel | None = transient(default=None)
 
     def __attrs_post_init__(self) -> None:
-        self._label = pgui.elements.UILabel(
+        super().__attrs_post_init__()
+        self._show()
+
+    def restored(self, engine: Engine) -> None:
+        self._show()
+
+    def replaced(self, engine: Engine) -> None:
+        # The element is shared with the UI manager, so it has to be removed from it.
+        if self._label is not None:
+            self._label.kill()
+
+    def _show(self) -> None:
+        """Create the UI element of the label."""
+        from pygame_gui.elements import UILabel
+
+        self._label = UILabel(
             pygame.Rect(
                 self.position.x,
                 self.position.y,
-                *Font.Monospace.value.size(self.text + "     \n     "),
+                *Font.Monospace.font.size(self.text + "     \n     "),
             ),
             self.text,
-            MANAGER,
+            manager(),
         )
 
     def draw(self, canvas: Canvas) -> None:
@@ -49,18 +66,32 @@ class Button(Node2D):
     tag: str = "Button"
     text: str = ""
     color: Color = color.White
-    _button: pgui.elements.UIButton | None = None
+    _button: pgui.elements.UIButton | None = transient(default=None)
     on_click: Callable[[Button], None] | None = None
 
     def __attrs_post_init__(self) -> None:
-        self._button = pgui.elements.UIButton(
+        super().__attrs_post_init__()
+        self._show()
+
+    def restored(self, engine: Engine) -> None:
+        self._show()
+
+    def replaced(self, engine: Engine) -> None:
+        if self._button is not None:
+            self._button.kill()
+
+    def _show(self) -> None:
+        """Create the UI element of the button."""
+        from pygame_gui.elements import UIButton
+
+        self._button = UIButton(
             pygame.Rect(
                 self.position.x,
                 self.position.y,
-                *Font.Monospace.value.size(self.text + "     \n     "),
+                *Font.Monospace.font.size(self.text + "     \n     "),
             ),
             self.text,
-            MANAGER,
+            manager(),
         )
 
     def draw(self, canvas: Canvas) -> None:
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+"""Perlin noise, calculated for whole arrays of coordinates at once."""
+
+import numpy as np
+from attrs import define, field
+
+# The directions of the gradients at each corner of the grid.
+GRADIENTS_2D: np.ndarray = np.array(
+    [(1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)],
+    dtype=float,
+)
+GRADIENTS_3D: np.ndarray = np.array(
+    [
+        (1, 1, 0),
+        (-1, 1, 0),
+        (1, -1, 0),
+        (-1, -1, 0),
+        (1, 0, 1),
+        (-1, 0, 1),
+        (1, 0, -1),
+        (-1, 0, -1),
+        (0, 1, 1),
+        (0, -1, 1),
+        (0, 1, -1),
+        (0, -1, -1),
+        # Padded to 16 so that a hash can pick one with a mask.
+        (1, 1, 0),
+        (0, -1, 1),
+        (-1, 1, 0),
+        (0, -1, -1),
+    ],
+    dtype=float,
+)
+
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    """Ease a fraction so that the noise is smooth across the edges of cells."""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _split(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Split coordinates into the cells they are in, and where in the cell they are."""
+    cells: np.ndarray = np.floor(values)
+    return cells.astype(np.intp) & 255, values - cells
+
+
+@define
+class Perlin:
+    """Perlin noise, which varies smoothly and randomly from one point to the next.
+
+    Every method accepts scalars or arrays of any shape, and calculates the noise
+    for every coordinate at once. The noise is roughly between -1 and 1, and is
+    the same every time for the same `seed`.
+
+    Attributes:
+        `seed`: The seed used to shuffle the gradients, or None for a random one."""
+
+    seed: int | None = None
+    _permutation: np.ndarray = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        permutation: np.ndarray = np.random.default_rng(self.seed).permutation(256)
+        # Doubled so that hashing a cell never has to wrap around.
+        self._permutation = np.concatenate((permutation, permutation)).astype(np.intp)
+
+    def noise2(self, x: np.ndarray | float, y: np.ndarray | float) -> np.ndarray:
+        """Calculate 2D noise at each of the coordinates."""
+        xi, xf = _split(np.asarray(x, dtype=float))
+        yi, yf = _split(np.asarray(y, dtype=float))
+        u, v = _fade(xf), _fade(yf)
+        p: np.ndarray = self._permutation
+
+        def corner(dx: int, dy: int) -> np.ndarray:
+            gradient: np.ndarray = GRADIENTS_2D[p[p[xi + dx] + yi + dy] & 7]
+            return gradient[..., 0] * (xf - dx) + gradient[..., 1] * (yf - dy)
+
+        bottom: np.ndarray = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+        top: np.ndarray = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+        return bottom + v * (top - bottom)
+
+    def noise3(
+        self, x: np.ndarray | float, y: np.ndarray | float, z: np.ndarray | float
+    ) -> np.ndarray:
+        """Calculate 3D noise at each of the coordinates."""
+        xi, xf = _split(np.asarray(x, dtype=float))
+        yi, yf = _split(np.asarray(y, dtype=float))
+        zi, zf = _split(np.asarray(z, dtype=float))
+        u, v, w = _fade(xf), _fade(yf), _fade(zf)
+        p: np.ndarray = self._permutation
+
+        def corner(dx: int, dy: int, dz: int) -> np.ndarray:
+            gradient: np.ndarray = GRADIENTS_3D[
+                p[p[p[xi + dx] + yi + dy] + zi + dz] & 15
+            ]
+            return (
+                gradient[..., 0] * (xf - dx)
+                + gradient[..., 1] * (yf - dy)
+                + gradient[..., 2] * (zf - dz)
+            )
+
+        def lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+            return a + t * (b - a)
+
+        near: np.ndarray = lerp(
+            lerp(corner(0, 0, 0), corner(1, 0, 0), u),
+            lerp(corner(0, 1, 0), corner(1, 1, 0), u),
+            v,
+        )
+        far: np.ndarray = lerp(
+            lerp(corner(0, 0, 1), corner(1, 0, 1), u),
+            lerp(corner(0, 1, 1), corner(1, 1, 1), u),
+            v,
+        )
+        return lerp(near, far, w)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+"""Measuring where the time in each frame goes."""
+
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator
+
+import depict.color as color
+import numpy as np
+import pygame
+from attrs import Factory, define, field
+from depict.misc import Font
+
+if TYPE_CHECKING:
+    from depict.canvas import Canvas
+    from depict.engine import Engine
+    from depict.scene import Scene
+
+# The profiler of the engine that is currently running, if it is being profiled.
+# Signals are emitted without a reference to the engine, so they report here.
+ACTIVE: Profiler | None = None
+
+
+@define(eq=False)
+class Profiler:
+    """Times each phase of every frame, and the nodes of each class.
+
+    The durations of the most recent `window` frames are kept, so that rolling
+    percentiles can be queried with `percentile`, drawn on top of the window with
+    `overlay`, or written to a Chrome trace (viewable in `chrome://tracing` or
+    Perfetto). Traced events are written to the trace in batches of
+    `trace_buffer`, so that long runs do not keep every event in memory, and the
+    trace is finished when the engine stops.
+
+    The phases of a frame are `events`, `update`, `draw`, `ui`, `overlay`,
+    `display`, `record` and `checkpoint`, along with `frame` for the whole frame.
+    `signals` is the time spent calling signal callbacks, which happens during the
+    other phases.
+
+    Attributes:
+        `window`: The number of recent frames that percentiles are calculated over.
+        `overlay`: Whether to draw the measurements on top of the window.
+        `trace_path`: Where to write a Chrome trace when the engine stops, if anywhere.
+        `trace_buffer`: The number of traced events kept before they are written.
+        `phases`: The durations of each phase in recent frames, in seconds.
+        `nodes`: The time spent in the nodes of each class in recent frames, in seconds.
+    """
+
+    window: int = 120
+    overlay: bool = False
+    trace_path: str | None = None
+    trace_buffer: int = 4096
+    phases: dict[str, deque[float]] = Factory(dict)
+    nodes: dict[str, deque[float]] = Factory(dict)
+    _frame_nodes: dict[str, float] = field(init=False, factory=dict)
+    _frame_signals: float = field(init=False, default=0.0)
+    _events: list[dict[str, Any]] = field(init=False, factory=list)
+    _origin: float = field(init=False, factory=time.perf_counter)
+    # The trace that events are written to, once the first batch is written.
+    _trace_file: IO[str] | None = field(init=False, default=None)
+
+    def _record(
+        self, samples: dict[str, deque[float]], name: str, seconds: float
+    ) -> None:
+        """Add the duration of `name` in the current frame to `samples`."""
+        if (recent := samples.get(name)) is None:
+            recent = samples[name] = deque(maxlen=self.window)
+        recent.append(seconds)
+
+    def _add_event(self, event: dict[str, Any]) -> None:
+        """Add an event to the trace, writing the events so far once there are
+        enough of them."""
+        self._events.append(event)
+        if len(self._events) >= self.trace_buffer:
+            self._write_events()
+
+    def _write_events(self) -> None:
+        """Write the events so far to the trace, starting it if needed."""
+        assert self.trace_path is not None
+        if self._trace_file is None:
+            self._trace_file = open(self.trace_path, "w")
+            self._trace_file.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+            separator: str = ""
+        else:
+            separator = ",\n"
+        if self._events:
+            self._trace_file.write(
+                separator + ",\n".join(map(json.dumps, self._events))
+            )
+        self._events.clear()
+
+    def _trace(self, name: str, category: str, start: float, seconds: float) -> None:
+        """Add a complete event to the trace, if there is one."""
+        if self.trace_path is not None:
+            self._add_event(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": seconds * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                }
+            )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the code inside the `with` block as a phase of the current frame."""
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds: float = time.perf_counter() - start
+            self._record(self.phases, name, seconds)
+            self._trace(name, "phase", start, seconds)
+
+    def tick_nodes(self, nodes: Iterable[Scene], delta: float, engine: Engine) -> None:
+        """Tick each of the `nodes`, timing each of them by class."""
+        clock = time.perf_counter
+        totals: dict[str, float] = self._frame_nodes
+        for node in nodes:
+            start: float = clock()
+            node.tick(delta, engine)
+            name: str = type(node).__name__
+            totals[name] = totals.get(name, 0.0) + clock() - start
+
+    def draw_nodes(self, nodes: Iterable[Scene], canvas: Canvas) -> None:
+        """Draw each of the `nodes`, timing each of them by class."""
+        clock = time.perf_counter
+        totals: dict[str, float] = self._frame_nodes
+        for node in nodes:
+            start: float = clock()
+            node.paint(canvas)
+            name: str = type(node).__name__
+            totals[name] = totals.get(name, 0.0) + clock() - start
+
+    def add_signal_time(self, seconds: float) -> None:
+        """Count time spent calling signal callbacks towards the current frame."""
+        self._frame_signals += seconds
+
+    def end_frame(self, start: float) -> None:
+        """Finish measuring the frame that began at `start`."""
+        seconds: float = time.perf_counter() - start
+        self._record(self.phases, "frame", seconds)
+        self._trace("frame", "frame", start, seconds)
+        self._record(self.phases, "signals", self._frame_signals)
+        for name, total in self._frame_nodes.items():
+            self._record(self.nodes, name, total)
+
+        if self.trace_path is not None:
+            # Time per node class is shown as a counter, as nodes of the same class
+            # are spread throughout the frame.
+            self._add_event(
+                {
+                    "name": "nodes (ms)",
+                    "ph": "C",
+                    "ts": (start - self._origin) * 1e6,
+                    "pid": 0,
+                    "args": {
+                        name: total * 1000 for name, total in self._frame_nodes.items()
+                    },
+                }
+            )
+        self._frame_nodes.clear()
+        self._frame_signals = 0.0
+
+    def percentile(self, name: str, q: float) -> float:
+        """Calculate the `q`th percentile of the recent durations of a phase or
+        node class, in seconds."""
+        recent: deque[float] | None = self.phases.get(name, self.nodes.get(name))
+        if not recent:
+            return 0.0
+        return float(np.percentile(recent, q))
+
+    def summary(self, limit: int = 5) -> list[str]:
+        """Describe the 50th and 95th percentiles of each phase, and of the `limit`
+        slowest node classes, as lines of text in milliseconds."""
+        lines: list[str] = [f"{'':<16}{'p50 ms':>8}{'p95 ms':>8}"]
+        slowest: list[str] = sorted(
+            self.nodes, key=lambda name: self.percentile(name, 50), reverse=True
+        )
+        for name in [*self.phases, *slowest[:limit]]:
+            lines.append(
+                f"{name[:16]:<16}"
+                f"{self.percentile(name, 50) * 1000:8.2f}"
+                f"{self.percentile(name, 95) * 1000:8.2f}"
+            )
+        return lines
+
+    def draw_overlay(self, surface: pygame.surface.Surface) -> pygame.Rect:
+        """Draw the summary in the top-left corner of `surface`, returning the area
+        that was drawn on."""
+        height: int = Font.Monospace.font.get_linesize()
+        area: pygame.Rect = pygame.Rect(4, 4, 0, 0)
+        for row, line in enumerate(self.summary()):
+            text: pygame.Surface = Font.Monospace.render(line, color.White, color.Black)
+            area.union_ip(surface.blit(text, (4, 4 + row * height)))
+        return area
+
+    def finish_trace(self) -> None:
+        """Write the remaining events, and finish the trace so that it can be read."""
+        if self.trace_path is None:
+            return
+        self._write_events()
+        assert self._trace_file is not None
+        self._trace_file.write("\n]}\n")
+        self._trace_file.close()
+        self._trace_file = None
+
+
+def activate(profiler: Profiler | None) -> None:
+    """Make `profiler` the one that signals report to."""
+    global ACTIVE
+    ACTIVE = profiler
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+"""Recording the window to a video file without slowing down the event loop."""
+
+import queue
+import threading
+
+import cv2
+import numpy as np
+import pygame
+from attrs import define, field
+from depict.vec3d import Size
+
+
+@define(eq=False)
+class Recorder:
+    """Streams frames to a video file, encoding them on a background thread.
+
+    Frames are copied into a ring of `capacity` preallocated buffers, which a
+    worker thread encodes and writes straight to disk. Memory use is therefore
+    fixed no matter how long the recording is. If the worker falls behind by more
+    than `capacity` frames, `capture` waits for a buffer to become free instead
+    of dropping frames. If the worker fails, the error is raised by the next call
+    to `capture` or `close`. Frames of a different size, such as after the window
+    is resized, are scaled to `size`.
+
+    Attributes:
+        `path`: The file to write the video to.
+        `size`: The width and height of the frames.
+        `fps`: The frame rate of the video.
+        `capacity`: The number of frames that can wait to be encoded."""
+
+    path: str
+    size: Size
+    fps: int
+    capacity: int = 8
+    _frames: np.ndarray = field(init=False)
+    _free: queue.Queue[int] = field(init=False, factory=queue.Queue)
+    _ready: queue.Queue[int | None] = field(init=False, factory=queue.Queue)
+    _writer: cv2.VideoWriter = field(init=False)
+    _worker: threading.Thread = field(init=False)
+    # The error that stopped the worker, until it has been raised.
+    _error: BaseException | None = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        self._frames = np.empty(
+            (self.capacity, self.size.height, self.size.width, 3), dtype=np.uint8
+        )
+        for index in range(self.capacity):
+            self._free.put(index)
+        self._writer = cv2.VideoWriter(
+            self.path,
+            cv2.VideoWriter_fourcc(*"mp4v"),
+            self.fps,
+            (self.size.width, self.size.height),
+        )
+        self._worker = threading.Thread(target=self._encode, daemon=True)
+        self._worker.start()
+
+    def _encode(self) -> None:
+        """Write frames to disk as they become ready, until told to stop."""
+        try:
+            while (index := self._ready.get()) is not None:
+                frame: np.ndarray = self._frames[index]
+                self._writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+                self._free.put(index)
+        except BaseException as error:
+            self._error = error
+
+    def _check(self) -> None:
+        """Raise an error if the worker has stopped."""
+        if not self._worker.is_alive():
+            error, self._error = self._error, None
+            raise RuntimeError(f"Stopped writing frames to {self.path}") from error
+
+    def capture(self, surface: pygame.surface.Surface) -> None:
+        """Queue the current contents of a surface to be written as the next frame."""
+        self._check()
+        while True:
+            try:
+                index: int = self._free.get(timeout=0.1)
+                break
+            except queue.Empty:
+                self._check()
+        # The pixels are indexed by (x, y), while video frames are indexed by row.
+        pixels: np.ndarray = pygame.surfarray.pixels3d(surface).swapaxes(0, 1)
+        if pixels.shape == self._frames[index].shape:
+            np.copyto(self._frames[index], pixels)
+        else:
+            cv2.resize(
+                np.ascontiguousarray(pixels),
+                (self.size.width, self.size.height),
+                dst=self._frames[index],
+            )
+        # Release the lock on the surface as soon as possible.
+        del pixels
+        self._ready.put(index)
+
+    def close(self) -> None:
+        """Wait for every queued frame to be written, and finish the video file."""
+        try:
+            if self._worker.is_alive():
+                self._ready.put(None)
+                self._worker.join()
+        finally:
+            self._writer.release()
+        if self._error is not None:
+            raise RuntimeError(f"Failed to write {self.path}") from self._error
+
+    def __enter__(self) -> Recorder:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
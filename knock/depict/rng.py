@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+"""Random numbers that are the same every time a simulation is run with a seed."""
+
+import zlib
+from typing import Any, cast
+
+import numpy as np
+from attrs import define, field
+
+
+@define
+class Rng:
+    """A stream of random numbers, which can be split into independent substreams.
+
+    Each node draws from its own substream, so that drawing more numbers in one
+    node never changes the numbers drawn in another. Substreams are told apart by
+    a key and the number of substreams that were already made with that key, so
+    the same nodes built in the same order always get the same numbers.
+
+    Every draw can be made in bulk, as arrays, so that spawning many things at
+    once does not need a draw per attribute.
+
+    Attributes:
+        `seed`: The seed of the stream, or None for a different stream every run."""
+
+    seed: int | None = None
+    # The state that the stream is generated from, which substreams are given
+    # instead of a seed.
+    _sequence: np.random.SeedSequence | None = None
+    _generator: np.random.Generator = field(init=False)
+    # The number of substreams made with each key.
+    _streams: dict[str, int] = field(init=False, factory=dict)
+
+    def __attrs_post_init__(self) -> None:
+        if self._sequence is None:
+            self._sequence = np.random.SeedSequence(self.seed)
+        self._generator = np.random.default_rng(self._sequence)
+
+    @property
+    def entropy(self) -> int:
+        """The seed of the stream, which is made up if it was not given, so that a
+        stream without a seed can still be recreated."""
+        assert self._sequence is not None
+        return cast(int, self._sequence.entropy)
+
+    def stream(self, key: str) -> Rng:
+        """Make a new substream, independent of this stream and every other
+        substream."""
+        assert self._sequence is not None
+        count: int = self._streams.get(key, 0)
+        self._streams[key] = count + 1
+        return Rng(
+            self.seed,
+            sequence=np.random.SeedSequence(
+                self._sequence.entropy,
+                spawn_key=(*self._sequence.spawn_key, zlib.crc32(key.encode()), count),
+            ),
+        )
+
+    def random(self, size: Any = None) -> Any:
+        """Draw floats between 0 and 1."""
+        return self._generator.random(size)
+
+    def uniform(self, low: float, high: float, size: Any = None) -> Any:
+        """Draw floats between `low` and `high`."""
+        return self._generator.uniform(low, high, size)
+
+    def integers(self, low: int, high: int, size: Any = None) -> Any:
+        """Draw integers from `low` up to, but not including, `high`."""
+        return self._generator.integers(low, high, size)
+
+    def randint(self, low: int, high: int) -> int:
+        """Draw an integer from `low` up to and including `high`, like
+        `random.randint`."""
+        return int(self._generator.integers(low, high, endpoint=True))
+
+    def choice(self, options: Any, size: Any = None) -> Any:
+        """Pick from `options`."""
+        return self._generator.choice(options, size)
+
+    def vectors(
+        self,
+        count: int,
+        low: tuple[float, float] = (-1.0, -1.0),
+        high: tuple[float, float] = (1.0, 1.0),
+    ) -> np.ndarray:
+        """Draw `count` 2D vectors in the box from `low` to `high`, as a `(count, 2)`
+        array."""
+        return self._generator.uniform(low, high, (count, 2))
+
+    def directions(self, count: int) -> np.ndarray:
+        """Draw `count` unit vectors pointing in any direction, as a `(count, 2)`
+        array."""
+        theta: np.ndarray = self._generator.uniform(0, np.pi * 2, count)
+        return np.stack((np.cos(theta), np.sin(theta)), axis=1)
+
+    def colors(self, count: int, a: int = 255) -> np.ndarray:
+        """Draw `count` colors with opacity `a`, as a `(count, 4)` array of rgba
+        values."""
+        colors: np.ndarray = np.empty((count, 4), dtype=np.uint8)
+        colors[:, :3] = self._generator.integers(0, 256, (count, 3))
+        colors[:, 3] = a
+        return colors
+
+
+# The stream that nodes draw their substreams from, which is replaced by the
+# engine's stream when an engine is created.
+CURRENT: Rng = Rng()
+
+
+def current() -> Rng:
+    """Get the stream that nodes draw their substreams from."""
+    return CURRENT
+
+
+def use(rng: Rng) -> None:
+    """Make nodes draw their substreams from `rng`."""
+    global CURRENT
+    CURRENT = rng
+
+
+def seed(value: int | None) -> Rng:
+    """Start a new stream with a seed, and make nodes draw from it."""
+    use(rng := Rng(value))
+    return rng
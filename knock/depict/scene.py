@@ -1,14 +1,186 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable, SupportsIndex
 
-from attrs import Factory, define
+import depict.rng as randomness
+from attrs import define, field
+from depict.rng import Rng
 
 if TYPE_CHECKING:
+    import pygame
     from depict.canvas import Canvas
     from depict.engine import Engine
 
 
+def transient(**kwargs: Any) -> Any:
+    """Define a field that is left out of snapshots, such as a cache, or anything
+    that cannot be pickled. It is reset to its default when a snapshot is restored."""
+    return field(
+        init=False, eq=False, repr=False, metadata={"transient": True}, **kwargs
+    )
+
+
+class Children(list):
+    """The children of a scene, which tell the scene whenever they change.
+
+    This behaves exactly like a list, but every change to it clears the
+    lookup tables of its owner and of the owner's ancestors, so that they are
+    rebuilt the next time that they are needed."""
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: Scene, nodes: Iterable[Scene] = ()) -> None:
+        super().__init__(nodes)
+        self.owner: Scene = owner
+        self._adopt(self)
+
+    def _adopt(self, nodes: Iterable[Scene]) -> None:
+        """Mark the owner as the owner of `nodes`, and clear its lookup tables."""
+        for node in nodes:
+            node._owner = self.owner
+        self.owner._invalidate()
+
+    def _release(self, nodes: Iterable[Scene]) -> None:
+        """Forget the owner of `nodes` that were removed, unless they are still
+        children, so that they no longer keep it alive or tell it when they change."""
+        kept: set[int] | None = None
+        for node in nodes:
+            if node._owner is self.owner:
+                if kept is None:
+                    kept = {id(child) for child in self}
+                if id(node) not in kept:
+                    node._owner = None
+
+    def append(self, node: Scene) -> None:
+        super().append(node)
+        self._adopt((node,))
+
+    def extend(self, nodes: Iterable[Scene]) -> None:
+        nodes = list(nodes)
+        super().extend(nodes)
+        self._adopt(nodes)
+
+    def insert(self, index: SupportsIndex, node: Scene) -> None:
+        super().insert(index, node)
+        self._adopt((node,))
+
+    def remove(self, node: Scene) -> None:
+        removed: Scene = self[self.index(node)]
+        super().remove(node)
+        self._release((removed,))
+        self._adopt(())
+
+    def pop(self, index: SupportsIndex = -1) -> Scene:
+        node: Scene = super().pop(index)
+        self._release((node,))
+        self._adopt(())
+        return node
+
+    def clear(self) -> None:
+        removed: list[Scene] = list(self)
+        super().clear()
+        self._release(removed)
+        self._adopt(())
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._adopt(())
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._adopt(())
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            removed: list[Scene] = self[index]
+            value = list(value)
+            super().__setitem__(index, value)
+            self._release(removed)
+            self._adopt(value)
+        else:
+            removed = [self[index]]
+            super().__setitem__(index, value)
+            self._release(removed)
+            self._adopt((value,))
+
+    def __delitem__(self, index: Any) -> None:
+        removed: list[Scene] = (
+            self[index] if isinstance(index, slice) else [self[index]]
+        )
+        super().__delitem__(index)
+        self._release(removed)
+        self._adopt(())
+
+    def __iadd__(self, nodes: Iterable[Scene]) -> Children:  # type: ignore
+        self.extend(nodes)
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> Children:  # type: ignore
+        super().__imul__(n)
+        self._adopt(())
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_restore_children, (self.owner, list(self)))
+
+
+def _restore_children(owner: Scene, nodes: list[Scene]) -> Children:
+    """Recreate pickled children without touching their owner, which may not be
+    fully unpickled yet."""
+    children: Children = Children.__new__(Children)
+    list.extend(children, nodes)
+    children.owner = owner
+    return children
+
+
+@define
+class SceneIndex:
+    """The lookup tables of a scene, covering all of its descendants.
+
+    Attributes:
+        `walk`: The scene and every descendant, parents before their children.
+        `world`: Every descendant, children after their own descendants.
+        `paths`: The descendant that each `Parent.Child` query resolves to.
+        `groups`: The descendants in each group, parents before their children.
+        `painted`: The scene and every descendant that is painted separately, in
+            the same order as `walk`. The descendants of static nodes are left
+            out, as they are painted along with the static node."""
+
+    walk: list[Scene]
+    world: list[Scene]
+    paths: dict[str, Scene]
+    groups: dict[str, list[Scene]]
+    painted: list[Scene]
+
+    @staticmethod
+    def of(scene: Scene) -> SceneIndex:
+        """Build the lookup tables of a scene out of the tables of its children."""
+        walk: list[Scene] = [scene]
+        world: list[Scene] = []
+        paths: dict[str, Scene] = {}
+        groups: dict[str, list[Scene]] = {}
+        painted: list[Scene] = [scene]
+        for child in scene.children:
+            index: SceneIndex = child._indexed()
+            walk.extend(index.walk)
+            if not scene.static:
+                painted.extend(index.painted)
+            world.extend(index.world)
+            world.append(child)
+
+            for group in dict.fromkeys(child.groups):
+                groups.setdefault(group, []).append(child)
+            for group, nodes in index.groups.items():
+                groups.setdefault(group, []).extend(nodes)
+
+            # Only the first child with a given tag can be found by a query.
+            if child.tag not in paths:
+                paths[child.tag] = child
+                for path, node in index.paths.items():
+                    paths[f"{child.tag}.{path}"] = node
+        return SceneIndex(walk, world, paths, groups, painted)
+
+
 @define
 class Scene:
     """The smallest unit for logic in depict.
@@ -18,54 +190,133 @@ class Scene:
 
     While depict does not enforce the uniqueness of a tag, methods such as
     `get_node` will only return the first matching node if there is more than
-    one node with the same tag."""
+    one node with the same tag.
+
+    Lookups are answered from an index of the whole subtree, which is built on
+    demand and thrown away whenever the children of any node in the subtree are
+    changed. Changing the tag or groups of a node that is already in a scene is
+    only noticed once `mark_changed` is called on it.
+
+    A node that rarely changes can be made `static`, in which case it and all of
+    its descendants are painted once into an image that is reused every frame,
+    until `mark_dirty` is called. Changing the children of any node in a static
+    node marks it dirty automatically, but any other change has to be marked by
+    hand. Like tags, `static` is expected to be set before a node is added to a
+    scene.
+
+    Anything random about a node should be drawn from its `rng`, so that running
+    the same scene with the same seed always gives the same result."""
 
     tag: str = ""
-    children: list[Scene] = Factory(list)
-    groups: list[str] = Factory(list)
+    _children: Children | list[Scene] = field(factory=list)
+    groups: list[str] = field(factory=list)
     parent: Scene | None = None
+    static: bool = False
+    # The scene whose children this scene is in, if any.
+    _owner: Scene | None = field(default=None, init=False, eq=False, repr=False)
+    _index: SceneIndex | None = transient(default=None)
+    # The image of a static scene, the area of it that was painted on, and
+    # whether it needs to be painted again.
+    _image: pygame.Surface | None = transient(default=None)
+    _image_area: pygame.Rect | None = transient(default=None)
+    _dirty: bool = transient(default=True)
+    _rng: Rng | None = field(default=None, init=False, eq=False, repr=False)
 
     def __attrs_post_init__(self) -> None:
         self.children = self.build()
         if not self.tag:  # If no tag has been set, default to the name of the class.
             self.tag = self.__class__.__name__
 
+    @property
+    def rng(self) -> Rng:
+        """The random numbers of this node, which are a substream of the current
+        stream that is made the first time they are needed."""
+        if self._rng is None:
+            self._rng = randomness.current().stream(self.__class__.__name__)
+        return self._rng
+
+    @property
+    def children(self) -> list[Scene]:
+        return self._children
+
+    @children.setter
+    def children(self, children: list[Scene]) -> None:
+        """Replace the children, making sure that they tell the scene when they
+        change."""
+        if isinstance(children, Children) and children.owner is self:
+            self._invalidate()
+        else:
+            old: list[Scene] = self._children
+            children = Children(self, children)
+            children._release(old)
+        self._children = children
+
+    def _indexed(self) -> SceneIndex:
+        """Get the lookup tables of the scene, building them if needed."""
+        if self._index is None:
+            self._index = SceneIndex.of(self)
+        return self._index
+
+    def _invalidate(self) -> None:
+        """Throw away the lookup tables of the scene and of its ancestors, and make
+        any static scene among them paint itself again."""
+        node: Scene | None = self
+        # An ancestor can only have tables if all of its descendants do too. Painting
+        # a static scene builds its tables, so no static scene with a current image
+        # is above where this stops.
+        while node is not None and node._index is not None:
+            node._index = None
+            if node.static:
+                node._dirty = True
+            node = node._owner
+
+    def mark_changed(self) -> None:
+        """Make the scenes that this scene is in see a change to its tag or groups."""
+        self._invalidate()
+
+    def mark_dirty(self) -> None:
+        """Make any static scene that this scene is in paint itself again."""
+        node: Scene | None = self
+        while node is not None:
+            node._dirty = True
+            node = node._owner
+
+    def walk(self) -> list[Scene]:
+        """Get the scene and every node in it, with each parent before its children.
+
+        The list is cached until the scene changes, so it must not be modified."""
+        return self._indexed().walk
+
+    def painted(self) -> list[Scene]:
+        """Get every node that has to be painted, in the order to paint them.
+
+        The descendants of static nodes are painted by the static node, so they are
+        left out. The list is cached until the scene changes, so it must not be
+        modified."""
+        return self._indexed().painted
+
     def world(self) -> list[Scene]:
         """Get every single node in a scene, no matter how deeply nested.
 
-        This method is recursive, and it is preferred that it is not used."""
-        nodes: list[Scene] = []
-        for child in self.children:
-            if child.children != []:
-                nodes.extend(child.world())
-            nodes.append(child)
-        return nodes
+        The list is cached until the scene changes, so it must not be modified."""
+        return self._indexed().world
 
     def get_node(self, query: str) -> Scene | None:
         """Find a given node by searching recursively from the current scene.
 
         The `query` string is in the form `Parent.Child` and can be as deep
         as needed. This method cannot query sibling or parent nodes."""
-        descendants: list[str] = query.split(".")
-        for child in self.children:
-            if child.tag == descendants[0] and len(descendants) != 1:
-                node: Scene | None = child.get_node(".".join(descendants[1:]))
-                return node
-            elif child.tag == descendants[0] and len(descendants) == 1:
-                return child
+        return self._indexed().paths.get(query)
 
     def is_in_group(self, group: str) -> bool:
         """Determine whether a node is in a group or not."""
         return group in self.groups
 
     def get_nodes_in_group(self, group: str) -> list[Scene]:
-        """Find all nodes that are in the same `group` recursively."""
-        nodes: list[Scene] = []
-        for child in self.children:
-            if child.is_in_group(group):
-                nodes.append(child)
-            nodes.extend(child.get_nodes_in_group(group))
-        return nodes
+        """Find all nodes that are in the same `group` recursively.
+
+        The list is cached until the scene changes, so it must not be modified."""
+        return self._indexed().groups.get(group, [])
 
     def build(self) -> list[Scene]:
         # TODO: Combine build and ready methods into one.
@@ -75,6 +326,22 @@ class Scene:
     def draw(self, canvas: Canvas) -> None:
         """Draw the node to the canvas every clock tick."""
 
+    def paint(self, canvas: Canvas) -> None:
+        """Draw the node, or if it is static, draw it and all of its descendants
+        from the image of them, painting the image first if it is dirty."""
+        if not self.static:
+            self.draw(canvas)
+            return
+        if self._dirty or self._image is None:
+            offscreen: Canvas = canvas.offscreen(self._image)
+            for node in self.walk():
+                node.draw(offscreen)
+            offscreen.flush()
+            self._image = offscreen.surface
+            self._image_area = self._image.get_bounding_rect()
+            self._dirty = False
+        canvas.sprites([(self._image, (0, 0))], self._image_area)
+
     def tick(self, delta: float, engine: Engine) -> None:
         """Perform logic every clock tick.
 
@@ -83,3 +350,11 @@ class Scene:
 
     def ready(self, engine: Engine) -> None:
         """Called once, as soon as depict is initialized."""
+
+    def restored(self, engine: Engine) -> None:
+        """Called instead of `ready` when the scene is restored from a snapshot, to
+        recreate anything that was left out of it."""
+
+    def replaced(self, engine: Engine) -> None:
+        """Called when the scene is replaced by one restored from a snapshot, to
+        release anything outside of the scene, such as UI elements."""
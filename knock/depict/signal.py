@@ -1,19 +1,140 @@
 from __future__ import annotations
 
+import time
+import weakref
 from abc import ABC
-from typing import Callable, Type, TypeAlias
+from types import MethodType
+from typing import Any, Callable, Hashable, Iterable, Iterator, Type, TypeAlias
 
-from attrs import astuple
+import depict.profiler as profiler
+from attrs import Factory, astuple, define
 
 
 class Signal(ABC):
-    """A signal that can be emitted by nodes and subscribed to by others."""
+    """A signal that can be emitted by nodes and subscribed to by others.
 
-    def emit(self, signals: dict[Type[Signal], list[SignalCallback]]) -> None:
+    Signals are attrs classes whose first field is the node that emits them. Each
+    subscriber is called with the fields of the signal as its arguments."""
+
+    def emit(self, signals: SignalBus) -> None:
         """Emit the signal such that all those subscribing are notified."""
-        # TODO: Make this multithreaded.
-        for callback in signals[type(self)]:
-            callback(*astuple(self, recurse=False))
+        args: tuple[Any, ...] = astuple(self, recurse=False)
+        signals.emit(args[0], type(self), *args)
 
 
 SignalCallback: TypeAlias = Callable[..., None]
+
+
+def _weak(callback: SignalCallback, dead: Callable[[SignalCallback], None]) -> Any:
+    """Wrap a callback so that it is only weakly referenced, calling `dead` with the
+    wrapper once the callback is garbage collected."""
+    ref: weakref.ref = (
+        weakref.WeakMethod(callback, lambda _: dead(call))
+        if isinstance(callback, MethodType)
+        else weakref.ref(callback, lambda _: dead(call))
+    )
+
+    def call(*args: Any) -> None:
+        if (target := ref()) is not None:
+            target(*args)
+
+    call.__wrapped__ = ref  # type: ignore
+    return call
+
+
+@define(eq=False)
+class SignalBus:
+    """The subscribers to the signals of every node.
+
+    Subscribers are found by the node that emits a signal and the type of the
+    signal. Emitting a signal nobody subscribes to costs a single lookup, and
+    emitters can check `subscribed` first to avoid preparing signals at all."""
+
+    _subscribers: dict[Hashable, dict[Type[Signal], list[SignalCallback]]] = Factory(
+        dict
+    )
+
+    def connect(
+        self,
+        callback: SignalCallback,
+        emitter: Hashable,
+        signal: Type[Signal],
+        weak: bool = False,
+    ) -> None:
+        """Call `callback` whenever `emitter` emits `signal`.
+
+        If `weak` is set, the subscription does not keep the callback (or, for a
+        method, its object) alive, and ends when the callback is garbage
+        collected."""
+        callbacks: list[SignalCallback] = self._subscribers.setdefault(
+            emitter, {}
+        ).setdefault(signal, [])
+        if weak:
+            callback = _weak(callback, lambda call: self._remove(call, emitter, signal))
+        callbacks.append(callback)
+
+    def _remove(
+        self, callback: SignalCallback, emitter: Hashable, signal: Type[Signal]
+    ) -> bool:
+        """Remove exactly `callback` from the subscribers, if it is there."""
+        signals = self._subscribers.get(emitter)
+        if signals is None or callback not in signals.get(signal, ()):
+            return False
+        signals[signal].remove(callback)
+        if not signals[signal]:
+            del signals[signal]
+        if not signals:
+            del self._subscribers[emitter]
+        return True
+
+    def disconnect(
+        self, callback: SignalCallback, emitter: Hashable, signal: Type[Signal]
+    ) -> bool:
+        """Stop calling `callback` when `emitter` emits `signal`, returning whether
+        it was subscribed."""
+        for subscriber in self._subscribers.get(emitter, {}).get(signal, ()):
+            ref: weakref.ref | None = getattr(subscriber, "__wrapped__", None)
+            if subscriber == callback or (ref is not None and ref() == callback):
+                return self._remove(subscriber, emitter, signal)
+        return False
+
+    def subscriptions(
+        self,
+    ) -> Iterator[tuple[SignalCallback, Hashable, Type[Signal], bool]]:
+        """Get every subscription, as the arguments that `connect` was called with.
+
+        Weak subscriptions whose callback has been garbage collected are skipped."""
+        for emitter, signals in self._subscribers.items():
+            for signal, callbacks in signals.items():
+                for callback in callbacks:
+                    ref: weakref.ref | None = getattr(callback, "__wrapped__", None)
+                    if ref is None:
+                        yield callback, emitter, signal, False
+                    elif (target := ref()) is not None:
+                        yield target, emitter, signal, True
+
+    def subscribed(self, emitter: Hashable, signal: Type[Signal]) -> bool:
+        """Determine whether anything is subscribed to `emitter` emitting `signal`."""
+        signals = self._subscribers.get(emitter)
+        return signals is not None and signal in signals
+
+    def emit(self, emitter: Hashable, signal: Type[Signal], *args: Any) -> None:
+        """Call every subscriber to `emitter` emitting `signal` with `args`."""
+        self.emit_many(emitter, signal, (args,))
+
+    def emit_many(
+        self, emitter: Hashable, signal: Type[Signal], batch: Iterable[tuple[Any, ...]]
+    ) -> None:
+        """Call every subscriber to `emitter` emitting `signal` once for each tuple
+        of arguments in `batch`."""
+        signals = self._subscribers.get(emitter)
+        if signals is None or (callbacks := signals.get(signal)) is None:
+            return
+        # Copied, so that subscribers can disconnect while being called.
+        callbacks = callbacks.copy()
+        start: float = time.perf_counter() if profiler.ACTIVE is not None else 0.0
+        for args in batch:
+            for callback in callbacks:
+                callback(*args)
+        if profiler.ACTIVE is not None:
+            profiler.ACTIVE.add_signal_time(time.perf_counter() - start)
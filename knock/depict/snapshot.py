@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+"""Saving the state of a running scene, so that it can be resumed or rewound."""
+
+import functools
+import io
+import operator
+import pickle
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Type
+
+from attrs import NOTHING, Attribute, Factory, define, fields
+from depict.rng import Rng
+from depict.scene import Scene
+from depict.signal import Signal, SignalCallback
+
+if TYPE_CHECKING:
+    from depict.engine import Engine
+
+
+@functools.cache
+def _fields(
+    cls: type,
+) -> tuple[tuple[str, ...], tuple[Attribute, ...], Callable[[Scene], tuple[Any, ...]]]:
+    """Split the fields of a scene class into those that are saved, and those that
+    are transient, along with a function that gets the saved fields of a scene."""
+    saved: list[str] = []
+    transient: list[Attribute] = []
+    for attribute in fields(cls):
+        if attribute.metadata.get("transient"):
+            transient.append(attribute)
+        else:
+            saved.append(attribute.name)
+    # Every scene saves more than one field, so this always returns a tuple.
+    get: Callable[[Scene], tuple[Any, ...]] = operator.attrgetter(*saved)
+    return tuple(saved), tuple(transient), get
+
+
+def _allocate(cls: Type[Scene]) -> Scene:
+    """Create a scene without initializing it, so that its state can be set."""
+    return cls.__new__(cls)
+
+
+def _set_state(scene: Scene, state: tuple[Any, ...]) -> None:
+    """Set the saved fields of a scene, and reset its transient fields."""
+    saved, transient, _ = _fields(scene.__class__)
+    for name, value in zip(saved, state):
+        object.__setattr__(scene, name, value)
+    for attribute in transient:
+        default: Any = attribute.default
+        if isinstance(default, Factory):
+            default = (
+                default.factory(scene) if default.takes_self else default.factory()
+            )
+        object.__setattr__(
+            scene, attribute.name, None if default is NOTHING else default
+        )
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles scenes without their transient fields."""
+
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, Scene):
+            _, _, get = _fields(obj.__class__)
+            return (_allocate, (obj.__class__,), get(obj), None, None, _set_state)
+        return NotImplemented
+
+
+Subscription = tuple[SignalCallback, Scene, Type[Signal], bool]
+
+
+@define
+class SceneState:
+    """Everything that is restored from a snapshot.
+
+    Attributes:
+        `root`: The root scene.
+        `rng`: The stream that new nodes draw their random numbers from.
+        `frame_count`: The number of ticks that had passed.
+        `subscriptions`: The signals that were connected, as the arguments to
+            `SignalBus.connect`."""
+
+    root: Scene
+    rng: Rng
+    frame_count: int
+    subscriptions: list[Subscription]
+
+
+@define
+class Snapshot:
+    """The state of a scene and its engine at the end of a tick, pickled and
+    compressed.
+
+    Fields of a scene that are defined with `transient`, such as caches and
+    images, are left out, and reset to their defaults when the snapshot is
+    restored. Signal callbacks are saved too, so they must be picklable, such as
+    the methods of nodes.
+
+    Attributes:
+        `frame`: The tick that the snapshot was taken at.
+        `data`: The compressed state."""
+
+    frame: int
+    data: bytes
+
+    @staticmethod
+    def take(engine: Engine, level: int = 1) -> Snapshot:
+        """Save the state of an engine and its root scene, compressing it with zlib
+        at `level`, from 1 (fastest) to 9 (smallest)."""
+        assert engine.root is not None
+        state = SceneState(
+            engine.root,
+            engine.rng,
+            engine.frame_count,
+            [*engine.signals.subscriptions()],
+        )
+        buffer = io.BytesIO()
+        _Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(state)
+        return Snapshot(engine.frame_count, zlib.compress(buffer.getvalue(), level))
+
+    def load(self) -> SceneState:
+        """Recreate the state that was saved, as new objects."""
+        return pickle.loads(zlib.decompress(self.data))
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot to a file."""
+        path.write_bytes(self.frame.to_bytes(8, "little") + self.data)
+
+    @staticmethod
+    def open(path: Path) -> Snapshot:
+        """Read a snapshot that was written to a file."""
+        data: bytes = path.read_bytes()
+        return Snapshot(int.from_bytes(data[:8], "little"), data[8:])
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+"""Spatial partitioning, for finding the things near a point without checking everything."""
+
+import math
+from typing import Generic, Iterable, Iterator, TypeVar
+
+import numpy as np
+from attrs import Factory, define
+from depict.vec3d import Vec3D
+
+T = TypeVar("T")
+
+
+@define
+class SpatialHash(Generic[T]):
+    """A uniform grid of buckets that maps positions to the items near them.
+
+    Items are stored in the cell that their position falls into, so a radius
+    query only has to look at the few cells that the radius overlaps instead of
+    at every item. The grid is cheap to rebuild, so the intended use is to
+    `clear` it and `insert` every item once per tick.
+
+    Attributes:
+        `cell_size`: The width and height of each cell. Queries are fastest when
+            this is close to the radius that is usually queried.
+        `cells`: The items in each cell, along with the position they were
+            inserted at."""
+
+    cell_size: float = 64.0
+    cells: dict[tuple[int, int], list[tuple[T, float, float]]] = Factory(dict)
+
+    @staticmethod
+    def of(
+        items: Iterable[T], positions: Iterable[Vec3D], cell_size: float
+    ) -> SpatialHash[T]:
+        """Create a grid containing each of the `items` at its position."""
+        grid: SpatialHash[T] = SpatialHash(cell_size)
+        for item, position in zip(items, positions):
+            grid.insert(item, position)
+        return grid
+
+    def key(self, position: Vec3D) -> tuple[int, int]:
+        """Find the cell that a `position` falls into."""
+        return (
+            math.floor(position.x / self.cell_size),
+            math.floor(position.y / self.cell_size),
+        )
+
+    def clear(self) -> None:
+        """Remove every item from the grid."""
+        self.cells.clear()
+
+    def insert(self, item: T, position: Vec3D) -> None:
+        """Add an `item` to the cell containing `position`."""
+        entry: tuple[T, float, float] = (item, position.x, position.y)
+        if (cell := self.cells.get(key := self.key(position))) is not None:
+            cell.append(entry)
+        else:
+            self.cells[key] = [entry]
+
+    def query(self, position: Vec3D, radius: float) -> list[T]:
+        """Find every item that is at most `radius` away from `position`."""
+        x, y = position.x, position.y
+        radius_sq: float = radius * radius
+        found: list[T] = []
+        for cell in self._cells_between(x - radius, y - radius, x + radius, y + radius):
+            for item, item_x, item_y in cell:
+                dx, dy = item_x - x, item_y - y
+                if dx * dx + dy * dy <= radius_sq:
+                    found.append(item)
+        return found
+
+    def query_rect(self, min_: Vec3D, max_: Vec3D) -> list[T]:
+        """Find every item inside the rectangle from `min_` to `max_`, edges included."""
+        min_x, min_y, max_x, max_y = min_.x, min_.y, max_.x, max_.y
+        found: list[T] = []
+        for cell in self._cells_between(min_x, min_y, max_x, max_y):
+            for item, x, y in cell:
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    found.append(item)
+        return found
+
+    def _cells_between(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[list[tuple[T, float, float]]]:
+        """Find every non-empty cell that overlaps a rectangle."""
+        size: float = self.cell_size
+        cells = self.cells
+        overlapping: list[list[tuple[T, float, float]]] = []
+        for cx in range(math.floor(min_x / size), math.floor(max_x / size) + 1):
+            for cy in range(math.floor(min_y / size), math.floor(max_y / size) + 1):
+                if (cell := cells.get((cx, cy))) is not None:
+                    overlapping.append(cell)
+        return overlapping
+
+    def __len__(self) -> int:
+        return sum(len(cell) for cell in self.cells.values())
+
+
+@define
+class Broadphase(Generic[T]):
+    """A grid of every body in a scene, shared by everything that looks for bodies.
+
+    The grid is rebuilt at most once per frame, by whoever needs it first in that
+    frame, so any number of queries only cost one pass over the scene. As bodies
+    keep moving after the grid is built, queries are only a first pass, and the
+    exact positions of the bodies that they return should be checked again.
+
+    Attributes:
+        `grid`: The bodies, bucketed by their position when the grid was built.
+        `members`: The ids of every body in the grid.
+        `frame`: The frame that the grid was built in."""
+
+    grid: SpatialHash[T] = Factory(SpatialHash)
+    members: set[int] = Factory(set)
+    frame: int | None = None
+
+    def is_stale(self, frame: int) -> bool:
+        """Determine whether the grid needs to be rebuilt for `frame`."""
+        return self.frame != frame
+
+    def rebuild(
+        self, bodies: Iterable[T], positions: Iterable[Vec3D], frame: int
+    ) -> None:
+        """Replace the contents of the grid with `bodies` at their `positions`."""
+        self.grid.clear()
+        self.members.clear()
+        for body, position in zip(bodies, positions):
+            self.grid.insert(body, position)
+            self.members.add(id(body))
+        self.frame = frame
+
+    def query_rect(self, min_: Vec3D, max_: Vec3D) -> list[T]:
+        """Find every body that was inside a rectangle when the grid was built."""
+        return self.grid.query_rect(min_, max_)
+
+    def __contains__(self, body: T) -> bool:
+        return id(body) in self.members
+
+
+def neighbour_pairs(
+    positions: np.ndarray, radius: float, unique: bool = False, budget: int = 1 << 20
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Find every pair of points in an `(n, 2)` array that are at most `radius` apart.
+
+    This is the array counterpart to `SpatialHash`: points are sorted into cells
+    as wide as `radius`, and only the points in neighbouring cells are compared.
+    Pairs are yielded in batches of two index arrays `(i, j)`, each batch holding
+    at most about `budget` candidate pairs so that dense clusters cannot exhaust
+    memory. Each pair appears in both orders unless `unique` is set, in which case
+    only the pairs with `i < j` are kept."""
+    count: int = len(positions)
+    if count == 0:
+        return
+
+    # Give each cell a single integer key so that points can be sorted by cell.
+    # Rows are padded so that stepping one cell past either end of a row can
+    # never land on an occupied cell in the next row.
+    cells: np.ndarray = np.floor(positions[:, :2] / radius).astype(np.int64)
+    cells -= cells.min(axis=0)
+    width: int = int(cells[:, 1].max()) + 3
+    keys: np.ndarray = cells[:, 0] * width + cells[:, 1]
+
+    order: np.ndarray = np.argsort(keys, kind="stable")
+    occupied, firsts, sizes = np.unique(
+        keys[order], return_index=True, return_counts=True
+    )
+
+    # For each point, find where each of the 9 surrounding cells starts in
+    # `order`, and how many points it holds.
+    offsets: np.ndarray = np.array(
+        [dx * width + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+    )
+    neighbours: np.ndarray = keys[None, :] + offsets[:, None]
+    slots: np.ndarray = np.minimum(
+        np.searchsorted(occupied, neighbours), len(occupied) - 1
+    )
+    found: np.ndarray = occupied[slots] == neighbours
+    starts: np.ndarray = np.where(found, firsts[slots], 0)
+    lengths: np.ndarray = np.where(found, sizes[slots], 0)
+
+    # Split the points into batches that each compare about `budget` pairs.
+    candidates: np.ndarray = np.cumsum(lengths.sum(axis=0))
+    bounds: np.ndarray = np.searchsorted(
+        candidates, np.arange(budget, candidates[-1], budget), side="right"
+    )
+    radius_sq: float = radius * radius
+    for start, stop in zip(
+        np.concatenate(([0], bounds)), np.concatenate((bounds, [count]))
+    ):
+        if start == stop:
+            continue
+        # Expand every (point, cell) combination into one pair per point in the cell.
+        length: np.ndarray = lengths[:, start:stop].ravel()
+        total: int = int(length.sum())
+        i: np.ndarray = np.repeat(np.tile(np.arange(start, stop), 9), length)
+        steps: np.ndarray = np.arange(total) - np.repeat(
+            np.cumsum(length) - length, length
+        )
+        j: np.ndarray = order[np.repeat(starts[:, start:stop].ravel(), length) + steps]
+
+        difference: np.ndarray = positions[i, :2] - positions[j, :2]
+        keep: np.ndarray = (i < j if unique else i != j) & (
+            np.einsum("ij,ij->i", difference, difference) <= radius_sq
+        )
+        yield i[keep], j[keep]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+"""A batch of 2D vectors, for doing the same maths to many vectors at once."""
+
+import math
+from typing import Iterable, Iterator
+
+import depict.utils as utils
+import numpy as np
+from attrs import define, field
+from depict.vec3d import Point, Vec3D
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normalize each row of `vectors`, leaving zero vectors as they are."""
+    sizes: np.ndarray = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, sizes, out=np.zeros_like(vectors), where=sizes != 0)
+
+
+def constrain_size(
+    vectors: np.ndarray, min_: float | np.ndarray, max_: float | np.ndarray
+) -> np.ndarray:
+    """Constrain the magnitude of each row of `vectors` to be between `min_` and `max_`.
+
+    The bounds can either be scalars, or arrays with one bound per row."""
+    sizes: np.ndarray = np.linalg.norm(vectors, axis=1)
+    constrained: np.ndarray = np.clip(sizes, min_, max_)
+    scale: np.ndarray = np.divide(
+        constrained, sizes, out=np.zeros_like(sizes), where=sizes != 0
+    )
+    return vectors * scale[:, None]
+
+
+def _as_rows(other: Vec2Array | Vec3D | np.ndarray | float) -> np.ndarray | float:
+    """Convert the other operand of an operator into something numpy can broadcast."""
+    if isinstance(other, Vec2Array):
+        return other.data
+    if isinstance(other, np.ndarray):
+        # One scalar per vector.
+        return other[:, None] if other.ndim == 1 else other
+    if isinstance(other, (int, float)):
+        return other
+    return np.array((other.x, other.y), dtype=float)
+
+
+@define
+class Vec2Array:
+    """A batch of 2D vectors stored as the rows of an `(n, 2)` array.
+
+    This mirrors the `Vec3D` API, but every method acts on all of the vectors
+    at once with numpy, so it is far faster than a list of `Vec3D`s when working
+    with thousands of vectors. The z-component is ignored.
+
+    Attributes:
+        `data`: The underlying `(n, 2)` array of floats.
+
+    Operators:
+        `+` and `-` accept another `Vec2Array` or a single `Vec3D`.
+        `*` and `/` accept a scalar, or an array with one scalar per vector.
+    """
+
+    data: np.ndarray = field(converter=lambda data: np.asarray(data, dtype=float))
+
+    @staticmethod
+    def zeros(n: int) -> Vec2Array:
+        """Create `n` vectors pointing towards the origin."""
+        return Vec2Array(np.zeros((n, 2)))
+
+    @staticmethod
+    def of(vectors: Iterable[Vec3D]) -> Vec2Array:
+        """Gather the x and y components of some `Vec3D`s into an array."""
+        return Vec2Array(
+            np.array([(vector.x, vector.y) for vector in vectors], dtype=float)
+        )
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    def to_points(self) -> list[Point]:
+        """Convert each of the vectors back into a `Point`."""
+        return [Point(x, y) for x, y in self.data.tolist()]
+
+    def size(self) -> np.ndarray:
+        """Calculate the magnitude of each vector."""
+        return np.linalg.norm(self.data, axis=1)
+
+    def size_sq(self) -> np.ndarray:
+        """Calculate the magnitude squared of each vector."""
+        return np.einsum("ij,ij->i", self.data, self.data)
+
+    def dot(self, other: Vec2Array | Vec3D) -> np.ndarray:
+        """Calculate the dot product of each vector with `other`."""
+        return (self.data * _as_rows(other)).sum(axis=1)
+
+    def angle_2d(self) -> np.ndarray:
+        """Calculate the angle of each vector, between 0 and tau."""
+        return np.arctan2(self.data[:, 1], self.data[:, 0]) % math.tau
+
+    def normalize(self) -> Vec2Array:
+        """Calculate the unit vectors pointing in the same directions."""
+        return Vec2Array(normalize(self.data))
+
+    def constrain_size(
+        self, min_: float | np.ndarray, max_: float | np.ndarray
+    ) -> Vec2Array:
+        """Constrain the magnitude of each vector to be between `min_` and `max_`."""
+        return Vec2Array(constrain_size(self.data, min_, max_))
+
+    def rotate(self, degrees: float | np.ndarray, around: Point) -> Vec2Array:
+        """Rotate each vector around `around` by `degrees` in degrees."""
+        theta: np.ndarray = np.asarray(utils.deg2rad(degrees))
+        cos, sin = np.cos(theta), np.sin(theta)
+        x: np.ndarray = self.data[:, 0] - around.x
+        y: np.ndarray = self.data[:, 1] - around.y
+        return Vec2Array(
+            np.stack((around.x + x * cos - y * sin, around.y + x * sin + y * cos), 1)
+        )
+
+    def iadd(self, other: Vec2Array | Vec3D) -> Vec2Array:
+        """Add `other` to each of the vectors, in place."""
+        self.data += _as_rows(other)
+        return self
+
+    def isub(self, other: Vec2Array | Vec3D) -> Vec2Array:
+        """Subtract `other` from each of the vectors, in place."""
+        self.data -= _as_rows(other)
+        return self
+
+    def scale_(self, n: float | np.ndarray) -> Vec2Array:
+        """Multiply each of the vectors by a scalar, in place."""
+        self.data *= _as_rows(n)
+        return self
+
+    def normalize_(self) -> Vec2Array:
+        """Turn each of the vectors into its unit vector, in place."""
+        self.data[:] = normalize(self.data)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self.to_points())
+
+    def __getitem__(self, index: int | slice | np.ndarray) -> Point | Vec2Array:
+        """Get a single vector as a `Point`, or a selection of them as a `Vec2Array`."""
+        if isinstance(index, (int, np.integer)):
+            x, y = self.data[index].tolist()
+            return Point(x, y)
+        return Vec2Array(self.data[index])
+
+    def __setitem__(self, index: int | slice | np.ndarray, value: Vec3D) -> None:
+        self.data[index] = _as_rows(value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Vec2Array) and np.array_equal(self.data, other.data)
+
+    def __add__(self, other: Vec2Array | Vec3D) -> Vec2Array:
+        return Vec2Array(self.data + _as_rows(other))
+
+    def __sub__(self, other: Vec2Array | Vec3D) -> Vec2Array:
+        return Vec2Array(self.data - _as_rows(other))
+
+    def __mul__(self, other: float | np.ndarray) -> Vec2Array:
+        return Vec2Array(self.data * _as_rows(other))
+
+    def __rmul__(self, other: float | np.ndarray) -> Vec2Array:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: float | np.ndarray) -> Vec2Array:
+        return Vec2Array(self.data / _as_rows(other))
@@ -38,6 +38,12 @@ class Vec3D(Generic[T]):
         `constrain_size`: Constrain the magnitude of the vector between specified bounds.
         `constrain`: Constrain the components of the vector between specified bounds.
 
+    In-place methods:
+        `iadd`: Add the components of another vector to this one.
+        `isub`: Subtract the components of another vector from this one.
+        `scale_`: Multiply the components of this vector by a scalar.
+        `normalize_`: Turn this vector into its unit vector.
+
     Operators:
         `__add__`: Add the components of two vectors.
         `__sub__`: Subtract the components of two vectors.
@@ -48,6 +54,11 @@ class Vec3D(Generic[T]):
 
     Note:
         For efficiency, use `size_sq` instead of `size` when possible to minimize square root operations.
+
+        Operators always create a new vector. The in-place methods avoid that
+        allocation in hot loops, but as they modify the vector, they must only be
+        used on vectors that are not shared, such as default values of attributes.
+        For many vectors at once, use a `Vec2Array` instead.
     """
 
     x: T
@@ -80,12 +91,12 @@ class Vec3D(Generic[T]):
 
     def rotate(self, degrees: float, around: Point) -> Vec3D[float]:
         """Rotate the vector around `around` by `degrees` in degrees."""
-        theta: float = utils.deg2rad(degrees) % math.tau
-        radius: float = (self - around).size()
-        position: Vec3D[float] = cast(Vec3D[float], (self - around).normalize())
-        x: float = position.dot(Vec3D(math.cos(theta), -1 * math.sin(theta)))
-        y: float = position.dot(Vec3D(math.sin(theta), math.cos(theta)))
-        return around + Point(x, y) * radius
+        theta: float = utils.deg2rad(degrees)
+        cos, sin = math.cos(theta), math.sin(theta)
+        x, y = self.x - around.x, self.y - around.y
+        return Vec3D(
+            around.x + x * cos - y * sin, around.y + x * sin + y * cos, around.z
+        )
 
     def map(self, func: Callable[[T], T]) -> Vec3D:
         """Map each of the components of a vector with some function."""
@@ -106,20 +117,20 @@ class Vec3D(Generic[T]):
 
     def size(self) -> T:
         """Calculate the magnitude of a vector."""
-        return (self.x**2 + self.y**2 + self.z**2) ** 0.5
+        return (self.x * self.x + self.y * self.y + self.z * self.z) ** 0.5
 
     def size_sq(self) -> T:
         """Calculate the magnitude squared of a vector.
 
         This method is supposed to be used to minimize the number of square root
         operations, as they are very slow."""
-        return self.x**2 + self.y**2 + self.z**2
+        return self.x * self.x + self.y * self.y + self.z * self.z
 
     def normalize(self) -> Vec3D[T]:
         """Calculate the unit vector that points in the same direction as the vector."""
         # Avoid ZeroDivisionError when `Vec3D.size()` is 0.
         if (size := self.size()) != 0:
-            return cast(Vec3D[T], self / size)
+            return Vec3D(self.x / size, self.y / size, self.z / size)
         else:
             return self
 
@@ -137,7 +148,10 @@ class Vec3D(Generic[T]):
 
     def constrain_size(self, min_: T, max_: T) -> Vec3D[T]:
         """Constrain the magnitude of a vector to be between `min_` and `max_`."""
-        return self.normalize() * min(max_, max(min_, self.size()))
+        if (size := self.size()) == 0:
+            return Vec3D(self.x, self.y, self.z)
+        scale: float = min(max_, max(min_, size)) / size
+        return Vec3D(self.x * scale, self.y * scale, self.z * scale)
 
     def constrain(self, min_bound: Vec3D[T], max_bound: Vec3D[T]) -> Vec3D[T]:
         """Constrain the components of a vector between bounds.
@@ -150,6 +164,35 @@ class Vec3D(Generic[T]):
             min(max_bound.z, max(min_bound.z, self.z)),
         )
 
+    def iadd(self, other: Vec3D[T]) -> Vec3D[T]:
+        """Add the components of `other` to this vector, in place."""
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def isub(self, other: Vec3D[T]) -> Vec3D[T]:
+        """Subtract the components of `other` from this vector, in place."""
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def scale_(self, n: T) -> Vec3D[T]:
+        """Multiply the components of this vector by a scalar value, in place."""
+        self.x *= n
+        self.y *= n
+        self.z *= n
+        return self
+
+    def normalize_(self) -> Vec3D[T]:
+        """Turn this vector into the unit vector pointing in the same direction."""
+        if (size := self.size()) != 0:
+            self.x /= size
+            self.y /= size
+            self.z /= size
+        return self
+
     def __add__(self, other: Vec3D[T]) -> Vec3D[T]:
         """Add the components of the two vectors."""
         return Vec3D(self.x + other.x, self.y + other.y, self.z + other.z)
@@ -173,6 +216,10 @@ class Vec3D(Generic[T]):
         """Multiply the components of the vector by a scalar value."""
         return self.__mul__(other)
 
+    def __reduce__(self) -> tuple[type, tuple[T, T, T]]:
+        """Pickle the vector as just its components, as scenes hold many of them."""
+        return (self.__class__, (self.x, self.y, self.z))
+
 
 # A 2D Vector is just a 3D Vector with the z-component set to 0.0.
 Vec2D: TypeAlias = Vec3D
@@ -180,6 +227,7 @@ Vec2D: TypeAlias = Vec3D
 Point: TypeAlias = Vec3D
 
 
+@define
 class Size(Vec3D[int]):
     """Minimal subclass of `Vec3D` with better accessors."""
 
@@ -1,9 +1,10 @@
 import operator
+import os
 from enum import IntFlag
 from functools import reduce
 
 import pygame
-from attrs import define
+from attrs import define, field
 from depict.vec3d import Size
 
 
@@ -41,46 +42,87 @@ class Window:
         `surface`: The drawing surface of the window.
         `size`: The initial size of the window.
         `flags`: A list of rendering flags to customize the window.
+        `headless`: Whether to render to an offscreen surface instead of a window.
 
     Methods:
-        `tick`: Update the display with new data.
+        `tick`: Update the display with new data, optionally only in some areas.
         `is_active`: Check whether the window is currently active.
         `toggle_fullscreen`: Toggle fullscreen mode for this window.
         `set_icon`: Set the icon for this window.
         `set_title`: Set the title for this window.
         `get_size`: Retrieve the current size of the window.
+        `close`: Close a headless window, restoring the video driver.
 
     Note:
         The `size` attribute stores the initial size of the window. If the window
         is resized during runtime, use the `get_size` method to obtain the current size.
+
+        A headless window never opens anything on screen. It draws to an offscreen
+        surface, and SDL is switched to its dummy video driver so that events and
+        input can still be queried on machines without a display. The driver that
+        was used before is restored when the window is closed.
     """
 
     surface: pygame.surface.Surface | None = None
     size: Size = Size(640, 360)
     flags: list[Flag] = []
+    headless: bool = False
+    # The video driver that was set before switching to the dummy one, if any.
+    _driver: str | None = field(init=False, default=None)
 
     def __attrs_post_init__(self) -> None:
+        if self.headless:
+            # SDL only reads the video driver when the display is initialized.
+            pygame.display.quit()
+            self._driver = os.environ.get("SDL_VIDEODRIVER")
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            pygame.display.init()
+            self.surface = pygame.Surface((self.size.width, self.size.height))
+            return
+
         self.surface = pygame.display.set_mode(
             (self.size.width, self.size.height),
             reduce(operator.or_, self.flags, 0),
             vsync=1,
         )
 
-    def tick(self) -> None:
-        pygame.display.flip()
+    def tick(self, areas: list[pygame.Rect] | None = None) -> None:
+        """Show the new contents of the surface, either all of it or just `areas`."""
+        if self.headless:
+            return
+        if areas is None:
+            pygame.display.flip()
+        elif areas:
+            pygame.display.update(areas)
 
     def is_active(self) -> bool:
-        return pygame.display.get_active()
+        return not self.headless and pygame.display.get_active()
 
     def toggle_fullscreen(self) -> None:
+        if self.headless:
+            return
         pygame.display.toggle_fullscreen()
         self.size = Size(*pygame.display.get_window_size())
 
     def set_icon(self, surface: pygame.Surface) -> None:
-        pygame.display.set_icon(surface)
+        if not self.headless:
+            pygame.display.set_icon(surface)
 
     def set_title(self, title: str) -> None:
-        pygame.display.set_caption(title)
+        if not self.headless:
+            pygame.display.set_caption(title)
 
     def get_size(self) -> Size:
+        if self.headless:
+            return self.size
         return Size(*pygame.display.get_window_size())
+
+    def close(self) -> None:
+        if not self.headless:
+            return
+        # Quit the dummy display, so that the next window uses the old driver.
+        pygame.display.quit()
+        if self._driver is None:
+            os.environ.pop("SDL_VIDEODRIVER", None)
+        else:
+            os.environ["SDL_VIDEODRIVER"] = self._driver
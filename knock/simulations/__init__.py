@@ -1,37 +1,55 @@
-from simulations.boid import Boid
-from simulations.cantor import CantorSet
-from simulations.flock import Flock
-from simulations.flowfield import FlowField
-from simulations.fractal_tree import FractalTree
-from simulations.kochsnowflake import KochSnowflake
-from simulations.linedrawer import LineDrawer
-from simulations.liquid import Liquid
-from simulations.momenta import Momenta
-from simulations.mover import Mover
-from simulations.orbits import Orbit
-from simulations.particle_emitter import Particle, ParticleEmitter
-from simulations.pendulum import Pendulum, Spring
-from simulations.planet import Planet
-from simulations.spinners import Spinner
-from simulations.spiral import Spiral
+"""Every simulation, each of which is only imported when it is first used."""
 
-__all__ = [
-    "Boid",
-    "CantorSet",
-    "Flock",
-    "FlowField",
-    "FractalTree",
-    "KochSnowflake",
-    "LineDrawer",
-    "Liquid",
-    "Momenta",
-    "Mover",
-    "Particle",
-    "ParticleEmitter",
-    "Pendulum",
-    "Spring",
-    "Planet",
-    "Spinner",
-    "Spiral",
-    "Orbit",
-]
+import ast
+import importlib
+import importlib.util
+from typing import Any
+
+# The module that each simulation is defined in, relative to this package.
+SIMULATIONS: dict[str, str] = {
+    "Boid": "boid",
+    "CantorSet": "cantor",
+    "Flock": "flock",
+    "FlowField": "flowfield",
+    "FractalTree": "fractal_tree",
+    "Galaxy": "nbody",
+    "KochSnowflake": "kochsnowflake",
+    "LineDrawer": "linedrawer",
+    "Liquid": "liquid",
+    "Momenta": "momenta",
+    "Mover": "mover",
+    "Particle": "particle_emitter",
+    "ParticleEmitter": "particle_emitter",
+    "Pendulum": "pendulum",
+    "Spring": "pendulum",
+    "Planet": "planet",
+    "Spinner": "spinners",
+    "Spiral": "spiral",
+    "Orbit": "orbits",
+}
+
+__all__ = [*SIMULATIONS]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a simulation the first time that it is used."""
+    if name not in SIMULATIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    simulation: Any = getattr(
+        importlib.import_module(f".{SIMULATIONS[name]}", __name__), name
+    )
+    globals()[name] = simulation
+    return simulation
+
+
+def describe(name: str) -> str | None:
+    """Get the docstring of a simulation by reading its source, without importing it."""
+    spec = importlib.util.find_spec(f".{SIMULATIONS[name]}", __name__)
+    if spec is None or spec.origin is None:
+        return None
+    with open(spec.origin) as file:
+        module: ast.Module = ast.parse(file.read())
+    for node in module.body:
+        if isinstance(node, ast.ClassDef) and node.name == name:
+            return ast.get_docstring(node)
+    return None
@@ -28,6 +28,10 @@ class Boid(Polygon2D):
     max_force: float = 1.0
     arrival_dist: float = 100.0
 
+    # Whether the boid steers itself using a Mover. Boids that are not autonomous
+    # are moved by their parent, e.g. a vectorized Flock, and only draw themselves.
+    autonomous: bool = True
+
     def ready(self, engine: Engine) -> None:
         # The point about which to rotate the triangle.
         self.pivot: Point = self.position
@@ -40,6 +44,8 @@ class Boid(Polygon2D):
         self.last_position = self.position
 
     def build(self) -> list[Scene]:
+        if not self.autonomous:
+            return []
         # We require a moveable object, so attach a Mover that is set
         # to be invisible.
         return [Mover("Vehicle", position=self.position, draw_=False)]
@@ -82,6 +88,9 @@ class Boid(Polygon2D):
         mover.add_force(-1 * self.seek_force(target, mover))
 
     def tick(self, delta: float, engine: Engine) -> None:
+        if not self.autonomous:
+            return
+
         mover: Mover = cast(Mover, self.get_node("Vehicle"))
 
         self.last_position: Point = self.moved(self.last_position, mover.position)
@@ -11,6 +11,8 @@ class CantorSet(Node2D):
     length: float = 600.0
     position: Point = Point(20, 0)
     color: Color = White
+    # The set never changes, so it only needs to be drawn once.
+    static: bool = True
 
     def cantor_line(self, canvas: Canvas, pos: Point, length: float) -> None:
         """Create a line that recursively break down in one thirds."""
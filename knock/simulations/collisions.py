@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+"""Elastic collisions between round movers."""
+
+from typing import Sequence
+
+import numpy as np
+from depict import *
+from depict.spatial import neighbour_pairs
+from simulations.mover import Mover
+
+
+def _accumulate(index: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Sum the rows of an `(n, 2)` array of `values` into `count` rows by `index`."""
+    return np.stack(
+        (
+            np.bincount(index, values[:, 0], minlength=count),
+            np.bincount(index, values[:, 1], minlength=count),
+        ),
+        axis=1,
+    )
+
+
+def touching_pairs(
+    position: np.ndarray, radius: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find every pair of circles that touch or overlap, each pair only once.
+
+    Nearby circles are found with a grid as wide as the largest diameter, and are
+    then compared using squared distances so that no square roots are needed."""
+    i_batches: list[np.ndarray] = []
+    j_batches: list[np.ndarray] = []
+    for i, j in neighbour_pairs(position, 2 * float(radius.max()), unique=True):
+        offset: np.ndarray = position[j] - position[i]
+        reach: np.ndarray = radius[i] + radius[j]
+        touching: np.ndarray = np.einsum("ij,ij->i", offset, offset) <= reach * reach
+        i_batches.append(i[touching])
+        j_batches.append(j[touching])
+    if not i_batches:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(i_batches), np.concatenate(j_batches)
+
+
+def collide(movers: Sequence[Mover]) -> None:
+    """Separate every pair of overlapping movers, and bounce them off each other.
+
+    Movers are treated as circles that collide elastically. Every pair of movers
+    is resolved once, and all of the pairs are resolved at the same time from the
+    state at the start of the call, so a mover touching several others is pushed
+    and bounced by all of them together."""
+    count: int = len(movers)
+    if count < 2:
+        return
+
+    position: np.ndarray = np.array(
+        [(mover.position.x, mover.position.y) for mover in movers], dtype=float
+    )
+    velocity: np.ndarray = np.array(
+        [(mover.velocity.x, mover.velocity.y) for mover in movers], dtype=float
+    )
+    radius: np.ndarray = np.array([mover.radius for mover in movers], dtype=float)
+    mass: np.ndarray = np.array([mover.mass for mover in movers], dtype=float)
+
+    i, j = touching_pairs(position, radius)
+    if len(i) == 0:
+        return
+
+    offset: np.ndarray = position[j] - position[i]
+    distance: np.ndarray = np.linalg.norm(offset, axis=1)
+    # Movers at exactly the same position have no normal, and are left alone.
+    normal: np.ndarray = np.divide(
+        offset,
+        distance[:, None],
+        out=np.zeros_like(offset),
+        where=distance[:, None] != 0,
+    )
+
+    # Push both movers apart by half of their overlap, so that they just touch.
+    push: np.ndarray = (0.5 * (radius[i] + radius[j] - distance))[:, None] * normal
+
+    # Exchange the normal components of the velocities as in a 1D elastic
+    # collision, keeping the tangential components. Movers that are already
+    # moving apart are not bounced again.
+    i_normal: np.ndarray = np.einsum("ij,ij->i", velocity[i], normal)
+    j_normal: np.ndarray = np.einsum("ij,ij->i", velocity[j], normal)
+    i_mass, j_mass = mass[i], mass[j]
+    total: np.ndarray = i_mass + j_mass
+    approaching: np.ndarray = i_normal > j_normal
+    i_bounce: np.ndarray = np.where(
+        approaching,
+        (i_normal * (i_mass - j_mass) + 2 * j_mass * j_normal) / total - i_normal,
+        0.0,
+    )
+    j_bounce: np.ndarray = np.where(
+        approaching,
+        (j_normal * (j_mass - i_mass) + 2 * i_mass * i_normal) / total - j_normal,
+        0.0,
+    )
+
+    movers_index: np.ndarray = np.concatenate((i, j))
+    position += _accumulate(movers_index, np.concatenate((-push, push)), count)
+    velocity += _accumulate(
+        movers_index,
+        np.concatenate((i_bounce[:, None] * normal, j_bounce[:, None] * normal)),
+        count,
+    )
+
+    moved: np.ndarray = np.unique(movers_index)
+    for index, (x, y), (vx, vy) in zip(
+        moved.tolist(), position[moved].tolist(), velocity[moved].tolist()
+    ):
+        mover: Mover = movers[index]
+        mover.position = Point(x, y)
+        mover.velocity = Vec2D(vx, vy)
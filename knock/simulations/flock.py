@@ -2,30 +2,215 @@ from __future__ import annotations
 
 """A flocking simulation."""
 
-import random
+import math
 from typing import cast
 
-from attrs import define
+import numpy as np
+from attrs import define, field
 from depict import *
+from depict.integrators import TICKS_PER_SECOND, split_steps
+from depict.spatial import neighbour_pairs
+from depict.vec2array import constrain_size, normalize
 from simulations.boid import Boid
 from simulations.mover import Mover
 
 # TODO: Tweak the flocking parameters to make a better simulation.
 # TODO: Ideally allow hot reloading these parameters via sliders.
-# TODO: Optimize to use a dynamic quadtree.
+
+# The vertices of a boid pointing upwards, relative to its center.
+TRIANGLE: np.ndarray = np.array([[0.0, -12.0], [-6.0, 12.0], [6.0, 12.0]])
+UPWARDS: float = utils.deg2rad(270.0)
+
+
+@define
+class FlockState:
+    """The boids of a flock, stored as a structure of arrays.
+
+    Every row of `position`, `velocity` and `acceleration` belongs to one boid,
+    which lets the steering behaviours of the whole flock be computed with a
+    handful of array operations instead of a dozen `Vec3D`s per boid.
+
+    Attributes:
+        `position`: The center of each boid.
+        `velocity`: The velocity of each boid.
+        `acceleration`: The force applied to each boid during the current tick.
+        `heading`: The angle each boid is facing, in radians.
+        `max_speed`, `max_force`, `arrival_dist`: The steering parameters of each boid.
+
+    Like `Mover`, the boids step once per tick of `TICKS_PER_SECOND`, whatever the
+    frame rate, carrying over time that is too short for a step along with the
+    forces added during it.
+    """
+
+    position: np.ndarray
+    velocity: np.ndarray
+    acceleration: np.ndarray
+    heading: np.ndarray
+    max_speed: np.ndarray
+    max_force: np.ndarray
+    arrival_dist: np.ndarray
+    # Time that was too short for a whole step, in ticks.
+    _carry: float = field(default=0.0, kw_only=True)
+    # The forces added in frames that were too short for a step, multiplied by how
+    # many ticks they lasted, and the total number of ticks.
+    _impulse: np.ndarray | None = field(default=None, kw_only=True)
+    _impulse_ticks: float = field(default=0.0, kw_only=True)
+
+    @staticmethod
+    def of(boids: list[Boid]) -> FlockState:
+        """Gather the state of each of the `boids` into arrays."""
+        count: int = len(boids)
+        return FlockState(
+            position=np.array([boid.position.as_2d() for boid in boids], dtype=float),
+            velocity=np.zeros((count, 2)),
+            acceleration=np.zeros((count, 2)),
+            heading=np.full(count, UPWARDS),
+            max_speed=np.array([boid.max_speed for boid in boids], dtype=float),
+            max_force=np.array([boid.max_force for boid in boids], dtype=float),
+            arrival_dist=np.array([boid.arrival_dist for boid in boids], dtype=float),
+        )
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    def steer(self, desired: np.ndarray) -> np.ndarray:
+        """Calculate the forces that turn each boid towards its `desired` velocity."""
+        return constrain_size(desired - self.velocity, 0.0, self.max_force)
+
+    def flock_forces(
+        self, separation: float, neighbour_dist: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate the separation, alignment, and cohesion forces of every boid."""
+        count: int = len(self)
+        separate: np.ndarray = np.zeros((count, 2))
+        align: np.ndarray = np.zeros((count, 2))
+        cohesion: np.ndarray = np.zeros((count, 2))
+        separate_count: np.ndarray = np.zeros(count)
+        neighbour_count: np.ndarray = np.zeros(count)
+
+        def accumulate(
+            total: np.ndarray, boids: np.ndarray, values: np.ndarray
+        ) -> None:
+            for axis in (0, 1):
+                total[:, axis] += np.bincount(boids, values[:, axis], minlength=count)
+
+        # Each pair is only found once, and then applied to both of its boids.
+        radius: float = max(separation, neighbour_dist)
+        for i, j in neighbour_pairs(self.position, radius, unique=True):
+            offset: np.ndarray = self.position[i] - self.position[j]
+            distance: np.ndarray = np.einsum("ij,ij->i", offset, offset)
+
+            near: np.ndarray = distance < separation**2
+            first, second = i[near], j[near]
+            pushes: np.ndarray = offset[near]
+            sizes: np.ndarray = np.sqrt(distance[near])[:, None]
+            direction: np.ndarray = np.divide(
+                pushes, sizes, out=np.zeros_like(pushes), where=sizes != 0
+            )
+            both: np.ndarray = np.concatenate((first, second))
+            accumulate(separate, both, np.concatenate((direction, -direction)))
+            separate_count += np.bincount(both, minlength=count)
+
+            near = distance < neighbour_dist**2
+            first, second = i[near], j[near]
+            both = np.concatenate((first, second))
+            others: np.ndarray = np.concatenate((second, first))
+            accumulate(align, both, self.velocity[others])
+            accumulate(cohesion, both, self.position[others])
+            neighbour_count += np.bincount(both, minlength=count)
+
+        # Boids that interacted with nobody feel no force.
+        separated: np.ndarray = (separate_count > 0)[:, None]
+        aligned: np.ndarray = (neighbour_count > 0)[:, None]
+        separate_count = np.maximum(separate_count, 1)[:, None]
+        neighbour_count = np.maximum(neighbour_count, 1)[:, None]
+
+        speed: np.ndarray = self.max_speed[:, None]
+        separation_force: np.ndarray = self.steer(
+            normalize(separate / separate_count) * speed
+        )
+        alignment_force: np.ndarray = self.steer(
+            normalize(align / neighbour_count) * speed
+        )
+        cohesion_force: np.ndarray = self.seek_force(cohesion / neighbour_count)
+        return (
+            np.where(separated, separation_force, 0.0),
+            np.where(aligned, alignment_force, 0.0),
+            np.where(aligned, cohesion_force, 0.0),
+        )
+
+    def seek_force(self, target: np.ndarray) -> np.ndarray:
+        """Calculate the forces that point each boid towards its `target`."""
+        # This mirrors `Boid.seek_force`, including slowing down on arrival.
+        offset: np.ndarray = target - self.position
+        distance: np.ndarray = np.einsum("ij,ij->i", offset, offset)
+        distance = np.where(
+            distance < self.arrival_dist**2,
+            distance / self.arrival_dist * self.max_speed,
+            distance,
+        )
+        return self.steer(normalize(offset) * distance[:, None])
+
+    def tick(self, delta: float) -> None:
+        """Move every boid by its velocity for `delta` seconds, and point it in that
+        direction."""
+        frame: float = delta * TICKS_PER_SECOND
+        steps, self._carry = split_steps(frame + self._carry, 1)
+        if steps == 0:
+            # Keep the forces of the frame for the next step, rather than losing them.
+            if self._impulse is None:
+                self._impulse = np.zeros_like(self.acceleration)
+            self._impulse += self.acceleration * frame
+            self._impulse_ticks += frame
+        elif self._impulse is not None:
+            # Step with the average acceleration since the last step.
+            total: float = self._impulse_ticks + frame
+            self.acceleration = (self.acceleration * frame + self._impulse) / total
+            self._impulse = None
+            self._impulse_ticks = 0.0
+        for _ in range(steps):
+            self.velocity = constrain_size(
+                self.velocity + self.acceleration, 0.0, self.max_speed
+            )
+            self.position += self.velocity
+        self.acceleration[:] = 0.0
+
+        # Boids that have stopped keep facing wherever they were facing.
+        moving: np.ndarray = np.any(self.velocity != 0.0, axis=1)
+        self.heading = np.where(
+            moving,
+            np.arctan2(self.velocity[:, 1], self.velocity[:, 0]) % math.tau,
+            self.heading,
+        )
+
+    def vertices(self) -> np.ndarray:
+        """Calculate the triangle of each boid, rotated towards its heading."""
+        angle: np.ndarray = self.heading - UPWARDS
+        cos: np.ndarray = np.cos(angle)[:, None]
+        sin: np.ndarray = np.sin(angle)[:, None]
+        x: np.ndarray = TRIANGLE[None, :, 0] * cos - TRIANGLE[None, :, 1] * sin
+        y: np.ndarray = TRIANGLE[None, :, 0] * sin + TRIANGLE[None, :, 1] * cos
+        return np.stack((x, y), axis=2) + self.position[:, None, :]
 
 
 @define
 class Flock(Scene):
     """A flocking simulation."""
 
-    # Size of the flock; very large values will run slowly.
+    # Size of the flock; boids only look at the boids in nearby cells of a spatial
+    # hash, so this can be in the thousands.
     size: int = 100
     separation: int = 60
     neighbour_dist: int = 90
     weights: list[float] = [1.25, 1.5, 1.75]
+    # Whether to steer the whole flock at once with arrays, in which case the
+    # boids are only used to draw the flock.
+    vectorized: bool = True
+    state: FlockState | None = None
 
-    def flock_forces(self, boids: list[Boid], boid: Boid) -> tuple[Vec3D, Vec3D, Vec3D]:
+    def flock_forces(
+        self, neighbours: SpatialHash[Boid], boid: Boid
+    ) -> tuple[Vec3D, Vec3D, Vec3D]:
         """Calculate the separation, alignment, and cohesion forces all at once."""
         # Store each force in a tuple, representing the total force and the
         # number of boids this force interacts with.
@@ -37,16 +222,18 @@ class Flock(Scene):
 
         mover: Mover = cast(Mover, boid.get_node("Vehicle"))
 
-        # TODO: Refactor.
-        for other in boids:
-            direction: Vec3D = (boid.position - other.position).normalize()
-            distance: float = direction.size_sq()
-            if boid == other:
+        # Only the boids close enough to affect this one are considered.
+        radius: int = max(self.separation, self.neighbour_dist)
+        for other in neighbours.query(boid.position, radius):
+            if other is boid:
                 continue
 
+            offset: Vec3D = boid.position - other.position
+            distance: float = offset.size_sq()
+
             other_mover: Mover = cast(Mover, other.get_node("Vehicle"))
             if distance < self.separation**2:
-                separate = (separate[0] + direction, separate[1] + 1)
+                separate = (separate[0] + offset.normalize(), separate[1] + 1)
             if distance < self.neighbour_dist**2:
                 align = (align[0] + other_mover.velocity, align[1] + 1)
                 cohesion = (cohesion[0] + other.position, cohesion[1] + 1)
@@ -70,24 +257,91 @@ class Flock(Scene):
 
     def flock(self) -> None:
         """Apply the forces necessary for the flock to... flock."""
-        for boid in cast(list[Boid], self.children):
+        boids: list[Boid] = cast(list[Boid], self.children)
+        # Rebuild the grid every tick, as every boid has moved since the last one.
+        neighbours: SpatialHash[Boid] = SpatialHash.of(
+            boids,
+            (boid.position for boid in boids),
+            cell_size=max(self.separation, self.neighbour_dist),
+        )
+        for boid in boids:
             mover: Mover = cast(Mover, boid.get_node("Vehicle"))
-            separation, alignment, cohesion = self.flock_forces(
-                cast(list[Boid], self.children), boid
-            )
+            separation, alignment, cohesion = self.flock_forces(neighbours, boid)
             mover.add_force(separation * self.weights[0])
             mover.add_force(alignment * self.weights[1])
             mover.add_force(cohesion * self.weights[2])
 
+    def flock_vectorized(self, delta: float) -> None:
+        """Steer and move every boid at once for `delta` seconds, then update the
+        boids to match."""
+        boids: list[Boid] = cast(list[Boid], self.children)
+        if self.state is None or len(self.state) != len(boids):
+            self.state = FlockState.of(boids)
+        state: FlockState = self.state
+
+        separation, alignment, cohesion = state.flock_forces(
+            self.separation, self.neighbour_dist
+        )
+        state.acceleration += (
+            separation * self.weights[0]
+            + alignment * self.weights[1]
+            + cohesion * self.weights[2]
+        )
+        state.tick(delta)
+
+        headings: list[float] = np.rad2deg(state.heading).tolist()
+        for boid, position, vertices, heading in zip(
+            boids, state.position.tolist(), state.vertices().tolist(), headings
+        ):
+            boid.position = boid.pivot = Point(*position)
+            boid.lines = [Point(*vertex) for vertex in vertices]
+            boid.rotation_ = heading
+
     def build(self) -> list[Scene]:
+        colors: list[Color] = Color.random_many(self.size, rng=self.rng)
+        positions: list[list[int]] = self.rng.integers(
+            (320, 180), (340, 210), (self.size, 2)
+        ).tolist()
         return [
             Boid(
                 tag=f"Boid {i}",
-                color=Color.random(),
-                position=Point(random.randrange(320, 340), random.randrange(180, 210)),
+                color=color,
+                autonomous=not self.vectorized,
+                position=Point(x, y),
             )
-            for i in range(self.size)
+            for i, (color, (x, y)) in enumerate(zip(colors, positions))
         ]
 
+    def observe(self) -> dict[str, float]:
+        """Measure how well the boids are flocking.
+
+        `polarization` is 1 when every boid heads the same way and near 0 when
+        they head every which way, and `spread` is the average distance of a boid
+        from the center of the flock."""
+        if self.state is not None:
+            position, velocity = self.state.position, self.state.velocity
+        else:
+            boids: list[Boid] = cast(list[Boid], self.children)
+            movers: list[Mover] = [
+                cast(Mover, boid.get_node("Vehicle")) for boid in boids
+            ]
+            position = np.array([(b.position.x, b.position.y) for b in boids])
+            velocity = np.array([(m.velocity.x, m.velocity.y) for m in movers])
+        if not len(position):
+            return {}
+        speed: np.ndarray = np.hypot(velocity[:, 0], velocity[:, 1])
+        moving: np.ndarray = speed > 0
+        headings: np.ndarray = velocity[moving] / speed[moving, None]
+        return {
+            "mean_speed": float(speed.mean()),
+            "polarization": (
+                float(np.hypot(*headings.mean(axis=0))) if moving.any() else 0.0
+            ),
+            "spread": float(np.hypot(*(position - position.mean(axis=0)).T).mean()),
+        }
+
     def tick(self, delta: float, engine: Engine) -> None:
-        self.flock()
+        if self.vectorized:
+            self.flock_vectorized(delta)
+        else:
+            self.flock()
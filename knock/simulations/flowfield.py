@@ -1,60 +1,160 @@
 from __future__ import annotations
 
 import math
-import random
+from pathlib import Path
 
-from attrs import Factory, define
+import numpy as np
+from attrs import define, field
 from depict import *
-from perlin_noise import PerlinNoise
-
-noise: PerlinNoise = PerlinNoise()
-
-# TODO: Refactor, it is very buggy.
+from depict.integrators import TICKS_PER_SECOND
+from depict.noise import Perlin
 
 
 @define
 class FlowField(Scene):
-    """A grid of vectors representing a fluid flow."""
+    """A grid of vectors representing a fluid flow.
+
+    The flow is stored as an array of unit vectors with a row for each column of
+    cells across the screen, and is generated from Perlin noise the first time it
+    is needed, unless it has been set already.
+
+    If `speed` is not 0, the flow changes over time by moving through 3D noise.
+    Only `budget` cells are updated each tick, in turn, so that animating a large
+    field costs the same each tick as animating a small one.
+
+    Attributes:
+        `resolution`: The width and height of each cell.
+        `scale`: How quickly the flow changes from one cell to the next.
+        `seed`: The seed of the noise, or None to draw one from the `rng` of the
+            field.
+        `cache`: A directory to save generated flows in, so that a flow with the
+            same seed, size and scale is only ever generated once.
+        `vectors`: The direction of the flow in each cell, as a `(rows, cols, 2)`
+            array. It can also be read or set as `field`, a list of rows of
+            `Vec3D`, though reading `field` makes a new list each time.
+        `speed`: How quickly the flow changes each tick.
+        `budget`: The most cells to update each tick.
+        `time`: How far through time the flow has moved."""
 
     resolution: int = 10
     rows: int = 640 // resolution
     cols: int = 360 // resolution
-    field: list[list[Vec3D]] = Factory(list)
+    scale: float = 0.1
+    seed: int | None = None
+    cache: Path | None = None
+    vectors: np.ndarray | None = None
+    speed: float = 0.0
+    budget: int = 256
+    time: float = 0.0
+    _noise: Perlin | None = field(init=False, default=None)
+    # The flat index of the next cell to update.
+    _cursor: int = field(init=False, default=0)
 
     def draw(self, canvas: Canvas) -> None:
-        for i, row in enumerate(self.field):
-            if i % 2 == 0:
-                continue
-            for j, velocity in enumerate(row):
-                if i % 2 == 0:
-                    continue
-                start = Vec3D(
-                    i * self.resolution + self.resolution // 2,
-                    j * self.resolution + self.resolution // 2,
-                )
-                canvas.line(
-                    start,
-                    start + (start + velocity).normalize() * 5,
-                    White,
-                    width=1,
-                )
-                canvas.circle(start + (start + velocity).normalize() * 5, 2.0, Red)
+        vectors: np.ndarray = self.grid()
+        half: int = self.resolution // 2
+        for i in range(1, self.rows, 2):
+            for j, (dx, dy) in enumerate(vectors[i].tolist()):
+                start = Vec3D(i * self.resolution + half, j * self.resolution + half)
+                end = start + Vec3D(dx, dy) * 5
+                canvas.line(start, end, White, width=1)
+                canvas.circle(end, 2.0, Red)
+
+    def grid(self) -> np.ndarray:
+        """The direction of the flow in each cell, generating it if needed."""
+        if self.vectors is None:
+            self.random()
+        return self.vectors
+
+    def _cache_path(self) -> Path | None:
+        """Where a generated flow is cached, if it can be."""
+        # Without a seed, every flow is different, so there is nothing to reuse,
+        # and a changing flow does not stay the same for long enough to reuse.
+        if self.cache is None or self.seed is None or self.speed:
+            return None
+        return self.cache / (
+            f"flowfield-{self.seed}-{self.rows}x{self.cols}-{self.scale:g}.npy"
+        )
 
     def random(self) -> FlowField:
         """Create a random flow field with Perlin Noise."""
-        self.field = [([Vec3D.origin()] * self.cols) for _ in range(self.rows)]
-        dx = dy = random.randrange(10, 100)
-        for row in range(self.rows):
-            for col in range(self.cols):
-                theta: float = utils.map(noise([dx, dy]), 0, 1, 0, math.tau)
-                self.field[row][col] = Vec3D(math.cos(theta), math.sin(theta))
-                dy += 0.01
-            dx += 0.01
+        path: Path | None = self._cache_path()
+        if path is not None and path.exists():
+            self.vectors = np.load(path)
+            return self
+
+        seed: int = (
+            self.seed if self.seed is not None else int(self.rng.integers(0, 2**32))
+        )
+        self._noise = Perlin(seed)
+        rows, cols = np.meshgrid(
+            np.arange(self.rows), np.arange(self.cols), indexing="ij"
+        )
+        self.vectors = self._flow(rows, cols)
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(path, self.vectors)
         return self
 
+    def _flow(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Calculate the direction of the flow in each of the cells at the current
+        time, as an array of unit vectors."""
+        assert self._noise is not None
+        x: np.ndarray = rows * self.scale
+        y: np.ndarray = cols * self.scale
+        noise: np.ndarray = (
+            self._noise.noise3(x, y, self.time)
+            if self.speed
+            else self._noise.noise2(x, y)
+        )
+        theta: np.ndarray = utils.map(noise, 0, 1, 0, math.tau)
+        return np.stack((np.cos(theta), np.sin(theta)), axis=-1)
+
+    def tick(self, delta: float, engine: Engine) -> None:
+        if not self.speed:
+            return
+        vectors: np.ndarray = self.grid()
+        if self._noise is None:
+            # The flow was set by hand, so there is no noise to move through.
+            return
+        self.time += self.speed * delta * TICKS_PER_SECOND
+
+        # Update the next cells in turn, wrapping around to the first cell.
+        cells: int = self.rows * self.cols
+        indices: np.ndarray = (
+            self._cursor + np.arange(min(self.budget, cells))
+        ) % cells
+        self._cursor = int(indices[-1] + 1) % cells
+        rows, cols = np.divmod(indices, self.cols)
+        vectors[rows, cols] = self._flow(rows, cols)
+
     def at(self, pos: Point) -> Vec3D:
         """Lookup the velocity vector stored at a certain position."""
-        size = (pos // self.resolution).constrain(
-            Vec3D.origin().map(int), Vec3D(self.rows - 1, self.cols - 1)
+        row: int = min(max(int(pos.x // self.resolution), 0), self.rows - 1)
+        col: int = min(max(int(pos.y // self.resolution), 0), self.cols - 1)
+        x, y = self.grid()[row, col].tolist()
+        return Vec3D(x, y)
+
+    def at_many(self, positions: np.ndarray) -> np.ndarray:
+        """Lookup the velocity vectors stored at each row of an `(n, 2)` array of
+        positions, returning them as an `(n, 2)` array."""
+        cells: np.ndarray = (np.asarray(positions)[:, :2] // self.resolution).astype(
+            np.intp
         )
-        return self.field[size.x][size.y]
+        rows: np.ndarray = np.clip(cells[:, 0], 0, self.rows - 1)
+        cols: np.ndarray = np.clip(cells[:, 1], 0, self.cols - 1)
+        return self.grid()[rows, cols]
+
+    # This is defined last, so that it does not hide `attrs.field` in the class.
+    @property
+    def field(self) -> list[list[Vec3D]]:
+        """The direction of the flow in each cell, as a list of rows of `Vec3D`."""
+        return [[Vec3D(x, y) for x, y in row] for row in self.grid().tolist()]
+
+    @field.setter
+    def field(self, rows: list[list[Vec3D]]) -> None:
+        self.vectors = np.array(
+            [[(vector.x, vector.y) for vector in row] for row in rows], dtype=float
+        ).reshape(len(rows), -1, 2)
+        self.rows, self.cols = self.vectors.shape[:2]
@@ -25,9 +25,7 @@ class FractalTree(Node2D):
         self.line(end, Point(end.x, end.y - length * 2 / 3).rotate(-theta, end), size)
 
     def tick(self, delta: float, engine: Engine) -> None:
+        # The tree is regrown every tick, as it follows the mouse.
+        self.children = []
         end: Point = Point(self.position.x, self.position.y - self.length)
         self.line(self.position, end, engine.size)
-
-    def draw(self, canvas: Canvas) -> None:
-        self.children = []
-        return super().draw(canvas)
@@ -10,6 +10,10 @@ from depict import *
 class KochSnowflake(Scene):
     """A visualization of one side of the Koch Snowflake."""
 
+    # The snowflake never changes once it is generated, so it only needs to be
+    # drawn once.
+    static: bool = True
+
     def build(self) -> list[Scene]:
         start: Point = Point(160, 90)
         end: Point = Point(480, 90)
@@ -17,7 +17,9 @@ class LineDrawer(Point2D):
             self.start_pos: Point = self.position
             self.line_started = True
             line = Line2D(
-                position=self.start_pos, end=Mouse.get_pos(), color=Color.random()
+                position=self.start_pos,
+                end=Mouse.get_pos(),
+                color=Color.random(rng=self.rng),
             )
             self.children.append(line)
         elif Mouse.is_pressed(MouseButton.Left) and self.line_started:
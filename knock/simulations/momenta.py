@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import math
-import random
 from typing import Optional, cast
 
 from attrs import define
 from depict import *
+from simulations.collisions import collide
 from simulations.mover import Mover
 
 
@@ -14,13 +14,13 @@ class Ball(Mover):
     """A round, colorful ball."""
 
     @staticmethod
-    def random(bounds: Size) -> Ball:
+    def random(bounds: Size, rng: Rng) -> Ball:
         """Randomly generate a ball that is within some bounds."""
-        ball: Ball = Ball(color=Color.random())
-        ball.mass = random.uniform(0.5, 5)
+        ball: Ball = Ball(color=Color.random(rng=rng))
+        ball.mass = rng.uniform(0.5, 5)
         radius: int = int(ball.radius)
-        x: int = random.randint(radius, bounds.width - radius)
-        y: int = random.randint(radius, bounds.height - radius)
+        x: int = rng.randint(radius, bounds.width - radius)
+        y: int = rng.randint(radius, bounds.height - radius)
         ball.position = Point(x, y)
         return ball
 
@@ -28,7 +28,8 @@ class Ball(Mover):
         """Determine whether the two balls collide."""
         # If the sum of their radii is greater than the distance between
         # their centers, then the ball is not colliding.
-        return (self.position - other.position).size() <= (other.radius + self.radius)
+        reach: float = other.radius + self.radius
+        return (self.position - other.position).size_sq() <= reach * reach
 
     def tick(self, delta: float, engine: Engine) -> None:
         self.obey_friction()
@@ -94,39 +95,27 @@ class Momenta(Scene):
     bounds: Size = Size(640, 360)
 
     def build(self) -> list[Scene]:
-        children: list[Scene] = [Ball.random(self.bounds) for _ in range(self.size)]
+        children: list[Scene] = [
+            Ball.random(self.bounds, self.rng) for _ in range(self.size)
+        ]
         children.append(Trigger())
         return children
 
+    def observe(self) -> dict[str, float]:
+        """Measure the total kinetic energy and momentum of the balls."""
+        balls: list[Ball] = cast(list[Ball], self.children[:-1])
+        return {
+            "kinetic_energy": sum(
+                0.5 * ball.mass * ball.velocity.size_sq() for ball in balls
+            ),
+            "momentum": sum(
+                (ball.velocity * ball.mass for ball in balls), Vec2D.origin()
+            ).size(),
+        }
+
     def tick(self, delta: float, engine: Engine) -> None:
-        for ball in cast(list[Ball], self.children[:-1]):
-            trigger: Trigger = cast(Trigger, self.get_node("Trigger"))
+        balls: list[Ball] = cast(list[Ball], self.children[:-1])
+        trigger: Trigger = cast(Trigger, self.get_node("Trigger"))
+        for ball in balls:
             trigger.activate(ball)
-
-            for other in cast(list[Ball], self.children[:-1]):
-                if ball == other:
-                    continue
-                if ball.collides_with(other):
-                    distance: float = (ball.position - other.position).size()
-                    gamma: float = 0.5 * (distance - (ball.radius + other.radius))
-                    overlap: Point = gamma * (ball.position - other.position) / distance
-                    ball.position -= overlap
-                    other.position += overlap
-
-                    normal: Point = (other.position - ball.position).normalize()
-                    tangent: Point = Point(-normal.y, normal.x)
-                    ball_tan_dot = tangent.dot(ball.velocity)
-                    other_tan_dot = tangent.dot(other.velocity)
-                    ball_norm_dot = normal.dot(ball.velocity)
-                    other_norm_dot = normal.dot(other.velocity)
-                    m1 = (
-                        ball_norm_dot * (ball.mass - other.mass)
-                        + 2 * other.mass * other_norm_dot
-                    ) / (ball.mass + other.mass)
-                    m2 = (
-                        other_norm_dot * (other.mass - ball.mass)
-                        + 2 * ball.mass * ball_norm_dot
-                    ) / (ball.mass + other.mass)
-
-                    ball.velocity = normal * m1 + tangent * ball_tan_dot
-                    other.velocity = normal * m2 + tangent * other_tan_dot
+        collide(balls)
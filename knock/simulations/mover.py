@@ -2,24 +2,31 @@ from __future__ import annotations
 
 """An object that... moves?"""
 
-import random
+from typing import Callable
 
-from attrs import define
+from attrs import Factory, define, field
 from depict import *
+from depict.integrators import (
+    TICKS_PER_SECOND,
+    Integrator,
+    SemiImplicitEuler,
+    split_steps,
+)
 
 
 def random_mover(seed: int, wind: bool = False) -> Mover:
     """Create a Mover with randomized properties."""
     mover = Mover()
+    rng: Rng = mover.rng
     # Movers should be center-ish and spaced out.
     mover.position.x = seed * mover.radius + 200
-    mover.mass = random.randrange(1, 8)
+    mover.mass = rng.randint(1, 7)
     # Wind of varying force either to the left or right.
     # Note: This force is only added for one timestep.
     if wind is True:
-        mover.add_force(Vec2D(random.uniform(-2, 2), 0))
+        mover.add_force(Vec2D(rng.uniform(-2, 2), 0))
     # Randomize color for sex appeal.
-    mover.color = Color.random()
+    mover.color = Color.random(rng=rng)
     return mover
 
 
@@ -29,8 +36,9 @@ class Mover(Circle2D):
 
     color: Color = White
 
-    velocity: Vec2D = Vec2D(0, 0)
-    acceleration: Vec2D = Vec2D(0, 0)
+    # Every Mover owns its velocity and acceleration, so they can be updated in place.
+    velocity: Vec2D = Factory(Vec2D.origin)
+    acceleration: Vec2D = Factory(Vec2D.origin)
 
     # Whenever mass is changed, the radius changes to reflect it visually.
     _mass: float = 1.0
@@ -48,6 +56,21 @@ class Mover(Circle2D):
     # Whether to draw the shape or not.
     draw_: bool = True
 
+    # How the Mover moves, and how many steps it takes per tick. More steps are
+    # more accurate, but cost more.
+    integrator: Integrator = Factory(SemiImplicitEuler)
+    substeps: int = 1
+    # An acceleration that depends on the position and velocity of the Mover,
+    # which is evaluated at every step. Forces added with `add_force` stay the
+    # same for the whole tick.
+    acceleration_field: Callable[[Point, Vec2D], Vec2D] | None = None
+    # Time that was too short for a whole step, in ticks.
+    _carry: float = field(init=False, default=0.0)
+    # The forces added in frames that were too short for a step, as accelerations
+    # multiplied by how many ticks they lasted, and the total number of ticks.
+    _impulse: Vec2D = field(init=False, factory=Vec2D.origin)
+    _impulse_ticks: float = field(init=False, default=0.0)
+
     @property
     def mass(self) -> float:
         return self._mass
@@ -57,9 +80,15 @@ class Mover(Circle2D):
         self._mass = mass
         self.radius = (mass**0.5) * 10
 
+    def acceleration_at(self, position: Point, velocity: Vec2D) -> Vec2D:
+        """The acceleration of the Mover if it had the given position and velocity."""
+        if self.acceleration_field is None:
+            return self.acceleration
+        return self.acceleration + self.acceleration_field(position, velocity)
+
     def add_force(self, force: Vec2D) -> None:
         """Add a force to the Mover, using `F = ma`."""
-        self.acceleration += force / self.mass
+        self.acceleration.iadd(force / self.mass)
 
     def obey_gravity(self) -> None:
         """Apply a crude gravity on the Mover according to its mass."""
@@ -105,11 +134,27 @@ class Mover(Circle2D):
             return super().draw(canvas)
 
     def tick(self, delta: float, engine: Engine) -> None:
-        # Newton's algorithm
-        self.velocity += self.acceleration
-        self.position += self.velocity
-        self.acceleration = Vec2D.origin()
-
-        self.angular_velocity += self.angular_acceleration
-        self.rotation += self.angular_velocity
-        self.angular_velocity *= 1 - self.friction
+        # Velocities are per tick, so step by the number of ticks that delta is
+        # worth. This keeps the motion the same whatever the frame rate.
+        frame: float = delta * TICKS_PER_SECOND
+        steps, self._carry = split_steps(frame + self._carry, self.substeps)
+        dt: float = 1 / self.substeps
+        if steps == 0:
+            # Keep the forces of the frame for the next step, rather than losing them.
+            self._impulse.iadd(self.acceleration * frame)
+            self._impulse_ticks += frame
+        else:
+            if self._impulse_ticks:
+                # Step with the average acceleration since the last step.
+                total: float = self._impulse_ticks + frame
+                self.acceleration.scale_(frame / total).iadd(self._impulse / total)
+                self._impulse.scale_(0)
+                self._impulse_ticks = 0.0
+            for _ in range(steps):
+                self.integrator.step(self, dt)
+        self.acceleration.scale_(0)
+
+        ticks: float = steps * dt
+        self.angular_velocity += self.angular_acceleration * ticks
+        self.rotation += self.angular_velocity * ticks
+        self.angular_velocity *= (1 - self.friction) ** ticks
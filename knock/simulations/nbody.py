@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+"""N-body gravity, where every body attracts every other body."""
+
+import math
+from typing import cast
+
+import numpy as np
+from attrs import define
+from depict import *
+from simulations.planet import Planet
+
+# The deepest that the quadtree can get. Bodies closer together than the root
+# square divided by 2^MAX_DEPTH are treated as a single body by each other.
+MAX_DEPTH: int = 16
+# The most bodies whose forces are calculated at once, to bound memory use.
+CHUNK: int = 4096
+
+
+def exact_accelerations(
+    position: np.ndarray, mass: np.ndarray, G: float, softening: float = 0.0
+) -> np.ndarray:
+    """Calculate the acceleration of each body due to every other body, exactly.
+
+    This compares every pair of bodies, so it is only suitable for small systems,
+    or for checking `barnes_hut_accelerations`. `softening` is added to every
+    distance to stop close encounters from creating huge accelerations."""
+    count: int = len(position)
+    acceleration: np.ndarray = np.zeros((count, 2))
+    for start in range(0, count, max(1, CHUNK * CHUNK // max(count, 1))):
+        stop: int = min(start + max(1, CHUNK * CHUNK // max(count, 1)), count)
+        offset: np.ndarray = position[None, :, :2] - position[start:stop, None, :2]
+        distance_sq: np.ndarray = (offset**2).sum(axis=2) + softening**2
+        # A body does not attract itself.
+        strength: np.ndarray = np.divide(
+            mass[None, :],
+            distance_sq**1.5,
+            out=np.zeros_like(distance_sq),
+            where=distance_sq != 0,
+        )
+        acceleration[start:stop] = G * np.einsum("ij,ijk->ik", strength, offset)
+    return acceleration
+
+
+def _morton(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Interleave the bits of two arrays of 16 bit integers into quadtree keys."""
+
+    def spread(values: np.ndarray) -> np.ndarray:
+        values = values.astype(np.uint64)
+        values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF)
+        values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+        values = (values | (values << np.uint64(2))) & np.uint64(0x33333333)
+        values = (values | (values << np.uint64(1))) & np.uint64(0x55555555)
+        return values
+
+    return spread(x) | (spread(y) << np.uint64(1))
+
+
+@define
+class QuadtreeLevel:
+    """Every node at one depth of a quadtree, stored as arrays.
+
+    Bodies are sorted along the quadtree, so each node holds a contiguous run of
+    them, starting at `first` and `count` bodies long.
+
+    Attributes:
+        `keys`: The quadtree key of each node, sorted.
+        `first`, `count`: The bodies that each node holds.
+        `mass`: The total mass in each node.
+        `center`: The center of mass of each node.
+        `children`: Where the children of each node start and stop in the next
+            level, as an `(n, 2)` array."""
+
+    keys: np.ndarray
+    first: np.ndarray
+    count: np.ndarray
+    mass: np.ndarray
+    center: np.ndarray
+    children: np.ndarray | None = None
+
+
+def build_quadtree(
+    position: np.ndarray, mass: np.ndarray
+) -> tuple[np.ndarray, float, list[QuadtreeLevel]]:
+    """Build a quadtree over the bodies, one level at a time.
+
+    Returns the order that sorts the bodies along the tree, the width of the root
+    square, and each level of the tree from the root down. Levels stop once every
+    node holds a single body, or at `MAX_DEPTH`."""
+    low: np.ndarray = position[:, :2].min(axis=0)
+    # Pad the root so that the bodies furthest out still land inside it.
+    width: float = float((position[:, :2].max(axis=0) - low).max()) * 1.0001 or 1.0
+    cells: np.ndarray = np.clip(
+        ((position[:, :2] - low) / width * 2**MAX_DEPTH).astype(np.int64),
+        0,
+        2**MAX_DEPTH - 1,
+    )
+    keys: np.ndarray = _morton(cells[:, 0], cells[:, 1])
+    order: np.ndarray = np.argsort(keys, kind="stable")
+    keys, sorted_mass = keys[order], mass[order]
+    weighted: np.ndarray = position[order, :2] * sorted_mass[:, None]
+
+    levels: list[QuadtreeLevel] = []
+    for depth in range(MAX_DEPTH + 1):
+        prefixes: np.ndarray = keys >> np.uint64(2 * (MAX_DEPTH - depth))
+        node_keys, first, count = np.unique(
+            prefixes, return_index=True, return_counts=True
+        )
+        node_mass: np.ndarray = np.add.reduceat(sorted_mass, first)
+        center: np.ndarray = np.divide(
+            np.add.reduceat(weighted, first),
+            node_mass[:, None],
+            out=np.zeros((len(first), 2)),
+            where=node_mass[:, None] != 0,
+        )
+        if levels:
+            parents: np.ndarray = levels[-1].keys
+            levels[-1].children = np.stack(
+                (
+                    np.searchsorted(node_keys >> np.uint64(2), parents, "left"),
+                    np.searchsorted(node_keys >> np.uint64(2), parents, "right"),
+                ),
+                axis=1,
+            )
+        levels.append(QuadtreeLevel(node_keys, first, count, node_mass, center))
+        if count.max() == 1:
+            break
+    return order, width, levels
+
+
+def barnes_hut_accelerations(
+    position: np.ndarray,
+    mass: np.ndarray,
+    G: float,
+    theta: float = 0.5,
+    softening: float = 0.0,
+) -> np.ndarray:
+    """Calculate the acceleration of each body due to every other body, using the
+    Barnes-Hut approximation.
+
+    Bodies are grouped into a quadtree, and any node of the tree that looks
+    smaller than the opening angle `theta` from a body is treated as a single
+    body at its center of mass. A `theta` of 0 opens every node, which gives the
+    exact answer, while larger values are faster but less accurate.
+
+    Instead of walking the tree once per body, every body walks it at the same
+    time, one level at a time, as arrays of (body, node) pairs."""
+    count: int = len(position)
+    if count < 2:
+        return np.zeros((count, 2))
+    order, width, levels = build_quadtree(position, mass)
+    x, y = position[order, :2].T
+    sorted_mass: np.ndarray = mass[order]
+    acceleration: np.ndarray = np.zeros((count, 2))
+    theta_sq: float = theta * theta
+    softening_sq: float = softening * softening
+
+    for start in range(0, count, CHUNK):
+        # The bodies are indexed by their position in the sorted order.
+        bodies: np.ndarray = np.arange(start, min(start + CHUNK, count))
+        nodes: np.ndarray = np.zeros(len(bodies), dtype=np.intp)
+        for depth, level in enumerate(levels):
+            size: float = width / 2**depth
+            node_count: np.ndarray = level.count[nodes]
+            # Whether each body is one of the bodies held by its node.
+            inside: np.ndarray = (bodies - level.first[nodes]).astype(
+                np.uintp
+            ) < node_count.astype(np.uintp)
+            center: np.ndarray = level.center[nodes]
+            dx: np.ndarray = center[:, 0] - x[bodies]
+            dy: np.ndarray = center[:, 1] - y[bodies]
+            distance_sq: np.ndarray = dx * dx + dy * dy
+            node_mass: np.ndarray = level.mass[nodes]
+
+            # Nodes are used as they are if they look small enough and do not
+            # hold the body itself, or if they cannot be opened any further.
+            last: bool = level.children is None
+            accept: np.ndarray
+            if last:
+                accept = np.ones(len(bodies), dtype=bool)
+            else:
+                accept = (~inside & (size * size < theta_sq * distance_sq)) | (
+                    node_count == 1
+                )
+
+            # A body does not attract itself, so take it out of any node it is in.
+            own: np.ndarray = accept & inside
+            if own.any():
+                body_mass: np.ndarray = sorted_mass[bodies[own]]
+                rest: np.ndarray = node_mass[own] - body_mass
+                keep: np.ndarray = rest > 0
+                rest_x: np.ndarray = (
+                    center[own, 0] * node_mass[own] - x[bodies[own]] * body_mass
+                )
+                rest_y: np.ndarray = (
+                    center[own, 1] * node_mass[own] - y[bodies[own]] * body_mass
+                )
+                dx[own] = (
+                    np.where(keep, rest_x / np.where(keep, rest, 1), 0) - x[bodies[own]]
+                )
+                dy[own] = (
+                    np.where(keep, rest_y / np.where(keep, rest, 1), 0) - y[bodies[own]]
+                )
+                node_mass[own] = np.where(keep, rest, 0.0)
+                distance_sq[own] = dx[own] ** 2 + dy[own] ** 2
+
+            softened: np.ndarray = distance_sq[accept] + softening_sq
+            strength: np.ndarray = np.divide(
+                G * node_mass[accept],
+                softened * np.sqrt(softened),
+                out=np.zeros_like(softened),
+                where=softened != 0,
+            )
+            pulled: np.ndarray = bodies[accept]
+            acceleration[:, 0] += np.bincount(
+                pulled, dx[accept] * strength, minlength=count
+            )
+            acceleration[:, 1] += np.bincount(
+                pulled, dy[accept] * strength, minlength=count
+            )
+
+            # Replace every node that was too close with its children.
+            opened: np.ndarray = ~accept
+            if last or not opened.any():
+                break
+            starts, stops = level.children[nodes[opened]].T
+            sizes: np.ndarray = stops - starts
+            bodies = np.repeat(bodies[opened], sizes)
+            nodes = np.repeat(starts, sizes) + (
+                np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            )
+
+    # Undo the sorting of the bodies.
+    unsorted: np.ndarray = np.empty_like(acceleration)
+    unsorted[order] = acceleration
+    return unsorted
+
+
+@define
+class Gravity(Node2D):
+    """Makes all of its `Planet` children attract each other.
+
+    Attributes:
+        `G`: The gravitational constant.
+        `theta`: The opening angle of the Barnes-Hut approximation. 0 is exact.
+        `exact`: Whether to compare every pair of planets instead of using
+            Barnes-Hut, which is faster for a handful of planets.
+        `softening`: A distance added to every distance between planets, which
+            stops close encounters from flinging planets away.
+        `display_scale`: The size of one unit of distance on screen, as in
+            `Planet.gravitational_force`."""
+
+    G: float = 6.67 * 10**-11
+    theta: float = 0.5
+    exact: bool = False
+    softening: float = 0.0
+    display_scale: float = 1.0
+
+    def accelerations(self, planets: list[Planet]) -> np.ndarray:
+        """Calculate the acceleration of each planet due to all of the others."""
+        position: np.ndarray = np.array(
+            [(planet.position.x, planet.position.y) for planet in planets], dtype=float
+        )
+        mass: np.ndarray = np.array([planet.mass for planet in planets], dtype=float)
+        # Distances are measured on screen, but forces use real distances.
+        G: float = self.G * self.display_scale**2
+        if self.exact:
+            return exact_accelerations(position, mass, G, self.softening)
+        return barnes_hut_accelerations(position, mass, G, self.theta, self.softening)
+
+    def tick(self, delta: float, engine: Engine) -> None:
+        planets: list[Planet] = [
+            child for child in self.children if isinstance(child, Planet)
+        ]
+        if len(planets) < 2:
+            return
+        for planet, (x, y) in zip(planets, self.accelerations(planets).tolist()):
+            planet.acceleration.iadd(Vec2D(x, y))
+
+
+@define
+class Galaxy(Scene):
+    """A disc of stars orbiting a heavy core."""
+
+    stars: int = 2000
+    theta: float = 0.7
+    center: Point = Point(320, 180)
+    radius: float = 160.0
+    core_mass: float = 2000.0
+
+    def build(self) -> list[Scene]:
+        core: Planet = Planet(position=self.center, color=Color(255, 220, 150))
+        core.mass = self.core_mass
+        core.radius = 4
+
+        stars: list[Scene] = [core]
+        # Spread the stars out so that their density falls away from the core.
+        distances: list[float] = (
+            self.radius * (0.25 + 0.75 * self.rng.random(self.stars) ** 0.7)
+        ).tolist()
+        angles: list[float] = self.rng.uniform(0, math.tau, self.stars).tolist()
+        hues: list[float] = self.rng.uniform(0.5, 0.7, self.stars).tolist()
+        for distance, angle, hue in zip(distances, angles, hues):
+            star: Planet = Planet(
+                position=self.center
+                + Point(distance * math.cos(angle), distance * math.sin(angle)),
+                color=Color.hsv(hue, 0.4, 1.0),
+            )
+            star.mass = 0.5
+            star.radius = 1
+            # Start each star on a roughly circular orbit around the core.
+            speed: float = math.sqrt(self.core_mass / distance)
+            star.velocity = Vec2D(-speed * math.sin(angle), speed * math.cos(angle))
+            stars.append(star)
+        return [Gravity(G=1.0, theta=self.theta, softening=2.0, children=stars)]
+
+    def gravity(self) -> Gravity:
+        return cast(Gravity, self.get_node("Gravity"))
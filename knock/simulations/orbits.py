@@ -2,6 +2,7 @@
 
 from attrs import define
 from depict import *
+from simulations.nbody import Gravity
 from simulations.planet import Planet
 
 
@@ -17,12 +18,6 @@ class Orbit(Node2D):
         if Keyboard.is_pressed(Key.Q):
             exit()
 
-        earth: Planet = self.get_node("Earth")
-        moon: Planet = self.get_node("Moon")
-
-        earth.attract(moon, self.display_scale)
-        moon.attract(earth, self.display_scale)
-
     def ready(self, engine: Engine) -> None:
         engine.screen.toggle_fullscreen()
 
@@ -45,10 +40,12 @@ class Orbit(Node2D):
 
         moon.position = earth.position + Point(0, 3.84 * 10**8 * self.display_scale)
         moon.velocity.x = 1022.0
-        earth.attract(moon, self.display_scale)
-        moon.attract(earth, self.display_scale)
 
+        # With only two bodies, comparing every pair is faster than a quadtree.
         self.children = [
-            earth,
-            moon,
+            Gravity(
+                exact=True,
+                display_scale=self.display_scale,
+                children=[earth, moon],
+            )
         ]
@@ -1,12 +1,19 @@
+from __future__ import annotations
+
 """A particle system that can be affected by physics."""
 
-import random
+import math
 from typing import cast
 
-from attrs import define
+import numpy as np
+import pygame
+from attrs import define, field
 from depict import *
 from simulations.mover import Mover
 
+# The number of distinct levels of transparency that particles are drawn with.
+ALPHA_LEVELS: int = 64
+
 
 @define
 class Particle(Node2D):
@@ -27,7 +34,7 @@ class Particle(Node2D):
                 tag="Particle",
                 position=self.position,
                 acceleration=Vec3D(0, 0.1),
-                velocity=Vec3D(random.randint(-2, 2), random.randint(0, 4)),
+                velocity=Vec3D(self.rng.randint(-2, 2), self.rng.randint(0, 4)),
                 color=self.color,
             )
         ]
@@ -41,30 +48,139 @@ class Particle(Node2D):
         particle.color.a = max(0, self.lifespan)
 
 
+@define
+class ParticlePool:
+    """A fixed number of particles, stored as parallel arrays.
+
+    The live particles are always packed into the first `count` rows, so that
+    every operation only touches live particles. Dead particles are recycled by
+    moving the survivors down over them, so nothing is allocated per particle.
+
+    Attributes:
+        `position`: The center of each particle.
+        `velocity`: The velocity of each particle.
+        `lifespan`: How long each particle has left to live, which is also its
+            alpha. Particles die once this drops below 0.
+        `count`: The number of live particles."""
+
+    position: np.ndarray
+    velocity: np.ndarray
+    lifespan: np.ndarray
+    count: int = 0
+
+    @staticmethod
+    def of(capacity: int) -> ParticlePool:
+        """Create an empty pool with room for `capacity` particles."""
+        return ParticlePool(
+            np.zeros((capacity, 2)), np.zeros((capacity, 2)), np.zeros(capacity)
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def capacity(self) -> int:
+        """The largest number of particles that can be alive at once."""
+        return len(self.lifespan)
+
+    def emit(self, position: Point, velocity: np.ndarray, lifespan: float) -> None:
+        """Bring new particles to life at `position`, one per row of `velocity`.
+
+        Particles that do not fit in the pool are not emitted."""
+        start: int = self.count
+        stop: int = min(start + len(velocity), self.capacity())
+        self.position[start:stop] = (position.x, position.y)
+        self.velocity[start:stop] = velocity[: stop - start]
+        self.lifespan[start:stop] = lifespan
+        self.count = stop
+
+    def recycle(self) -> None:
+        """Free up the rows of every dead particle."""
+        alive: np.ndarray = self.lifespan[: self.count] >= 0
+        survivors: int = int(np.count_nonzero(alive))
+        if survivors != self.count:
+            for array in (self.position, self.velocity, self.lifespan):
+                array[:survivors] = array[: self.count][alive]
+            self.count = survivors
+
+    def push(self, acceleration: tuple[float, float]) -> None:
+        """Accelerate every live particle."""
+        self.velocity[: self.count] += acceleration
+
+    def tick(self, decay_rate: float) -> None:
+        """Age every live particle, and move it by its velocity."""
+        self.lifespan[: self.count] -= decay_rate
+        self.position[: self.count] += self.velocity[: self.count]
+
+
 @define
 class ParticleEmitter(Node2D):
-    """A point source of particles being emitted."""
+    """A point source of particles being emitted.
+
+    Particles are not nodes, but rows in a `ParticlePool`, which lets the emitter
+    handle hundreds of thousands of them. They are drawn with one batch of
+    prerendered sprites, one for each of `ALPHA_LEVELS` levels of transparency."""
 
     position: Point = Point(320, 90)
     max_particles: int = 1000
     color: Color = Blue
+    # The number of particles emitted per tick.
+    rate: int = 1
+    decay_rate: int = 8
+    radius: float = 10.0
+    g: float = 0.2
+    pool: ParticlePool = field(init=False)
+    _sprites: list[pygame.Surface] = transient(factory=list)
+
+    def __attrs_post_init__(self) -> None:
+        super().__attrs_post_init__()
+        self.pool = ParticlePool.of(self.max_particles)
 
     def add_force(self, force: Vec3D) -> None:
         """Add a force to every single particle that exists."""
-        for particle in cast(list[Particle], self.children):
-            cast(Mover, particle.get_node("Mover")).add_force(force)
+        self.pool.push((force.x, force.y))
 
     def emit(self) -> None:
-        """Emit a new particle."""
-        self.children.append(
-            Particle(position=self.position, decay_rate=8, color=self.color)
-        )
+        """Emit `rate` new particles."""
+        velocity: np.ndarray = np.stack(
+            (
+                self.rng.integers(-2, 3, self.rate),
+                # New particles start out with a small push downwards.
+                self.rng.integers(0, 5, self.rate) + 0.1,
+            ),
+            axis=1,
+        ).astype(float)
+        self.pool.emit(self.position, velocity, 255)
 
     def tick(self, delta: float, engine: Engine) -> None:
-        for particle in cast(list[Particle], self.children):
-            cast(Mover, particle.get_node("Particle")).obey_gravity()
-            if particle.dead():
-                self.children.remove(particle)
-
-        if len(self.children) < self.max_particles:
-            self.emit()
+        self.pool.recycle()
+        self.emit()
+        self.pool.push((0, self.g))
+        self.pool.tick(self.decay_rate)
+
+    def sprites(self) -> list[pygame.Surface]:
+        """Get a circle for every level of transparency, rendering them if needed."""
+        if not self._sprites:
+            size: int = math.ceil(self.radius * 2)
+            for level in range(ALPHA_LEVELS):
+                sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+                color: Color = Color(
+                    self.color.r,
+                    self.color.g,
+                    self.color.b,
+                    round(level * 255 / (ALPHA_LEVELS - 1)),
+                )
+                pygame.draw.circle(
+                    sprite, color._to_pygame_color(), (size / 2, size / 2), self.radius
+                )
+                self._sprites.append(sprite)
+        return self._sprites
+
+    def draw(self, canvas: Canvas) -> None:
+        count: int = self.pool.count
+        sprites: list[pygame.Surface] = self.sprites()
+        alpha: np.ndarray = np.clip(self.pool.lifespan[:count], 0, 255)
+        levels: list[int] = (
+            np.rint(alpha * (ALPHA_LEVELS - 1) / 255).astype(int).tolist()
+        )
+        corners: list[list[float]] = (self.pool.position[:count] - self.radius).tolist()
+        canvas.sprites(list(zip(map(sprites.__getitem__, levels), corners)))
@@ -5,6 +5,7 @@ from typing import cast
 
 from attrs import define
 from depict import *
+from depict.integrators import VelocityVerlet
 from simulations.mover import Mover
 
 
@@ -15,10 +16,17 @@ class Spring(Line2D):
     length: float = 10.0
     k: float = 0.1
 
-    def connect(self, bob: Mover) -> None:
-        """Connect the spring to the bob and apply tension on it."""
-        new_length: float = (bob.position - self.position).size()
+    def tension(self, position: Point) -> Vec2D:
+        """The force that the spring pulls a bob at `position` with."""
+        offset: Vec2D = position - self.position
         # If the spring extended, x > 0, if the spring was compressed, x < 0
+        x: float = offset.size() - self.length
+        return offset.normalize() * -1 * self.k * x
+
+    def constrain(self, bob: Mover) -> None:
+        """Attach the spring to the bob, without letting the spring be compressed or
+        extended too much."""
+        new_length: float = (bob.position - self.position).size()
         x: float = new_length - self.length
         self.end = bob.position
         # If x is compressed too much or extended too much...
@@ -29,8 +37,11 @@ class Spring(Line2D):
             bob.position = self.position + (
                 (bob.position - self.position).normalize() * new_constrained_length
             )
-        tension = (bob.position - self.position).normalize() * -1 * self.k * x
-        bob.add_force(tension)
+
+    def connect(self, bob: Mover) -> None:
+        """Connect the spring to the bob and apply tension on it."""
+        self.constrain(bob)
+        bob.add_force(self.tension(bob.position))
 
 
 @define
@@ -54,12 +65,35 @@ class Pendulum(Node2D):
                 pivot=self.pivot,
                 position=self.position,
                 color=self.color,
+                # The tension changes as the bob moves, so it is recalculated at
+                # every step, which keeps the swing from gaining energy.
+                integrator=VelocityVerlet(),
+                substeps=4,
+                acceleration_field=self.spring_acceleration,
             ),
         ]
 
+    def spring_acceleration(self, position: Point, velocity: Vec2D) -> Vec2D:
+        """The acceleration of the bob due to the spring, if it were at `position`."""
+        bob: Mover = cast(Mover, self.get_node("Bob"))
+        spring: Spring = cast(Spring, self.get_node("Spring"))
+        return spring.tension(position) / bob.mass
+
+    def observe(self) -> dict[str, float]:
+        """Measure how far the bob has swung, how fast it is going, and how much
+        the spring is stretched."""
+        bob: Mover = cast(Mover, self.get_node("Bob"))
+        spring: Spring = cast(Spring, self.get_node("Spring"))
+        offset: Vec2D = bob.position - spring.position
+        return {
+            "angle": math.degrees(math.atan2(offset.x, offset.y)),
+            "speed": bob.velocity.size(),
+            "stretch": offset.size() - self.length,
+        }
+
     def tick(self, delta: float, engine: Engine) -> None:
         bob: Mover = cast(Mover, self.get_node("Bob"))
         spring: Spring = cast(Spring, self.get_node("Spring"))
 
         bob.obey_gravity()
-        spring.connect(bob)
+        spring.constrain(bob)
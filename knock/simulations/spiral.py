@@ -1,6 +1,6 @@
 """A mesmerising spiral."""
 
-from attrs import define
+from attrs import Factory, define
 from depict import *
 
 
@@ -13,7 +13,7 @@ class Spiral(Point2D):
     radius: float = 1.0
     pivot: Point = Point(320, 180)
     position: Point = Point(pivot.x + radius, pivot.y)
-    color: Color = Color.random()
+    color: Color = Factory(lambda self: Color.random(rng=self.rng), takes_self=True)
 
     def tick(self, delta: float, engine: Engine) -> None:
         direction: Vec3D = (self.position - self.pivot).normalize()
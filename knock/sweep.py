@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+"""Running a simulation headlessly for every combination of its parameters."""
+
+import ast
+import itertools
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from attrs import asdict, define
+
+
+@define
+class SweepRun:
+    """One configuration of a simulation to run.
+
+    Attributes:
+        `index`: The position of the run in the sweep.
+        `simulation`: The class name of the simulation.
+        `params`: The arguments to create the simulation with.
+        `seed`: The seed for every source of randomness.
+        `ticks`: The number of ticks to run for.
+        `width`, `height`: The size of the window.
+        `frames`: A directory to save the final frame of the run to, if any."""
+
+    index: int
+    simulation: str
+    params: dict[str, Any]
+    seed: int
+    ticks: int
+    width: int = 640
+    height: int = 360
+    frames: str | None = None
+
+
+@define
+class SweepResult:
+    """The measurements from one run of a sweep.
+
+    Attributes:
+        `index`, `simulation`, `params`, `seed`: The run that was measured.
+        `ticks`: The number of ticks that were run.
+        `seconds`: The total time taken, including building the scene.
+        `ticks_per_second`: The number of ticks run per second of the event loop.
+        `observables`: The measurements returned by the `observe` method of the
+            simulation, if it has one.
+        `frame`: Where the final frame was saved, if it was."""
+
+    index: int
+    simulation: str
+    params: dict[str, Any]
+    seed: int
+    ticks: int
+    seconds: float
+    ticks_per_second: float
+    observables: dict[str, float]
+    frame: str | None = None
+
+
+def parse_param(param: str) -> tuple[str, list[Any]]:
+    """Parse a parameter in the form `name=value,value,...` into its name and the
+    values to try. Each value is a Python literal, so tuples need parentheses."""
+    name, _, values = param.partition("=")
+    if not name or not values:
+        raise ValueError(f"Expected a parameter in the form name=value,...: {param}")
+    parsed: Any = ast.literal_eval(f"[{values}]")
+    return name.strip(), parsed
+
+
+def grid(params: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Find every combination of the values of each parameter."""
+    names: list[str] = [*params]
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(params[name] for name in names))
+    ]
+
+
+def seed_for(params: dict[str, Any], base: int, repeat: int) -> int:
+    """Derive the seed of a run from its parameters, so that the same configuration
+    gets the same seed no matter where it is in the grid."""
+    key: bytes = json.dumps(params, sort_keys=True, default=repr).encode()
+    return (zlib.crc32(key) + base * 1_000_003 + repeat) % 2**32
+
+
+def plan(
+    simulation: str,
+    params: dict[str, list[Any]],
+    ticks: int,
+    seed: int = 0,
+    repeats: int = 1,
+    width: int = 640,
+    height: int = 360,
+    frames: Path | None = None,
+) -> list[SweepRun]:
+    """List every run of a sweep over the grid of `params`."""
+    runs: list[SweepRun] = []
+    for config in grid(params):
+        for repeat in range(repeats):
+            runs.append(
+                SweepRun(
+                    index=len(runs),
+                    simulation=simulation,
+                    params=config,
+                    seed=seed_for(config, seed, repeat),
+                    ticks=ticks,
+                    width=width,
+                    height=height,
+                    frames=str(frames) if frames is not None else None,
+                )
+            )
+    return runs
+
+
+def execute(run: SweepRun) -> SweepResult:
+    """Run one configuration headlessly and measure it.
+
+    This is called in a worker process, so everything is imported here."""
+    import depict
+    import pygame
+    import simulations
+    from bench import seed
+
+    seed(run.seed)
+    engine = depict.Engine(
+        depict.Size(run.width, run.height),
+        headless=True,
+        ticks=run.ticks,
+        seed=run.seed,
+    )
+    scene = getattr(simulations, run.simulation)(**run.params)
+    start: float = time.perf_counter()
+    engine.run(scene)
+    seconds: float = time.perf_counter() - start
+
+    frame: str | None = None
+    if run.frames is not None and engine.screen is not None:
+        frame = str(Path(run.frames) / f"{run.simulation.lower()}-{run.index}.png")
+        Path(run.frames).mkdir(parents=True, exist_ok=True)
+        pygame.image.save(engine.screen.surface, frame)
+
+    observe = getattr(scene, "observe", None)
+    return SweepResult(
+        index=run.index,
+        simulation=run.simulation,
+        params=run.params,
+        seed=run.seed,
+        ticks=engine.frame_count,
+        seconds=seconds,
+        ticks_per_second=(
+            engine.frame_count / engine.loop_time if engine.loop_time else 0.0
+        ),
+        observables=observe() if observe is not None else {},
+        frame=frame,
+    )
+
+
+def sweep(
+    runs: Iterable[SweepRun], workers: int | None = None
+) -> Iterator[SweepResult]:
+    """Run every configuration across a pool of processes, yielding each result as
+    soon as it finishes. With a single worker, runs happen in this process."""
+    runs = [*runs]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(execute, runs)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(runs) or 1)) as pool:
+        for future in as_completed([pool.submit(execute, run) for run in runs]):
+            yield future.result()
+
+
+def write(result: SweepResult, file: IO[str]) -> None:
+    """Write a result to a file as a single line of JSON."""
+    file.write(json.dumps(asdict(result), separators=(",", ":"), default=repr) + "\n")
+    file.flush()
@@ -0,0 +1,53 @@
+from knock.depict.engine import Engine
+from knock.depict.nodes import Area2D, Node2D, OnBodyEntered, OnBodyExited
+from knock.depict.scene import Scene
+from knock.depict.vec3d import Point, Size
+
+
+def test_area2d_tracks_bodies_entering_and_leaving() -> None:
+    area = Area2D(position=Point(0, 0), size=Size(100, 100))
+    inside = Node2D("Inside", position=Point(50, 50))
+    outside = Node2D("Outside", position=Point(500, 50))
+    engine = Engine(Size(640, 360))
+    engine.root = Scene("Root", children=[area, inside, outside])
+
+    events: list[tuple[str, str]] = []
+    engine.connect(
+        lambda _, body: events.append(("enter", body.tag)), area, OnBodyEntered
+    )
+    engine.connect(
+        lambda _, body: events.append(("exit", body.tag)), area, OnBodyExited
+    )
+
+    engine.frame_count = 1
+    area.tick(1.0, engine)
+    assert events == [("enter", "Inside")]
+    assert area.bodies == [inside]
+
+    # Moving outside of the area is noticed, even though the grid is now stale.
+    inside.position = Point(300, 300)
+    area.tick(1.0, engine)
+    assert events == [("enter", "Inside"), ("exit", "Inside")]
+
+    engine.frame_count = 2
+    outside.position = Point(100, 100)
+    area.tick(1.0, engine)
+    assert events[-1] == ("enter", "Outside")
+
+    # Bodies that are removed from the scene leave the area.
+    engine.root.children.remove(outside)
+    engine.frame_count = 3
+    area.tick(1.0, engine)
+    assert events[-1] == ("exit", "Outside")
+    assert area.bodies == []
+
+
+def test_area2d_ignores_itself_and_its_family() -> None:
+    parent = Node2D("Parent", position=Point(10, 10))
+    area = Area2D(position=Point(0, 0), size=Size(100, 100), parent=parent)
+    parent.children = [area, Node2D("Sibling", position=Point(5, 5))]
+    engine = Engine(Size(640, 360))
+    engine.root = Scene("Root", children=[parent])
+    engine.frame_count = 1
+    area.tick(1.0, engine)
+    assert area.bodies == []
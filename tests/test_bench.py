@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+import knock.simulations as simulations
+from knock.bench import BenchResult, bench, load_baseline, regressions, save_baseline
+
+
+@pytest.mark.parametrize("name", simulations.__all__)
+def test_every_simulation_runs_headlessly(name: str) -> None:
+    result: BenchResult = bench(name, getattr(simulations, name), ticks=3, memory=False)
+    assert result.ticks == 3
+    assert result.ticks_per_second > 0
+    assert result.update_seconds >= 0 and result.draw_seconds >= 0
+
+
+def test_bench_measures_peak_memory() -> None:
+    result: BenchResult = bench("Spiral", simulations.Spiral, ticks=3)
+    assert result.peak_memory is not None and result.peak_memory > 0
+
+
+def test_baseline_round_trip_and_regressions(tmp_path: Path) -> None:
+    path: Path = tmp_path / "benchmarks.json"
+    fast = BenchResult("fast", 10, 1.0, 100.0, 0.05, 0.05, 1000)
+    save_baseline(path, [fast])
+    baseline: dict[str, BenchResult] = load_baseline(path)
+    assert baseline == {"fast": fast}
+
+    slower = BenchResult("fast", 10, 1.0, 70.0, 0.05, 0.05, 1000)
+    assert regressions([fast], baseline) == []
+    assert len(regressions([slower], baseline)) == 1
+    assert regressions([slower], baseline, tolerance=0.5) == []
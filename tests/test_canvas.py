@@ -0,0 +1,43 @@
+import numpy as np
+import pygame
+
+from knock.depict.canvas import Canvas
+from knock.depict.color import Color, White
+from knock.depict.engine import Engine
+from knock.depict.scene import Scene
+from knock.depict.vec3d import Point, Size
+
+
+class Dot(Scene):
+    """A dot that moves a little every tick, leaving the rest of the screen alone."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.x: int = 5
+
+    def tick(self, delta: float, engine: Engine) -> None:
+        self.x += 3
+
+    def draw(self, canvas: Canvas) -> None:
+        canvas.circle(Point(self.x, 20), 4, White)
+        canvas.rect(Point(self.x, 30), Size(4, 4), Color(255, 0, 0, 128))
+
+
+def test_canvas_tracks_painted_areas() -> None:
+    canvas = Canvas(pygame.Surface((64, 48)), track=True)
+    canvas.circle(Point(10, 10), 2, White)
+    canvas.rect(Point(30, 30), Size(4, 4), Color(0, 0, 255, 100))
+    canvas.flush()
+    painted: list[pygame.Rect] = canvas.painted()
+    assert pygame.Rect(8, 8, 4, 4) in painted
+    assert pygame.Rect(30, 30, 4, 4) in painted
+    assert canvas.painted() == []
+
+
+def test_dirty_rects_paint_the_same_frames() -> None:
+    frames: list[np.ndarray] = []
+    for dirty_rects in (False, True):
+        engine = Engine(Size(64, 48), headless=True, ticks=8, dirty_rects=dirty_rects)
+        engine.run(Dot())
+        frames.append(pygame.surfarray.array3d(engine.screen.surface))
+    assert np.array_equal(frames[0], frames[1])
@@ -0,0 +1,63 @@
+import math
+import random
+
+import numpy as np
+
+from knock.depict.vec3d import Point
+from knock.simulations.collisions import collide, touching_pairs
+from knock.simulations.mover import Mover
+
+
+def test_touching_pairs_matches_brute_force() -> None:
+    rng = np.random.default_rng(3)
+    position: np.ndarray = rng.uniform(0, 200, (300, 2))
+    radius: np.ndarray = rng.uniform(1, 8, 300)
+    i, j = touching_pairs(position, radius)
+    found = set(zip(i.tolist(), j.tolist()))
+    expected = {
+        (a, b)
+        for a in range(300)
+        for b in range(a + 1, 300)
+        if math.dist(position[a], position[b]) <= radius[a] + radius[b]
+    }
+    assert found == expected
+
+
+def test_head_on_collision_of_equal_masses_swaps_velocities() -> None:
+    left = Mover(position=Point(0, 0), velocity=Point(2, 0))
+    right = Mover(position=Point(15, 0), velocity=Point(-1, 0))
+    far = Mover(position=Point(100, 100), velocity=Point(1, 1))
+    collide([left, right, far])
+
+    # The movers are pushed apart until they just touch.
+    assert math.isclose(right.position.x - left.position.x, 20)
+    assert math.isclose(left.velocity.x, -1) and math.isclose(right.velocity.x, 2)
+    assert far.position == Point(100, 100) and far.velocity == Point(1, 1)
+
+    # Movers that are already moving apart are not bounced back together.
+    collide([left, right, far])
+    assert math.isclose(left.velocity.x, -1) and math.isclose(right.velocity.x, 2)
+
+
+def test_collisions_conserve_momentum() -> None:
+    random.seed(1)
+    movers: list[Mover] = []
+    for _ in range(200):
+        mover = Mover(
+            position=Point(random.uniform(0, 100), random.uniform(0, 100)),
+            velocity=Point(random.uniform(-2, 2), random.uniform(-2, 2)),
+        )
+        mover.mass = random.uniform(0.5, 5)
+        movers.append(mover)
+
+    def momentum() -> tuple[float, float]:
+        return (
+            sum(mover.mass * mover.velocity.x for mover in movers),
+            sum(mover.mass * mover.velocity.y for mover in movers),
+        )
+
+    before = momentum()
+    collide(movers)
+    after = momentum()
+    assert math.isclose(before[0], after[0], abs_tol=1e-9)
+    assert math.isclose(before[1], after[1], abs_tol=1e-9)
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+from attrs import define
+
+from knock.depict.engine import Engine
+from knock.depict.scene import Scene
+from knock.depict.vec3d import Size
+
+
+@define
+class Counter(Scene):
+    ticks: int = 0
+
+    def tick(self, delta: float, engine: Engine) -> None:
+        self.ticks += 1
+
+
+def test_headless_runs_for_ticks() -> None:
+    driver: str | None = os.environ.get("SDL_VIDEODRIVER")
+    engine = Engine(Size(320, 180), headless=True, ticks=5)
+    counter = Counter()
+    engine.run(counter)
+    assert engine.frame_count == 5 and counter.ticks == 5
+    # The video driver is only switched while the headless window is open.
+    assert os.environ.get("SDL_VIDEODRIVER") == driver
+
+
+def test_everything_is_released_when_the_video_fails(tmp_path, monkeypatch) -> None:
+    import depict.input
+    import depict.recorder
+
+    def fail(recorder) -> None:
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(depict.recorder.Recorder, "close", fail)
+    monkeypatch.chdir(tmp_path)
+    driver: str | None = os.environ.get("SDL_VIDEODRIVER")
+    engine = Engine(
+        Size(64, 48),
+        headless=True,
+        ticks=3,
+        record=True,
+        record_input=tmp_path / "session.input",
+    )
+    with pytest.raises(OSError):
+        engine.run(Counter())
+
+    assert len(depict.input.InputLog.open(tmp_path / "session.input").states) == 3
+    assert depict.input.CURRENT is None
+    assert os.environ.get("SDL_VIDEODRIVER") == driver
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from knock.simulations.flock import FlockState
+
+
+def state() -> FlockState:
+    return FlockState(
+        position=np.zeros((1, 2)),
+        velocity=np.zeros((1, 2)),
+        acceleration=np.zeros((1, 2)),
+        heading=np.zeros(1),
+        max_speed=np.array([8.0]),
+        max_force=np.array([0.2]),
+        arrival_dist=np.array([100.0]),
+    )
+
+
+def test_flock_state_steps_by_the_ticks_that_delta_is_worth() -> None:
+    positions: list[float] = []
+    # The same force is applied for a second at each frame rate.
+    for frame_rate in (30, 60, 120):
+        flock = state()
+        for _ in range(frame_rate):
+            flock.acceleration += (0.1, 0.0)
+            flock.tick(1 / frame_rate)
+        positions.append(flock.position[0, 0])
+    assert positions[0] == pytest.approx(positions[1], rel=0.05)
+    assert positions[1] == pytest.approx(positions[2], rel=0.05)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from knock.depict.vec3d import Point, Vec3D
+from knock.simulations.flowfield import FlowField
+
+
+def test_at_many_matches_at() -> None:
+    field = FlowField(seed=5)
+    positions: np.ndarray = np.random.default_rng(1).uniform(-20, 700, (200, 2))
+    batched: np.ndarray = field.at_many(positions)
+    for (x, y), (vx, vy) in zip(positions.tolist(), batched.tolist()):
+        vector = field.at(Point(x, y))
+        assert np.allclose((vector.x, vector.y), (vx, vy))
+    assert np.allclose(np.linalg.norm(batched, axis=1), 1)
+
+
+def test_seeded_fields_are_cached(tmp_path) -> None:
+    first = FlowField(seed=7, cache=tmp_path).random()
+    assert len(list(tmp_path.iterdir())) == 1
+    second = FlowField(seed=7, cache=tmp_path).random()
+    assert np.array_equal(first.vectors, second.vectors)
+    assert first.vectors.shape == (first.rows, first.cols, 2)
+
+    FlowField(cache=tmp_path).random()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_changing_flow_updates_a_budget_of_cells() -> None:
+    field = FlowField(seed=3, speed=0.5, budget=100)
+    before: np.ndarray = field.grid().copy()
+    field.tick(1 / 60, None)
+    changed: np.ndarray = (field.vectors != before).any(axis=2)
+    # Only the first cells are updated, though a few may happen to stay the same.
+    assert not changed.flat[100:].any()
+    assert changed.flat[:100].mean() > 0.9
+
+    cells: int = field.rows * field.cols
+    for _ in range(cells // 100 + 1):
+        field.tick(1 / 60, None)
+    assert (field.vectors != before).any(axis=2).mean() > 0.9
+
+
+def test_the_flow_can_be_set_as_a_list_of_rows() -> None:
+    field = FlowField()
+    field.field = [[Vec3D(1, 0), Vec3D(0, 1)], [Vec3D(-1, 0), Vec3D(0, -1)]]
+    assert (field.rows, field.cols) == (2, 2)
+    assert field.vectors.shape == (2, 2, 2)
+    vector = field.at(Point(15, 5))
+    assert (vector.x, vector.y) == (-1, 0)
+    vector = field.field[1][1]
+    assert (vector.x, vector.y) == (0, -1)
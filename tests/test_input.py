@@ -0,0 +1,189 @@
+from pathlib import Path
+from typing import ClassVar
+
+import depict
+import numpy as np
+import pygame
+from attrs import define
+from depict import (
+    InputLog,
+    InputRecorder,
+    InputState,
+    Key,
+    Keyboard,
+    MouseButton,
+    Size,
+)
+
+import knock.simulations as simulations
+
+LEFT: int = 1 << (MouseButton.Left.value - 1)
+
+
+def record(path: Path, states: list[InputState], seed: int = 7) -> None:
+    with InputRecorder(path, seed, Size(640, 360), 60) as recorder:
+        for state in states:
+            recorder.write(state)
+
+
+def test_input_log_round_trip(tmp_path: Path) -> None:
+    path: Path = tmp_path / "session.input"
+    states: list[InputState] = [
+        InputState(1 / 60, (10, 20), LEFT, 0, (Key.A.value, Key.F1.value)),
+        InputState(1 / 30, (-5, 400), 0, 1, (), tick=1),
+    ]
+    record(path, states, seed=2**100)
+
+    log: InputLog = InputLog.open(path)
+    assert log.seed == 2**100
+    assert log.size == Size(640, 360) and log.frame_rate == 60
+    assert log.states == states
+    assert log.next() == states[0] and log.next() == states[1]
+    assert log.next() is None
+
+
+def test_replayed_input_is_seen_by_nodes(tmp_path: Path) -> None:
+    path: Path = tmp_path / "drawing.input"
+    # Drag a line from (100, 100) to (200, 150), then let go.
+    record(
+        path,
+        [
+            InputState(1 / 60, (100, 100), LEFT),
+            InputState(1 / 60, (150, 120), LEFT),
+            InputState(1 / 60, (200, 150), LEFT),
+            InputState(1 / 60, (200, 150)),
+        ],
+    )
+
+    engine = depict.Engine(Size(640, 360), headless=True, replay=InputLog.open(path))
+    assert engine.seed == 7
+    drawer = simulations.LineDrawer()
+    engine.run(drawer)
+
+    # The engine stops once every tick has been replayed.
+    assert engine.frame_count == 4
+    # The line was started by the press, and followed the mouse until let go.
+    (line,) = drawer.children
+    assert (line.end.x, line.end.y) == (200, 150)
+
+
+def test_replays_scale_the_mouse_to_the_window(tmp_path: Path) -> None:
+    path: Path = tmp_path / "drawing.input"
+    record(
+        path,
+        [InputState(1 / 60, (100, 100), LEFT), InputState(1 / 60, (200, 150), LEFT)],
+    )
+
+    engine = depict.Engine(Size(1280, 720), headless=True, replay=InputLog.open(path))
+    drawer = simulations.LineDrawer()
+    engine.run(drawer)
+    (line,) = drawer.children
+    assert (line.end.x, line.end.y) == (400, 300)
+
+
+@define
+class Watcher(depict.Scene):
+    """Remembers where the mouse was each tick, and can rewind the engine once."""
+
+    # These are kept on the class, so that they are not rewound too.
+    seen: ClassVar[list[tuple[int, int]]] = []
+    deltas: ClassVar[list[float]] = []
+    rewind_at: ClassVar[int | None] = None
+
+    def tick(self, delta: float, engine: depict.Engine) -> None:
+        position = depict.Mouse.get_pos()
+        Watcher.seen.append((position.x, position.y))
+        Watcher.deltas.append(delta)
+        if engine.frame_count == Watcher.rewind_at:
+            Watcher.rewind_at = None
+            engine.rewind(2)
+
+
+def watch(engine: depict.Engine, rewind_at: int | None = None) -> list[tuple[int, int]]:
+    Watcher.seen, Watcher.deltas, Watcher.rewind_at = [], [], rewind_at
+    engine.run(Watcher())
+    return Watcher.seen
+
+
+def test_replays_can_change_the_frame_rate(tmp_path: Path) -> None:
+    path: Path = tmp_path / "session.input"
+    record(path, [InputState(1 / 60, (i, i)) for i in range(6)])
+
+    faster = depict.Engine(
+        Size(640, 360), headless=True, frame_rate=120, replay=InputLog.open(path)
+    )
+    # Each input is held for the two ticks that it spans.
+    assert watch(faster) == [(i // 2, i // 2) for i in range(12)]
+    assert Watcher.deltas == [1 / 120] * 12
+
+    slower = depict.Engine(
+        Size(640, 360), headless=True, frame_rate=30, replay=InputLog.open(path)
+    )
+    assert watch(slower) == [(0, 0), (2, 2), (4, 4)]
+    assert Watcher.deltas == [1 / 30] * 3
+
+
+def test_replays_follow_a_recorded_rewind(tmp_path: Path, monkeypatch) -> None:
+    path: Path = tmp_path / "session.input"
+    # Move the mouse somewhere new every tick.
+    moves = iter(range(1000))
+    monkeypatch.setattr(pygame.mouse, "get_pos", lambda: (next(moves), 0))
+
+    recording = depict.Engine(
+        Size(640, 360),
+        headless=True,
+        ticks=40,
+        checkpoint_every=10,
+        record_input=path,
+    )
+    recorded: list[tuple[int, int]] = watch(recording, rewind_at=25)
+    # 25 ticks, and then 30 more from the checkpoint at tick 10.
+    assert len(recorded) == 55
+
+    replay = depict.Engine(
+        Size(640, 360), headless=True, checkpoint_every=10, replay=InputLog.open(path)
+    )
+    assert watch(replay, rewind_at=25) == recorded
+    assert replay.frame_count == 40
+
+
+def test_rewinding_a_replay(tmp_path: Path) -> None:
+    path: Path = tmp_path / "momenta.input"
+    record(path, [InputState(1 / 60, (320, 180), tick=tick) for tick in range(30)])
+
+    engine = depict.Engine(
+        Size(640, 360), headless=True, checkpoint_every=10, replay=InputLog.open(path)
+    )
+    engine.run(simulations.Momenta())
+    assert engine.frame_count == 30
+
+    # The rest of the input is replayed from the checkpoint.
+    assert engine.rewind(2)
+    engine.run(engine.root, ready=False)
+    assert engine.frame_count == 30
+    assert [snapshot.frame for snapshot in engine.checkpoints] == [10, 20, 30]
+
+
+def test_keyboard_reads_the_current_input() -> None:
+    depict.input.use(InputState(1 / 60, keys=(Key.Q.value,), mods=1))
+    try:
+        assert Keyboard.is_pressed(Key.Q) and not Keyboard.is_pressed(Key.W)
+        assert Keyboard.is_pressed(Key.LShift)
+        assert not depict.Mouse.is_pressed(MouseButton.Left)
+    finally:
+        depict.input.use(None)
+
+
+def test_replays_are_deterministic(tmp_path: Path) -> None:
+    path: Path = tmp_path / "momenta.input"
+    record(path, [InputState(1 / 60, (320, 180))] * 30)
+
+    def positions() -> np.ndarray:
+        engine = depict.Engine(
+            Size(640, 360), headless=True, replay=InputLog.open(path)
+        )
+        momenta = simulations.Momenta()
+        engine.run(momenta)
+        return np.array([(b.position.x, b.position.y) for b in momenta.children[:-1]])
+
+    assert np.array_equal(positions(), positions())
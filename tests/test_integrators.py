@@ -0,0 +1,73 @@
+import math
+
+import pytest
+from attrs import define
+
+from knock.depict.integrators import RK4, SemiImplicitEuler, VelocityVerlet, split_steps
+from knock.depict.vec3d import Point, Vec2D
+from knock.simulations.mover import Mover
+
+
+@define
+class Oscillator:
+    """A body on a spring with a period of 2π ticks."""
+
+    position: Point
+    velocity: Vec2D
+
+    def acceleration_at(self, position: Point, velocity: Vec2D) -> Vec2D:
+        return -1 * position
+
+    def energy(self) -> float:
+        return 0.5 * (self.position.size_sq() + self.velocity.size_sq())
+
+
+@pytest.mark.parametrize(
+    "integrator, tolerance",
+    [(SemiImplicitEuler(), 0.1), (VelocityVerlet(), 0.01), (RK4(), 0.0001)],
+)
+def test_integrators_keep_an_oscillator_stable(integrator, tolerance) -> None:
+    body = Oscillator(Point(1, 0), Vec2D(0, 0))
+    for _ in range(1000):
+        integrator.step(body, 0.1)
+    assert body.energy() == pytest.approx(0.5, rel=tolerance)
+    # 100 ticks is almost 16 periods.
+    assert body.position.x == pytest.approx(math.cos(100), abs=tolerance * 10)
+
+
+def test_split_steps_carries_leftover_time() -> None:
+    assert split_steps(1.0, 1) == (1, 0.0)
+    steps, rest = split_steps(0.75, 2)
+    assert (steps, rest) == (1, pytest.approx(0.25))
+    assert split_steps(100.0, 2)[0] == 8
+
+
+def test_mover_moves_the_same_at_any_frame_rate() -> None:
+    positions: list[Point] = []
+    # The same force is applied for a second at each frame rate.
+    for frame_rate in (30, 60, 120):
+        mover = Mover(position=Point(0, 0), substeps=4)
+        for _ in range(frame_rate):
+            mover.add_force(Vec2D(1, 0))
+            mover.tick(1 / frame_rate, None)
+        positions.append(mover.position)
+    assert positions[0].x == pytest.approx(positions[1].x, rel=0.05)
+    assert positions[1].x == pytest.approx(positions[2].x, rel=0.05)
+
+
+def test_mover_keeps_forces_from_frames_without_a_step() -> None:
+    mover = Mover(position=Point(0, 0))
+    # At 120 fps, every other frame is too short for a step.
+    mover.add_force(Vec2D(1, 0))
+    mover.tick(1 / 120, None)
+    assert mover.velocity.x == 0
+    mover.tick(1 / 120, None)
+    # The force lasted for half of the tick that was stepped.
+    assert mover.velocity.x == pytest.approx(0.5)
+
+    # Forces added every frame are not counted twice.
+    steady = Mover(position=Point(0, 0))
+    for _ in range(120):
+        steady.add_force(Vec2D(1, 0))
+        steady.tick(1 / 120, None)
+    assert steady.velocity.x == pytest.approx(60)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from knock.depict.vec3d import Point
+from knock.simulations.nbody import (
+    Gravity,
+    barnes_hut_accelerations,
+    exact_accelerations,
+)
+from knock.simulations.planet import Planet
+
+
+def test_exact_accelerations_match_planet_attraction() -> None:
+    earth = Planet(position=Point(0, 0), mass=5.0)
+    moon = Planet(position=Point(30, 40), mass=2.0)
+    earth.attract(moon, 0.5)
+    moon.attract(earth, 0.5)
+    gravity = Gravity(exact=True, display_scale=0.5)
+    acceleration: np.ndarray = gravity.accelerations([earth, moon])
+    assert np.allclose(acceleration[0], (earth.acceleration.x, earth.acceleration.y))
+    assert np.allclose(acceleration[1], (moon.acceleration.x, moon.acceleration.y))
+
+
+def test_barnes_hut_without_approximation_is_exact() -> None:
+    rng = np.random.default_rng(4)
+    position: np.ndarray = rng.normal(0, 100, (400, 2))
+    mass: np.ndarray = rng.uniform(1, 5, 400)
+    assert np.allclose(
+        barnes_hut_accelerations(position, mass, 1.0, theta=0.0, softening=1.0),
+        exact_accelerations(position, mass, 1.0, softening=1.0),
+    )
+
+
+def test_barnes_hut_is_close_to_exact() -> None:
+    rng = np.random.default_rng(5)
+    position: np.ndarray = rng.normal(0, 100, (2000, 2))
+    mass: np.ndarray = rng.uniform(1, 5, 2000)
+    exact: np.ndarray = exact_accelerations(position, mass, 1.0, softening=1.0)
+    approximate: np.ndarray = barnes_hut_accelerations(
+        position, mass, 1.0, theta=0.5, softening=1.0
+    )
+    error: np.ndarray = np.linalg.norm(approximate - exact, axis=1)
+    scale: float = np.linalg.norm(exact, axis=1).mean()
+    assert np.median(error) < 0.02 * scale
+    assert error.max() < 0.2 * scale
+
+
+def test_coincident_bodies_do_not_attract_themselves() -> None:
+    position: np.ndarray = np.array([[0.0, 0.0], [0.0, 0.0], [10.0, 0.0]])
+    mass: np.ndarray = np.ones(3)
+    acceleration: np.ndarray = barnes_hut_accelerations(position, mass, 1.0)
+    assert np.isfinite(acceleration).all()
+    assert np.allclose(acceleration[:2], [[0.01, 0.0], [0.01, 0.0]])
@@ -0,0 +1,27 @@
+import numpy as np
+
+from knock.depict.noise import Perlin
+
+
+def test_noise_is_deterministic_for_a_seed() -> None:
+    x, y = np.meshgrid(np.linspace(0, 8, 50), np.linspace(0, 8, 50))
+    assert np.array_equal(Perlin(3).noise2(x, y), Perlin(3).noise2(x, y))
+    assert not np.array_equal(Perlin(3).noise2(x, y), Perlin(4).noise2(x, y))
+
+
+def test_noise_is_zero_on_the_grid_and_bounded() -> None:
+    noise = Perlin(1)
+    whole: np.ndarray = np.arange(-5, 5, dtype=float)
+    assert np.allclose(noise.noise2(whole, whole), 0)
+    assert np.allclose(noise.noise3(whole, whole, whole), 0)
+    points: np.ndarray = np.random.default_rng(0).uniform(-50, 50, (3, 10000))
+    assert np.abs(noise.noise2(points[0], points[1])).max() <= 1
+    assert np.abs(noise.noise3(*points)).max() <= 1.5
+
+
+def test_noise_is_smooth() -> None:
+    noise = Perlin(2)
+    x: np.ndarray = np.linspace(0, 10, 10001)
+    steps: np.ndarray = np.abs(np.diff(noise.noise3(x, 0.5, 0.25)))
+    assert steps.max() < 0.01
+    assert np.isclose(float(noise.noise2(1.3, 2.7)), noise.noise2([1.3], [2.7])[0])
@@ -0,0 +1,35 @@
+import numpy as np
+
+from knock.depict.vec3d import Point
+from knock.simulations.particle_emitter import ParticlePool
+
+
+def test_pool_emits_up_to_its_capacity() -> None:
+    pool: ParticlePool = ParticlePool.of(5)
+    pool.emit(Point(1, 2), np.ones((3, 2)), 10)
+    pool.emit(Point(3, 4), np.zeros((3, 2)), 20)
+    assert len(pool) == 5
+    assert pool.position[:5].tolist() == [[1, 2]] * 3 + [[3, 4]] * 2
+    assert pool.lifespan[:5].tolist() == [10, 10, 10, 20, 20]
+
+
+def test_pool_recycles_dead_particles() -> None:
+    pool: ParticlePool = ParticlePool.of(4)
+    pool.emit(Point(0, 0), np.array([[0, 1], [0, 2], [0, 3], [0, 4]]), 10)
+    pool.lifespan[[0, 2]] = -1
+    pool.recycle()
+    assert len(pool) == 2
+    assert pool.velocity[:2].tolist() == [[0, 2], [0, 4]]
+
+    # The freed rows are reused by the next particles.
+    pool.emit(Point(0, 0), np.array([[5, 5]]), 10)
+    assert len(pool) == 3 and pool.velocity[2].tolist() == [5, 5]
+
+
+def test_pool_tick_moves_and_ages_particles() -> None:
+    pool: ParticlePool = ParticlePool.of(2)
+    pool.emit(Point(0, 0), np.array([[1.0, 2.0]]), 255)
+    pool.push((0, 0.5))
+    pool.tick(8)
+    assert pool.position[0].tolist() == [1.0, 2.5]
+    assert pool.lifespan[0] == 247
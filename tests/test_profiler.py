@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from knock.depict.engine import Engine
+from knock.depict.profiler import Profiler
+from knock.depict.scene import Scene
+from knock.depict.vec3d import Size
+
+
+class Busy(Scene):
+    def tick(self, delta: float, engine: Engine) -> None:
+        sum(range(1000))
+
+
+def test_profiler_times_phases_and_node_classes(tmp_path: Path) -> None:
+    trace: Path = tmp_path / "trace.json"
+    profiler = Profiler(window=5, overlay=True, trace_path=str(trace))
+    engine = Engine(Size(64, 48), headless=True, ticks=10, profiler=profiler)
+    engine.run(Scene("Root", children=[Busy(), Busy()]))
+
+    for phase in ("events", "update", "draw", "ui", "overlay", "display", "frame"):
+        assert len(profiler.phases[phase]) == 5
+    assert profiler.percentile("Busy", 50) > 0
+    assert profiler.percentile("frame", 95) >= profiler.percentile("update", 95)
+    assert profiler.percentile("Missing", 50) == 0.0
+    assert any(line.startswith("Busy") for line in profiler.summary())
+
+    events: list[dict] = json.loads(trace.read_text())["traceEvents"]
+    assert sum(event["name"] == "frame" for event in events) == 10
+    assert all(event["ph"] in ("X", "C") for event in events)
+
+
+def test_profiler_writes_the_trace_in_batches(tmp_path: Path) -> None:
+    trace: Path = tmp_path / "trace.json"
+    profiler = Profiler(trace_path=str(trace), trace_buffer=8)
+    for _ in range(20):
+        with profiler.phase("update"):
+            pass
+    # Only the events since the last batch are kept in memory.
+    assert len(profiler._events) == 4 and trace.exists()
+
+    profiler.finish_trace()
+    events: list[dict] = json.loads(trace.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["update"] * 20
@@ -0,0 +1,61 @@
+import cv2
+import pygame
+import pytest
+
+from knock.depict.recorder import Recorder
+from knock.depict.vec3d import Size
+
+
+def test_recorder_streams_every_frame_to_disk(tmp_path) -> None:
+    path: str = str(tmp_path / "video.mp4")
+    surface = pygame.Surface((64, 48))
+    # Fewer buffers than frames, so capturing has to wait for the encoder.
+    with Recorder(path, Size(64, 48), fps=30, capacity=2) as recorder:
+        for frame in range(20):
+            surface.fill((255, 0, 0) if frame < 10 else (0, 0, 255))
+            recorder.capture(surface)
+
+    video = cv2.VideoCapture(path)
+    frames: list = []
+    while (frame := video.read())[0]:
+        frames.append(frame[1])
+    video.release()
+
+    assert len(frames) == 20
+    assert frames[0].shape == (48, 64, 3)
+    # OpenCV frames are BGR, so red is the last channel.
+    assert frames[0][24, 32, 2] > 200 and frames[0][24, 32, 0] < 50
+    assert frames[-1][24, 32, 0] > 200 and frames[-1][24, 32, 2] < 50
+
+
+def test_recorder_scales_frames_of_another_size(tmp_path) -> None:
+    path: str = str(tmp_path / "video.mp4")
+    with Recorder(path, Size(64, 48), fps=30) as recorder:
+        recorder.capture(pygame.Surface((128, 96)))
+
+    video = cv2.VideoCapture(path)
+    read, frame = video.read()
+    video.release()
+    assert read and frame.shape == (48, 64, 3)
+
+
+class BrokenWriter:
+    def write(self, frame) -> None:
+        raise OSError("No space left on device")
+
+    def release(self) -> None:
+        self.released = True
+
+
+def test_recorder_raises_when_the_worker_fails(tmp_path) -> None:
+    recorder = Recorder(str(tmp_path / "video.mp4"), Size(64, 48), fps=30)
+    recorder._writer.release()
+    writer = recorder._writer = BrokenWriter()
+    surface = pygame.Surface((64, 48))
+    # Capturing stops waiting for a free buffer once the worker has stopped.
+    with pytest.raises(RuntimeError) as error:
+        for _ in range(recorder.capacity + 1):
+            recorder.capture(surface)
+    assert isinstance(error.value.__cause__, OSError)
+    recorder.close()
+    assert writer.released
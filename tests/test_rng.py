@@ -0,0 +1,41 @@
+import numpy as np
+
+import knock.simulations as simulations
+from knock.bench import run
+from knock.depict.rng import Rng
+from knock.depict.vec3d import Size
+
+
+def test_substreams_are_independent_and_repeatable() -> None:
+    first: Rng = Rng(1)
+    a, b = first.stream("Ball"), first.stream("Ball")
+    assert a.integers(0, 2**32) != b.integers(0, 2**32)
+
+    # Drawing from the parent does not change what later substreams draw.
+    second: Rng = Rng(1)
+    second.random(100)
+    assert second.stream("Ball").random() == Rng(1).stream("Ball").random()
+    assert Rng(1).stream("Ball").random() != Rng(1).stream("Boid").random()
+
+
+def test_bulk_draws() -> None:
+    rng: Rng = Rng(0)
+    vectors: np.ndarray = rng.vectors(100, (0, 10), (5, 20))
+    assert vectors.shape == (100, 2)
+    assert (vectors[:, 0] >= 0).all() and (vectors[:, 0] < 5).all()
+    assert (vectors[:, 1] >= 10).all() and (vectors[:, 1] < 20).all()
+    assert np.allclose(np.hypot(*rng.directions(10).T), 1.0)
+
+    colors: np.ndarray = rng.colors(50, a=128)
+    assert colors.shape == (50, 4) and colors.dtype == np.uint8
+    assert (colors[:, 3] == 128).all()
+    assert 1 <= rng.randint(1, 1) <= 1
+
+
+def test_seeded_runs_are_the_same() -> None:
+    def positions(seed: int) -> np.ndarray:
+        engine = run("Flock", simulations.Flock, 5, Size(640, 360), seed)
+        return engine.root.state.position.copy()
+
+    assert np.array_equal(positions(3), positions(3))
+    assert not np.array_equal(positions(3), positions(4))
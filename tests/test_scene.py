@@ -1,3 +1,6 @@
+import pygame
+
+from knock.depict.canvas import Canvas
 from knock.depict.scene import Scene
 
 
@@ -57,3 +60,118 @@ def test_get_nodes_in_group() -> None:
     assert Scene("Max", groups=["Dead"]) in nodes
     assert Scene("Ella", groups=["Dead"]) in nodes
     assert Scene("Me", groups=["Dead"]) in nodes
+
+
+def test_world_order_is_children_after_descendants() -> None:
+    grandson = Scene("GrandSon")
+    daughter = Scene("Daughter", children=[grandson])
+    son = Scene("Son")
+    scene = Scene("Father", children=[son, daughter])
+    assert [node.tag for node in scene.world()] == ["Son", "GrandSon", "Daughter"]
+
+
+def test_get_node_returns_first_match() -> None:
+    first = Scene("Twin", children=[Scene("Child")])
+    second = Scene("Twin", children=[Scene("Other")])
+    scene = Scene("Parent", children=[first, second])
+    assert scene.get_node("Twin") is first
+    assert scene.get_node("Twin.Other") is None
+    assert scene.get_node("Missing") is None
+
+
+def test_index_updates_when_children_change() -> None:
+    daughter = Scene("Daughter")
+    scene = Scene("Father", children=[Scene("Son"), daughter])
+    assert scene.get_node("Daughter.GrandSon") is None
+
+    grandson = Scene("GrandSon", groups=["Young"])
+    daughter.children.append(grandson)
+    assert scene.get_node("Daughter.GrandSon") is grandson
+    assert grandson in scene.world()
+    assert scene.get_nodes_in_group("Young") == [grandson]
+
+    daughter.children.remove(grandson)
+    assert scene.get_node("Daughter.GrandSon") is None
+    assert grandson not in scene.world()
+    assert scene.get_nodes_in_group("Young") == []
+
+    daughter.children = [grandson]
+    assert scene.get_node("Daughter.GrandSon") is grandson
+
+    del scene.children[0]
+    assert scene.get_node("Son") is None
+
+
+def test_index_updates_when_tags_and_groups_change() -> None:
+    son = Scene("Son")
+    scene = Scene("Father", children=[son])
+    assert scene.get_node("Son") is son
+    son.tag = "Heir"
+    son.mark_changed()
+    assert scene.get_node("Son") is None
+    assert scene.get_node("Heir") is son
+    son.groups.append("Family")
+    son.mark_changed()
+    assert scene.get_nodes_in_group("Family") == [son]
+
+
+def test_walk_order_is_parents_before_children() -> None:
+    scene = Scene(
+        "Father",
+        children=[Scene("Son"), Scene("Daughter", children=[Scene("GrandSon")])],
+    )
+    assert [node.tag for node in scene.walk()] == [
+        "Father",
+        "Son",
+        "Daughter",
+        "GrandSon",
+    ]
+    scene.children.append(Scene("Baby"))
+    assert scene.walk()[-1].tag == "Baby"
+
+
+def test_static_scene_is_only_painted_when_dirty() -> None:
+    drawn: list[str] = []
+
+    class Sketch(Scene):
+        def draw(self, canvas: Canvas) -> None:
+            drawn.append(self.tag)
+
+    canvas = Canvas(pygame.Surface((8, 8)))
+    still = Sketch("Still", children=[Sketch("Inside")], static=True)
+    scene = Sketch("Root", children=[still, Sketch("Moving")])
+    assert [node.tag for node in scene.painted()] == ["Root", "Still", "Moving"]
+
+    for _ in range(3):
+        for node in scene.painted():
+            node.paint(canvas)
+    assert drawn.count("Inside") == 1
+    assert drawn.count("Moving") == 3
+
+    still.children[0].mark_dirty()
+    still.paint(canvas)
+    still.children.append(Sketch("Added"))
+    still.paint(canvas)
+    still.paint(canvas)
+    assert drawn.count("Inside") == 3
+    assert drawn.count("Added") == 1
+
+
+def test_removed_nodes_forget_their_owner() -> None:
+    son, daughter, baby = Scene("Son"), Scene("Daughter"), Scene("Baby")
+    scene = Scene("Father", children=[son, daughter, baby])
+    scene.children.remove(son)
+    del scene.children[0]
+    assert son._owner is None and daughter._owner is None
+    scene.children[0] = son
+    assert baby._owner is None and son._owner is scene
+
+    # Changes to a removed node no longer reach its old owner.
+    scene.children.pop()
+    scene.walk()
+    son.mark_changed()
+    assert scene._index is not None
+
+    scene.children = [daughter, daughter]
+    scene.children.remove(daughter)
+    assert daughter._owner is scene
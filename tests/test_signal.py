@@ -0,0 +1,64 @@
+import gc
+
+from attrs import define
+
+from knock.depict.signal import Signal, SignalBus
+
+
+@define
+class Pinged(Signal):
+    emitter: object
+    value: int
+
+
+class Listener:
+    def __init__(self) -> None:
+        self.values: list[int] = []
+
+    def pinged(self, emitter: object, value: int) -> None:
+        self.values.append(value)
+
+
+def test_emit_calls_subscribers_of_the_emitter_and_signal() -> None:
+    bus = SignalBus()
+    first, second = object(), object()
+    listener = Listener()
+    bus.connect(listener.pinged, first, Pinged)
+
+    assert bus.subscribed(first, Pinged)
+    assert not bus.subscribed(second, Pinged)
+    Pinged(first, 1).emit(bus)
+    Pinged(second, 2).emit(bus)
+    bus.emit_many(first, Pinged, [(first, 3), (first, 4)])
+    assert listener.values == [1, 3, 4]
+
+
+def test_disconnect_stops_callbacks() -> None:
+    bus = SignalBus()
+    emitter = object()
+    listener = Listener()
+    bus.connect(listener.pinged, emitter, Pinged)
+    bus.connect(listener.pinged, emitter, Pinged, weak=True)
+
+    assert bus.disconnect(listener.pinged, emitter, Pinged)
+    bus.emit(emitter, Pinged, emitter, 1)
+    assert bus.disconnect(listener.pinged, emitter, Pinged)
+    assert not bus.disconnect(listener.pinged, emitter, Pinged)
+    bus.emit(emitter, Pinged, emitter, 2)
+    assert listener.values == [1]
+    assert not bus.subscribed(emitter, Pinged)
+
+
+def test_weak_subscriptions_do_not_keep_listeners_alive() -> None:
+    bus = SignalBus()
+    emitter = object()
+    listener = Listener()
+    values: list[int] = listener.values
+    bus.connect(listener.pinged, emitter, Pinged, weak=True)
+    bus.emit(emitter, Pinged, emitter, 1)
+
+    del listener
+    gc.collect()
+    bus.emit(emitter, Pinged, emitter, 2)
+    assert values == [1]
+    assert not bus.subscribed(emitter, Pinged)
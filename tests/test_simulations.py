@@ -0,0 +1,33 @@
+import inspect
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import knock.simulations as simulations
+
+
+@pytest.mark.parametrize("name", simulations.__all__)
+def test_describe_reads_docstrings(name: str) -> None:
+    doc: str | None = getattr(simulations, name).__doc__
+    assert simulations.describe(name) == (inspect.cleandoc(doc) if doc else None)
+
+
+def test_describe_does_not_import_simulations() -> None:
+    # Other tests have already imported the simulations, so check in a new process.
+    check: str = (
+        "import sys\n"
+        "import knock.simulations as simulations\n"
+        "for name in simulations.__all__:\n"
+        "    simulations.describe(name)\n"
+        "assert not [m for m in sys.modules if m.startswith('knock.simulations.')]\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    root: Path = Path(__file__).parent.parent
+    subprocess.run([sys.executable, "-c", check], cwd=root, check=True)
+
+
+def test_unknown_simulations_are_missing() -> None:
+    with pytest.raises(AttributeError):
+        simulations.Missing
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import numpy as np
+from attrs import define, field
+from depict import (
+    Area2D,
+    Engine,
+    Label,
+    Node2D,
+    OnBodyEntered,
+    Point,
+    Scene,
+    Size,
+    Snapshot,
+)
+
+import knock.simulations as simulations
+from knock.bench import run
+
+
+@define
+class Counter(Scene):
+    entered: list[str] = field(factory=list)
+
+    def on_entered(self, area: Area2D, body: Node2D) -> None:
+        self.entered.append(body.tag)
+
+
+def test_resuming_a_snapshot_continues_the_same_run(tmp_path: Path) -> None:
+    engine = run("Flock", simulations.Flock, 10, Size(640, 360), 1)
+    path: Path = tmp_path / "flock.snapshot"
+    engine.snapshot().save(path)
+    engine.ticks = 20
+    engine.run(engine.root, ready=False)
+
+    resumed = Engine(Size(640, 360), headless=True, ticks=20)
+    resumed.resume(Snapshot.open(path))
+    assert resumed.frame_count == 20
+    assert resumed.root is not engine.root
+    assert np.array_equal(resumed.root.state.position, engine.root.state.position)
+
+
+def test_transient_fields_are_reset() -> None:
+    engine = run("CantorSet", simulations.CantorSet, 1, Size(640, 360), 0)
+    assert engine.root._image is not None and not engine.root._dirty
+
+    restored = engine.restore(engine.snapshot())
+    assert restored.tag == "CantorSet" and restored.static
+    assert restored._image is None and restored._dirty
+
+
+def test_signals_and_areas_are_restored() -> None:
+    area = Area2D(position=Point(0, 0), size=Size(100, 100))
+    counter = Counter()
+    body = Node2D("Body", position=Point(50, 50))
+    engine = Engine(Size(640, 360))
+    engine.root = Scene("Root", children=[area, counter, body])
+    engine.connect(counter.on_entered, area, OnBodyEntered)
+    engine.frame_count = 1
+    area.tick(1.0, engine)
+    assert counter.entered == ["Body"]
+
+    root: Scene = engine.restore(engine.snapshot())
+    area, counter, body = root.children
+    assert area.bodies == [body] and list(area._bodies) == [id(body)]
+
+    # The body is still inside, so it does not enter again until it leaves.
+    engine.frame_count = 2
+    body.position = Point(300, 300)
+    area.tick(1.0, engine)
+    engine.frame_count = 3
+    body.position = Point(50, 50)
+    area.tick(1.0, engine)
+    assert counter.entered == ["Body", "Body"]
+
+
+def test_rewinding_to_a_checkpoint() -> None:
+    engine = Engine(Size(640, 360), headless=True, ticks=20, checkpoint_every=5, seed=2)
+    engine.run(simulations.Flock(size=20))
+    assert [snapshot.frame for snapshot in engine.checkpoints] == [5, 10, 15, 20]
+    first = engine.root
+
+    assert engine.rewind(2)
+    assert [snapshot.frame for snapshot in engine.checkpoints] == [5, 10, 15]
+    engine.ticks = 25
+    engine.run(engine.root, ready=False)
+    assert engine.root is not first
+    # Running carries on from the checkpoint, rather than from the last tick.
+    assert [snapshot.frame for snapshot in engine.checkpoints] == [5, 10, 15, 20, 25]
+    assert not engine.rewind(10)
+
+
+def test_replaced_labels_are_removed_from_the_ui() -> None:
+    engine = Engine(Size(640, 360))
+    label = Label(text="Score")
+    engine.root = Scene("Root", children=[label])
+    element = label._label
+
+    restored = engine.restore(engine.snapshot())
+    assert not element.alive()
+    assert restored.children[0]._label.alive()
@@ -0,0 +1,79 @@
+import numpy as np
+
+from knock.depict.spatial import SpatialHash, neighbour_pairs
+from knock.depict.vec3d import Point
+
+
+def test_insert_places_items_in_cells() -> None:
+    grid: SpatialHash[str] = SpatialHash(cell_size=10.0)
+    grid.insert("a", Point(5, 5))
+    grid.insert("b", Point(15, 5))
+    grid.insert("c", Point(-5, 5))
+    assert len(grid) == 3
+    assert grid.key(Point(5, 5)) == (0, 0)
+    assert grid.key(Point(15, 5)) == (1, 0)
+    assert grid.key(Point(-5, 5)) == (-1, 0)
+
+
+def test_query_finds_items_within_radius() -> None:
+    grid: SpatialHash[str] = SpatialHash.of(
+        ["near", "edge", "far"],
+        [Point(12, 10), Point(20, 10), Point(100, 100)],
+        cell_size=10.0,
+    )
+    assert sorted(grid.query(Point(10, 10), 10.0)) == ["edge", "near"]
+    assert grid.query(Point(10, 10), 1.0) == []
+
+
+def test_query_matches_brute_force() -> None:
+    points: list[Point] = [Point((i * 37) % 200, (i * 91) % 150) for i in range(300)]
+    grid: SpatialHash[int] = SpatialHash.of(range(len(points)), points, cell_size=25.0)
+    for center in points[::17]:
+        expected: list[int] = [
+            i for i, point in enumerate(points) if (point - center).size_sq() <= 30**2
+        ]
+        assert sorted(grid.query(center, 30.0)) == expected
+
+
+def test_clear_removes_every_item() -> None:
+    grid: SpatialHash[str] = SpatialHash.of(["a"], [Point(0, 0)], cell_size=10.0)
+    grid.clear()
+    assert len(grid) == 0
+    assert grid.query(Point(0, 0), 100.0) == []
+
+
+def brute_force_pairs(positions: np.ndarray, radius: float) -> set[tuple[int, int]]:
+    difference = positions[:, None, :] - positions[None, :, :]
+    close = (difference**2).sum(axis=2) <= radius**2
+    return {(i, j) for i, j in zip(*np.nonzero(close)) if i != j}
+
+
+def test_neighbour_pairs_matches_brute_force() -> None:
+    positions = np.random.default_rng(0).uniform(-100, 300, (400, 2))
+    pairs: set[tuple[int, int]] = set()
+    # A tiny budget forces the points to be split over many batches.
+    for i, j in neighbour_pairs(positions, 25.0, budget=500):
+        pairs.update(zip(i.tolist(), j.tolist()))
+    assert pairs == brute_force_pairs(positions, 25.0)
+
+
+def test_unique_neighbour_pairs_are_ordered() -> None:
+    positions = np.random.default_rng(1).uniform(0, 50, (100, 2))
+    pairs: set[tuple[int, int]] = set()
+    for i, j in neighbour_pairs(positions, 10.0, unique=True):
+        pairs.update(zip(i.tolist(), j.tolist()))
+    assert pairs == {(i, j) for i, j in brute_force_pairs(positions, 10.0) if i < j}
+
+
+def test_neighbour_pairs_of_no_points() -> None:
+    assert list(neighbour_pairs(np.zeros((0, 2)), 10.0)) == []
+
+
+def test_query_rect_includes_edges() -> None:
+    grid: SpatialHash[str] = SpatialHash.of(
+        ["corner", "inside", "outside"],
+        [Point(10, 10), Point(50, 30), Point(101, 50)],
+        cell_size=32.0,
+    )
+    found: list[str] = grid.query_rect(Point(10, 10), Point(100, 100))
+    assert sorted(found) == ["corner", "inside"]
@@ -0,0 +1,40 @@
+import io
+import json
+
+import pytest
+
+from knock.sweep import SweepResult, grid, parse_param, plan, sweep, write
+
+
+def test_parse_param() -> None:
+    assert parse_param("size=10,20") == ("size", [10, 20])
+    assert parse_param("weights=[1, 2],[3, 4]") == ("weights", [[1, 2], [3, 4]])
+    with pytest.raises(ValueError):
+        parse_param("size")
+
+
+def test_grid_and_seeds() -> None:
+    assert grid({"a": [1, 2], "b": ["x"]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+    assert grid({}) == [{}]
+
+    runs = plan("Flock", {"size": [5, 10]}, ticks=2, repeats=2)
+    assert [run.index for run in runs] == [0, 1, 2, 3]
+    assert len({run.seed for run in runs}) == 4
+    # A configuration gets the same seed wherever it is in the grid.
+    again = plan("Flock", {"size": [10]}, ticks=2, repeats=2)
+    assert [run.seed for run in again] == [run.seed for run in runs[2:]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_is_deterministic(workers: int) -> None:
+    runs = plan("Flock", {"size": [5, 10]}, ticks=3)
+    results: list[SweepResult] = sorted(sweep(runs, workers), key=lambda r: r.index)
+    again: list[SweepResult] = sorted(sweep(runs, 1), key=lambda r: r.index)
+    assert [result.params for result in results] == [{"size": 5}, {"size": 10}]
+    assert all(result.ticks == 3 for result in results)
+    assert [r.observables for r in results] == [r.observables for r in again]
+    assert "polarization" in results[0].observables
+
+    file = io.StringIO()
+    write(results[0], file)
+    assert json.loads(file.getvalue())["params"] == {"size": 5}
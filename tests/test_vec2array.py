@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+
+from attrs import astuple
+
+from knock.depict.vec2array import Vec2Array
+from knock.depict.vec3d import Point, Vec3D
+
+
+def test_vec2array_round_trips_points() -> None:
+    points: list[Vec3D] = [Point(1, 2), Point(3, 4)]
+    vectors: Vec2Array = Vec2Array.of(points)
+    assert len(vectors) == 2
+    assert [astuple(point) for point in vectors] == [(1, 2, 0), (3, 4, 0)]
+    assert astuple(vectors[1]) == (3, 4, 0)
+
+
+def test_vec2array_matches_vec3d() -> None:
+    points: list[Vec3D] = [Point(3, 4), Point(-1, 0.5), Point(0, 0), Point(10, -2)]
+    vectors: Vec2Array = Vec2Array.of(points)
+    around: Vec3D = Point(1, 1)
+    for index, point in enumerate(points):
+        assert math.isclose(vectors.size()[index], point.size())
+        assert math.isclose(vectors.dot(around)[index], point.dot(around))
+        normalized: Vec3D = vectors.normalize()[index]
+        assert math.isclose(normalized.x, point.normalize().x)
+        assert math.isclose(normalized.y, point.normalize().y)
+        constrained: Vec3D = vectors.constrain_size(1, 3)[index]
+        assert math.isclose(constrained.x, point.constrain_size(1, 3).x)
+        assert math.isclose(constrained.y, point.constrain_size(1, 3).y)
+        rotated: Vec3D = vectors.rotate(30, around)[index]
+        assert math.isclose(rotated.x, point.rotate(30, around).x)
+        assert math.isclose(rotated.y, point.rotate(30, around).y)
+
+
+def test_vec2array_arithmetic() -> None:
+    vectors: Vec2Array = Vec2Array(np.array([[1.0, 2.0], [3.0, 4.0]]))
+    assert vectors + Point(1, 1) == Vec2Array([[2.0, 3.0], [4.0, 5.0]])
+    assert vectors - vectors == Vec2Array.zeros(2)
+    assert vectors * np.array([2.0, 0.5]) == Vec2Array([[2.0, 4.0], [1.5, 2.0]])
+    assert 2 * vectors / 2 == vectors
+
+
+def test_vec2array_in_place_methods_keep_the_buffer() -> None:
+    vectors: Vec2Array = Vec2Array.zeros(3)
+    data: np.ndarray = vectors.data
+    vectors.iadd(Point(3, 4)).scale_(2).normalize_()
+    assert vectors.data is data
+    assert np.allclose(vectors.data, [[0.6, 0.8]] * 3)
@@ -2,7 +2,8 @@ import math
 
 from attrs import astuple
 
-from knock.depict.vec3d import Size, Vec3D, deg2rad, rad2deg
+from knock.depict.utils import deg2rad, rad2deg
+from knock.depict.vec3d import Size, Vec3D
 
 
 def test_deg2rad() -> None:
@@ -36,7 +37,7 @@ def test_vec3d_scalar() -> None:
 
 def test_vec3d_angle2d() -> None:
     assert rad2deg(Vec3D(1.0, 1.0, 0.0).angle_2d()) == 45.0
-    assert rad2deg(Vec3D(-1.0, -1.0, 0.0).angle_2d()) == -135.0
+    assert rad2deg(Vec3D(-1.0, -1.0, 0.0).angle_2d()) == 225.0
 
 
 def test_vec3d_size() -> None:
@@ -109,3 +110,21 @@ def test_size_width_and_height_setters() -> None:
     window.height = 720
     assert window.width == 1280
     assert window.height == 720
+
+
+def test_vec3d_rotate() -> None:
+    rotated: Vec3D = Vec3D(2, 1).rotate(90, around=Vec3D(1, 1))
+    assert math.isclose(rotated.x, 1.0)
+    assert math.isclose(rotated.y, 2.0)
+
+
+def test_vec3d_in_place_methods_mutate_and_return_self() -> None:
+    vec = Vec3D(3.0, 4.0)
+    assert vec.iadd(Vec3D(1.0, 2.0)) is vec
+    assert astuple(vec) == (4.0, 6.0, 0.0)
+    assert vec.isub(Vec3D(1.0, 2.0)) is vec
+    assert astuple(vec) == (3.0, 4.0, 0.0)
+    assert vec.scale_(2) is vec
+    assert astuple(vec) == (6.0, 8.0, 0.0)
+    assert vec.normalize_() is vec
+    assert astuple(vec) == (0.6, 0.8, 0.0)